@@ -6,6 +6,12 @@ from fastapi import logger as fastapi_logger
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from apps.core.config import settings
+from apps.core.infra.google_api.api_executor import google_api
+from apps.core.infra.google_api.client_manager import google_clients
+from apps.core.infra.open_ai.client_registry import openai_clients
+from apps.core.providers.storage_provider import get_storage_provider
+from apps.core.utils.metrics import EventLoopLagMonitor
+from apps.modules.quinn.slides.utils.chart_renderer import chart_renderer
 
 logger = fastapi_logger.logger
 
@@ -55,6 +61,30 @@ async def lifespan_setup(
     _setup_db(app)
     app.middleware_stack = app.build_middleware_stack()
 
+    app.state.loop_lag_monitor = EventLoopLagMonitor(
+        app.state.metrics_recorder,
+        settings.metrics_loop_lag_interval_ms / 1000,
+    )
+    app.state.loop_lag_monitor.start()
+
+    openai_clients.start()
+    app.state.openai_clients = openai_clients
+
+    await google_clients.start()
+    app.state.google_clients = google_clients
+
+    await chart_renderer.start()
+    app.state.chart_renderer = chart_renderer
+
+    app.state.storage_provider = get_storage_provider(settings.storage_provider)
+    await app.state.storage_provider.start()
+
     yield
+    await app.state.storage_provider.aclose()
+    chart_renderer.shutdown()
+    google_api.shutdown()
+    await google_clients.aclose()
+    await openai_clients.aclose()
+    await app.state.loop_lag_monitor.stop()
     await app.state.db_engine.dispose()
     logger.info("Application shutdown")
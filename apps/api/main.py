@@ -11,7 +11,9 @@ from apps.api.router import api_router
 from apps.core.config import settings
 from apps.core.middlewares.ava_server_middleware import AvaServerMiddleware
 from apps.core.middlewares.quinn_server_middleware import QuinnServerMiddleware
+from apps.core.middlewares.server_timing_middleware import ServerTimingMiddleware
 from apps.core.utils.logger import configure_logging
+from apps.core.utils.metrics import LatencyRecorder
 
 APP_ROOT = Path(__file__).parent.parent
 
@@ -50,7 +52,11 @@ def get_app() -> FastAPI:
     # Ava server middleware
     app.add_middleware(AvaServerMiddleware)
 
-    if settings.storage_provider == "disk":
+    # Server-Timing middleware, outermost so it times the whole request
+    app.state.metrics_recorder = LatencyRecorder(settings.metrics_window_size)
+    app.add_middleware(ServerTimingMiddleware, recorder=app.state.metrics_recorder)
+
+    if settings.storage_provider in ("disk", "tiered"):
         # Static files for disk storage
         storage_path = Path(settings.disk_storage_path)
         storage_path.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,114 @@
+import math
+from typing import Any
+
+import numpy as np
+
+from apps.modules.quinn.slides.utils.charts import prepare_chart_data
+from apps.modules.quinn.slides.utils.survey_aggregation import (
+    group_aggregate,
+    histogram,
+)
+from apps.modules.quinn.slides.utils.survey_frame import SurveyFrame
+
+KEYS = np.array([0, 1, 0, 1, 0, 2])
+VALUES = np.array([-2.5, 4.0, 1.0, -1.0, 0.5, 3.0])
+
+
+def test_group_aggregate() -> None:
+    """Checks every aggregation by group, with negative and decimal values."""
+
+    means, counts = group_aggregate(KEYS, 4, "mean", VALUES)
+
+    assert counts.tolist() == [3, 2, 1, 0]
+    assert means[:3].tolist() == [-1 / 3, 1.5, 3.0]
+    assert math.isnan(means[3])
+
+    sums, _ = group_aggregate(KEYS, 4, "sum", VALUES)
+
+    assert sums.tolist() == [-1.0, 3.0, 3.0, 0.0]
+
+    medians, _ = group_aggregate(KEYS, 4, "median", VALUES)
+
+    assert medians[:3].tolist() == [0.5, 1.5, 3.0]
+    assert math.isnan(medians[3])
+
+    percents, _ = group_aggregate(KEYS, 4, "percent")
+
+    assert percents.tolist() == [50.0, 100 / 3, 100 / 6, 0.0]
+
+
+def test_histogram_bins() -> None:
+    """Checks ratings get a bin per value and the number of bins is bounded."""
+
+    labels, counts = histogram(np.array([1.0, 2.0, 2.0, 5.0, np.nan]))
+
+    assert labels == ["1", "2", "3", "4", "5"]
+    assert counts.tolist() == [1, 2, 0, 0, 1]
+
+    labels, counts = histogram(np.linspace(-1, 1, 50), bins=100_000_000)
+
+    assert len(labels) == 20
+    assert counts.sum() == 50
+
+
+def test_prepare_bar_chart_keeps_negative_values() -> None:
+    """Checks negative and decimal answers are averaged, biggest group first."""
+
+    frame = SurveyFrame.from_rows(
+        ["Team", "Change"],
+        [("Sales", "-2.5"), ("Design", "4"), ("Sales", "-0.5"), ("Design", "1.5")],
+    )
+
+    chart_data = prepare_chart_data(
+        {
+            "type": "bar",
+            "data": {
+                "x": {"label": "Team", "header_column": "Team"},
+                "y": {"label": "Change", "header_column": "Change"},
+            },
+        },
+        frame,
+    )
+
+    assert chart_data["x"] == ["Design", "Sales"]
+    assert chart_data["y"] == [2.75, -1.5]
+    assert chart_data["y_label"] == "Average Change"
+
+
+def test_prepare_cross_tab() -> None:
+    """Checks series split each x group, as counts or as shares within the group."""
+
+    frame = SurveyFrame.from_rows(
+        ["Team", "Remote"],
+        [
+            ("Sales", "Yes"),
+            ("Design", "No"),
+            ("Design", "Yes"),
+            ("Design", "Yes"),
+            ("Sales", "No"),
+            ("Design", "No"),
+            ("Sales", "Yes"),
+        ],
+    )
+    data: dict[str, Any] = {
+        "x": {"label": "Team", "header_column": "Team"},
+        "series": {"label": "Remote", "header_column": "Remote"},
+    }
+    chart_info = {"type": "bar", "data": data}
+
+    counts = prepare_chart_data(chart_info, frame)
+
+    assert counts["x"] == ["Design", "Sales"]
+    assert counts["series_label"] == "Remote"
+    assert counts["series"] == [
+        {"label": "Yes", "y": [2.0, 2.0]},
+        {"label": "No", "y": [2.0, 1.0]},
+    ]
+
+    data["aggregation"] = "percent"
+    percents = prepare_chart_data(chart_info, frame)
+
+    assert percents["series"] == [
+        {"label": "Yes", "y": [50.0, 66.67]},
+        {"label": "No", "y": [50.0, 33.33]},
+    ]
@@ -0,0 +1,147 @@
+import math
+
+import pytest
+
+from apps.modules.quinn.slides.utils.survey_frame import (
+    MISSING,
+    SurveyFrame,
+    compile_hierarchy_masks,
+    to_float,
+)
+
+HEADERS = ["Team", "Score", "Uses tool", "Which tool", "Why"]
+ROWS = [
+    ("Design", "9", "Yes", "Figma", "Fast"),
+    ("Sales", "7", "No", "", "Price"),
+    ("Design", "1,000", "yes", "Sketch", "Habit"),
+    ("", "n/a", "Yes", "Figma", "Cheap"),
+]
+
+
+@pytest.fixture
+def frame() -> SurveyFrame:
+    """
+    Small survey frame.
+
+    :return: frame of `ROWS`.
+    """
+    return SurveyFrame.from_rows(HEADERS, ROWS, max_categories=3, numeric_ratio=0.7)
+
+
+def test_encode(frame: SurveyFrame) -> None:
+    """
+    Checks answers are dictionary encoded and the column types inferred.
+
+    :param frame: survey frame.
+    """
+    team = frame["Team"]
+
+    assert team.type == "categorical"
+    assert team.categories == ["Design", "Sales"]
+    assert team.codes.tolist() == [0, 1, 0, MISSING]
+    assert team.counts().tolist() == [2, 1]
+
+    score = frame["Score"]
+
+    assert score.type == "numeric"
+    assert score.categories == ["9", "7", "1,000", "n/a"]
+    values = score.values().tolist()
+    assert values[:3] == [9.0, 7.0, 1000.0]
+    assert math.isnan(values[3])
+
+    assert frame["Why"].type == "text"
+    assert SurveyFrame.from_rows(["Empty"], [("",), (" ",)])["Empty"].type == "empty"
+
+
+def test_to_float() -> None:
+    """Checks only real numbers parse, commas being thousands separators."""
+
+    assert to_float("42") == 42.0
+    assert to_float(" -3.5 ") == -3.5
+    assert to_float("1,000") == 1000.0
+    assert to_float("-12,345.5") == -12345.5
+    # Multi-select answers and decimal commas
+    assert to_float("1,3") is None
+    assert to_float("1,5") is None
+    assert to_float("1,0000") is None
+    assert to_float("1_000") is None
+    # Non-finite values
+    assert to_float("inf") is None
+    assert to_float("-Infinity") is None
+    assert to_float("nan") is None
+
+
+def test_multi_select_is_not_numeric() -> None:
+    """Checks comma separated choices and non-finite answers don't make a numeric column."""
+
+    frame = SurveyFrame.from_rows(
+        ["Choices", "Score"],
+        [("1,3", "nan"), ("2,4", "inf"), ("1", "3")],
+    )
+
+    assert frame["Choices"].type != "numeric"
+    assert frame["Score"].type != "numeric"
+
+
+def test_hierarchy_masks(frame: SurveyFrame) -> None:
+    """
+    Checks dependent questions are masked, through chains and whatever the rule order.
+
+    :param frame: survey frame.
+    """
+    masks = compile_hierarchy_masks(
+        frame,
+        {
+            "Why": {"dependsOn": "Which tool", "value": "figma"},
+            "Which tool": {"dependsOn": "Uses tool", "value": "YES"},
+            "Unknown": {"dependsOn": "Uses tool", "value": "yes"},
+        },
+    )
+
+    assert set(masks) == {"Why", "Which tool"}
+    assert masks["Which tool"].tolist() == [True, False, True, True]
+    assert masks["Why"].tolist() == [True, False, False, True]
+
+    masked = frame.with_hierarchy(
+        {"Why": {"dependsOn": "Which tool", "value": "figma"}},
+    )
+
+    assert masked["Why"].cells() == ["Fast", "", "", "Cheap"]
+    assert masked["Why"].codes is frame["Why"].codes
+
+
+def test_hierarchy_cycles(frame: SurveyFrame) -> None:
+    """
+    Checks a cycle of dependencies is broken instead of recursing forever.
+
+    :param frame: survey frame.
+    """
+    masks = compile_hierarchy_masks(
+        frame,
+        {
+            "Why": {"dependsOn": "Which tool", "value": "figma"},
+            "Which tool": {"dependsOn": "Why", "value": "fast"},
+        },
+    )
+
+    assert set(masks) == {"Why", "Which tool"}
+
+
+def test_rows(frame: SurveyFrame) -> None:
+    """
+    Checks the rows view rebuilds the responses, by index, slice and iteration.
+
+    :param frame: survey frame.
+    """
+    rows = frame.rows
+
+    assert len(rows) == len(ROWS)
+    assert list(rows) == ROWS
+    assert rows[0] == ROWS[0]
+    assert rows[-1] == ROWS[-1]
+    assert rows[1:3] == ROWS[1:3]
+    with pytest.raises(IndexError):
+        rows[len(ROWS)]
+
+    assert frame.data[1] == dict(zip(HEADERS, ROWS[1]))
+    assert list(SurveyFrame.from_rows([], [(), ()]).rows) == [(), ()]
@@ -0,0 +1,107 @@
+from apps.modules.quinn.slides.schemas.survey_data_analysis_schema import (
+    Chart,
+    Data,
+    Series,
+    Slide,
+    Slideshow,
+    X,
+    Y,
+)
+from apps.modules.quinn.slides.utils.survey_frame import SurveyFrame
+from apps.modules.quinn.slides.utils.survey_prompt import (
+    TEXT_FIELDS_NOTE,
+    SurveyPromptSerializer,
+)
+
+HEADERS = ["Which team are you in?", "How likely are you to recommend us?"]
+ROWS = [
+    ("Engineering", "Very likely"),
+    ("Engineering", "Very likely"),
+    ("Engineering", "Likely"),
+    ("Engineering", "Very likely"),
+    ("Marketing", "Very likely"),
+    ("Engineering", "Likely"),
+]
+
+
+def test_serialize() -> None:
+    """Checks headers are aliased, repeated answers coded and the LLM told to write them out."""
+
+    prompt = SurveyPromptSerializer().serialize(SurveyFrame.from_rows(HEADERS, ROWS))
+
+    assert prompt.aliases == {"Q1": HEADERS[0], "Q2": HEADERS[1]}
+    assert prompt.codes == {
+        HEADERS[0]: {"A1": "Engineering", "A2": "Marketing"},
+        HEADERS[1]: {"A1": "Very likely", "A2": "Likely"},
+    }
+    assert f"Q1: {HEADERS[0]}" in prompt.content
+    assert "Q1: A1=Engineering; A2=Marketing" in prompt.content
+    assert "Q1,Q2\nA1,A1\n" in prompt.content
+    assert TEXT_FIELDS_NOTE in prompt.content
+
+
+def test_restore_slideshow() -> None:
+    """Checks aliases and codes are mapped back in the columns and every text field."""
+
+    prompt = SurveyPromptSerializer().serialize(SurveyFrame.from_rows(HEADERS, ROWS))
+    slideshow = Slideshow(
+        slides=[
+            Slide(
+                title="Q2 by team",
+                slide_type="Background",
+                bullet_points=["A1 teams answer A1 the most", "Q1 drives Q2"],
+                description="Few A2 answers",
+                chart=Chart(
+                    type="bar",
+                    title="Q2 per Q1",
+                    data=Data(
+                        x=X(label="Q1", header_column="Q1"),
+                        y=Y(label="Responses", header_column="Q2"),
+                        series=Series(label="Q2", header_column="Q2"),
+                    ),
+                ),
+            ),
+            Slide(title="Q3 and A3 are not ours", slide_type="Intro"),
+        ],
+    )
+
+    restored = SurveyPromptSerializer.restore_slideshow(
+        slideshow,
+        prompt.aliases,
+        prompt.codes,
+    )
+
+    slide, other_slide = restored.slides
+    assert slide.chart is not None
+    data = slide.chart.data
+    assert data.x is not None and data.x.header_column == HEADERS[0]
+    assert data.y is not None and data.y.header_column == HEADERS[1]
+    assert data.series is not None and data.series.label == HEADERS[1]
+    assert slide.title == f"{HEADERS[1]} by team"
+    assert slide.chart.title == f"{HEADERS[1]} per {HEADERS[0]}"
+    # The chart's x column decides what a code means
+    assert slide.bullet_points == [
+        "Engineering teams answer Engineering the most",
+        f"{HEADERS[0]} drives {HEADERS[1]}",
+    ]
+    assert slide.description == "Few Marketing answers"
+    assert other_slide.title == "Q3 and A3 are not ours"
+
+
+def test_restore_ambiguous_codes() -> None:
+    """Checks codes without a chart are only replaced when they mean a single answer."""
+
+    slideshow = Slideshow(
+        slides=[Slide(title="A1, A2 and A3", slide_type="Intro")],
+    )
+
+    restored = SurveyPromptSerializer.restore_slideshow(
+        slideshow,
+        {"Q1": "Team", "Q2": "Office"},
+        {
+            "Team": {"A1": "Remote", "A2": "Sales", "A3": "Design"},
+            "Office": {"A1": "Remote", "A2": "Berlin"},
+        },
+    )
+
+    assert restored.slides[0].title == "Remote, A2 and Design"
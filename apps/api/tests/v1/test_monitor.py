@@ -1,8 +1,13 @@
+from pathlib import Path
+
 import pytest
 from fastapi import FastAPI
 from httpx import AsyncClient
 from starlette import status
 
+from apps.core.config import settings
+from apps.core.providers.storage_provider import DiskStorageRepository
+
 
 @pytest.mark.anyio
 async def test_health(client: AsyncClient, fastapi_app: FastAPI) -> None:
@@ -16,3 +21,76 @@ async def test_health(client: AsyncClient, fastapi_app: FastAPI) -> None:
     response = await client.get(url)
 
     assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.anyio
+async def test_metrics(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Checks the metrics endpoint records requests with Server-Timing.
+
+    :param client: client for the app.
+    :param fastapi_app: current FastAPI application.
+    :param monkeypatch: pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(settings, "quinn_api_key", "test-key")
+    headers = {"X-Quinn-API-Key": "test-key"}
+    metrics_url = fastapi_app.url_path_for("get_metrics")
+
+    response = await client.get(metrics_url)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    await client.delete(fastapi_app.url_path_for("reset_metrics"), headers=headers)
+    health_url = fastapi_app.url_path_for("health_check")
+    health_response = await client.get(health_url)
+
+    assert "total;dur=" in health_response.headers["Server-Timing"]
+
+    response = await client.get(metrics_url, headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["requests"][health_url]["count"] == 1
+
+
+@pytest.mark.anyio
+async def test_storage_health(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Checks the storage health endpoint reports an unusable storage.
+
+    :param client: client for the app.
+    :param fastapi_app: current FastAPI application.
+    :param tmp_path: temporary directory of the test.
+    :param monkeypatch: pytest monkeypatch fixture.
+    """
+    storage_provider = DiskStorageRepository()
+    storage_provider.storage_path = tmp_path / "uploads"
+    monkeypatch.setattr(
+        fastapi_app.state,
+        "storage_provider",
+        storage_provider,
+        raising=False,
+    )
+    url = fastapi_app.url_path_for("storage_health_check")
+
+    response = await client.get(url)
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json() == {"disk": False}
+
+    await storage_provider.start()
+    try:
+        response = await client.get(url)
+    finally:
+        await storage_provider.aclose()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"disk": True}
@@ -0,0 +1,154 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+from openai import AuthenticationError, RateLimitError
+
+from apps.core.infra.open_ai import retries
+from apps.core.infra.open_ai.retries import call_with_retries, get_retry_after
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    """
+    Backend for anyio pytest plugin.
+
+    :return: backend name.
+    """
+    return "asyncio"
+
+
+@pytest.fixture
+def no_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Retry right away instead of sleeping.
+
+    :param monkeypatch: pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(retries, "get_retry_after", lambda response, attempt: 0.0)
+
+
+def make_response(
+    status_code: int,
+    headers: dict[str, str] | None = None,
+) -> httpx.Response:
+    """
+    Build an OpenAI API response.
+
+    :param status_code: status code of the response.
+    :param headers: headers of the response.
+    :return: the response.
+    """
+    request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+    return httpx.Response(status_code, headers=headers, request=request)
+
+
+def test_retry_after_headers() -> None:
+    """Checks Retry-After-Ms and Retry-After, in seconds or as a date, are honored."""
+
+    assert get_retry_after(make_response(429, {"retry-after-ms": "250"}), 0) == 0.25
+    assert get_retry_after(make_response(429, {"retry-after": "3"}), 0) == 3.0
+
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    response = make_response(
+        429,
+        {"retry-after": format_datetime(retry_at, usegmt=True)},
+    )
+
+    assert 28 <= get_retry_after(response, 0) <= 30
+
+
+def test_retry_after_backoff() -> None:
+    """Checks the backoff grows exponentially with jitter and is capped."""
+
+    for attempt, base in [(0, 1), (1, 2), (3, 8), (10, 30)]:
+        backoff = get_retry_after(None, attempt)
+
+        assert base <= backoff <= base + 1
+
+    backoff = get_retry_after(make_response(503, {"retry-after": "soon"}), 2)
+
+    assert 4 <= backoff <= 5
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("no_backoff")
+async def test_retryable_errors_are_retried() -> None:
+    """Checks rate limits and timeouts are retried until the call succeeds."""
+
+    errors: list[Exception] = [
+        RateLimitError("Rate limited", response=make_response(429), body=None),
+        asyncio.TimeoutError(),
+    ]
+    calls = 0
+
+    async def call() -> str:
+        nonlocal calls
+        calls += 1
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    assert await call_with_retries(call, max_retries=2) == "ok"
+    assert calls == 3
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("no_backoff")
+async def test_retries_are_bounded() -> None:
+    """Checks the last retryable error is raised once retries are exhausted."""
+
+    calls = 0
+
+    async def call() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(1)
+        return "ok"
+
+    with pytest.raises(asyncio.TimeoutError):
+        await call_with_retries(call, timeout=0.01, max_retries=2)
+
+    assert calls == 3
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("no_backoff")
+async def test_deadline_bounds_all_attempts() -> None:
+    """Checks attempts share the deadline instead of each getting the full timeout."""
+
+    calls = 0
+
+    async def call() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(1)
+        return "ok"
+
+    started_at = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        await call_with_retries(call, timeout=0.05, max_retries=10, deadline=0.12)
+
+    assert calls <= 3
+    assert time.monotonic() - started_at < 0.5
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("no_backoff")
+async def test_other_errors_are_not_retried() -> None:
+    """Checks client errors, such as a bad API key, are raised right away."""
+
+    calls = 0
+
+    async def call() -> str:
+        nonlocal calls
+        calls += 1
+        raise AuthenticationError("Bad key", response=make_response(401), body=None)
+
+    with pytest.raises(AuthenticationError):
+        await call_with_retries(call, max_retries=2)
+
+    assert calls == 1
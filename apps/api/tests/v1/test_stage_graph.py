@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from apps.core.utils.stage_graph import StageGraph
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    """
+    Backend for anyio pytest plugin.
+
+    :return: backend name.
+    """
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_dependency_order() -> None:
+    """Checks stages start once their dependencies are done and get their results."""
+
+    events: list[str] = []
+
+    async def download() -> int:
+        await asyncio.sleep(0.02)
+        events.append("download")
+        return 2
+
+    async def prompt() -> int:
+        events.append("prompt")
+        return 3
+
+    async def llm(download: int, prompt: int) -> int:
+        events.append("llm")
+        return download * prompt
+
+    results = await (
+        StageGraph()
+        .add("download", download)
+        .add("prompt", prompt)
+        .add("llm", llm, ("download", "prompt"))
+        .run()
+    )
+
+    assert results == {"download": 2, "prompt": 3, "llm": 6}
+    assert events == ["prompt", "download", "llm"]
+
+
+def test_cycles_are_rejected() -> None:
+    """Checks stages can only depend on stages added before them."""
+
+    async def noop(**results: None) -> None:
+        return None
+
+    stage_graph = StageGraph().add("a", noop)
+
+    with pytest.raises(ValueError, match="unknown stages"):
+        stage_graph.add("b", noop, ("c",))
+
+    with pytest.raises(ValueError, match="unknown stages"):
+        stage_graph.add("b", noop, ("b",))
+
+    with pytest.raises(ValueError, match="already added"):
+        stage_graph.add("a", noop, ("a",))
+
+
+@pytest.mark.anyio
+async def test_failure_cancels_running_stages() -> None:
+    """Checks the first error is raised, running stages cancelled, dependents skipped."""
+
+    cancelled = asyncio.Event()
+    dependent_ran = False
+
+    async def slow() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def failing() -> None:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("Drive is down")
+
+    async def dependent(failing: None) -> None:
+        nonlocal dependent_ran
+        dependent_ran = True
+
+    stage_graph = (
+        StageGraph()
+        .add("slow", slow)
+        .add("failing", failing)
+        .add("dependent", dependent, ("failing",))
+    )
+
+    with pytest.raises(RuntimeError, match="Drive is down"):
+        await asyncio.wait_for(stage_graph.run(), timeout=5)
+
+    assert cancelled.is_set()
+    assert not dependent_ran
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, Header, Request
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from apps.core.utils.concurrency import cancel_on_disconnect
 from apps.modules.ava.messages.controllers.message_request_controller import (
     MessageRequestController,
 )
@@ -40,6 +41,7 @@ def get_create_message_service(
 @router.post("/messages")
 async def create_ava_message_request(
     body: CreateMessageBodySchema,
+    request: Request,
     create_message_service: CreateMessageService = Depends(get_create_message_service),
     x_ava_api_key: str = Header(None),
 ) -> str:
@@ -47,7 +49,10 @@ async def create_ava_message_request(
 
     content = body.content
 
-    return await message_request_controller.create(
-        content,
-        create_message_service,
+    return await cancel_on_disconnect(
+        request,
+        message_request_controller.create(
+            content,
+            create_message_service,
+        ),
     )
@@ -1,4 +1,9 @@
-from fastapi import APIRouter
+from typing import Any
+
+from fastapi import APIRouter, Depends, Request, Response
+
+from apps.core.middlewares.quinn_server_middleware import verify_quinn_api_key
+from apps.core.utils.metrics import transfers
 
 router = APIRouter()
 
@@ -11,3 +16,46 @@ def health_check() -> None:
     It returns 200 if the project is healthy.
 
     """
+
+
+@router.get("/health/storage")
+async def storage_health_check(request: Request, response: Response) -> dict[str, bool]:
+    """
+    Checks the storage used for uploads.
+
+    It returns 503 if any storage behind the provider can't be used.
+    """
+    health = await request.app.state.storage_provider.health()
+    if not all(health.values()):
+        response.status_code = 503
+    return health
+
+
+@router.get("/metrics", dependencies=[Depends(verify_quinn_api_key)])
+def get_metrics(request: Request) -> dict[str, Any]:
+    """
+    Latency metrics of the recent requests.
+
+    It returns p50/p95/p99 of the event-loop lag, of each path and of each
+    pipeline stage per path, in milliseconds, and the progress and throughput
+    (bytes per second) of the downloads.
+    """
+    recorder = request.app.state.metrics_recorder
+
+    return {
+        "loop_lag": recorder.summary("loop_lag").get("", {}),
+        "requests": recorder.summary("request:"),
+        "stages": recorder.summary("stage:"),
+        "transfers": transfers.summary(),
+    }
+
+
+@router.delete(
+    "/metrics",
+    status_code=204,
+    dependencies=[Depends(verify_quinn_api_key)],
+)
+def reset_metrics(request: Request) -> None:
+    """Reset the latency metrics, e.g. before a benchmark run."""
+    request.app.state.metrics_recorder.reset()
+    transfers.reset()
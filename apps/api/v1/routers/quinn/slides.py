@@ -1,13 +1,23 @@
+import asyncio
+import secrets
 from datetime import datetime
-from typing import Optional
+from functools import partial
+from typing import Any, Optional
 
 import httpx
-from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi import logger as fastapi_logger
 from pydantic import BaseModel
 
 from apps.core.config import settings
-from apps.core.providers.storage_provider import get_storage_provider
+from apps.core.providers.storage_provider import get_app_storage_provider
+from apps.core.providers.storage_provider.repository_interfaces.storage_repository_interface import (
+    IStorageProvider,
+)
+from apps.core.utils.concurrency import cancel_on_disconnect
 from apps.core.utils.google import get_google_drive_id
+from apps.core.utils.metrics import stage
+from apps.core.utils.stage_graph import StageGraph
 from apps.modules.quinn.llms.controllers.analyze_survey_data_controller import (
     AnalyzeSurveyDataLLMController,
 )
@@ -20,6 +30,9 @@ from apps.modules.quinn.slides.controllers.slides_charts_image_controller import
 from apps.modules.quinn.slides.controllers.slides_survey_data_analysis_controller import (
     SlidesSurveyDataAnalysisController,
 )
+from apps.modules.quinn.slides.controllers.slides_template_controller import (
+    SlidesTemplateController,
+)
 from apps.modules.quinn.slides.schemas.survey_data_analysis_schema import Slideshow
 from apps.modules.quinn.slides.services.create_charts_image_service import (
     CreateChartsImageService,
@@ -28,9 +41,12 @@ from apps.modules.quinn.slides.services.create_llm_survey_data_analysis_service
     CreateLLMSurveyDataAnalysisService,
 )
 from apps.modules.quinn.slides.utils.google_slides import (
+    TemplateIndex,
     create_google_slides_presentation,
+    is_missing_layout_error,
 )
 from apps.modules.quinn.slides.utils.helpers import get_hierarchical_question_structure
+from apps.modules.quinn.slides.utils.survey_frame import SurveyFrame
 from apps.modules.shared.google.controllers.google_drive_file_controller import (
     GoogleDriveFileController,
 )
@@ -53,11 +69,14 @@ from apps.modules.shared.google.services.update_google_slides_file_service impor
     UpdateGoogleSlidesFileService,
 )
 
+logger = fastapi_logger.logger
+
 router = APIRouter()
 
 analyze_survey_data_llm_controller = AnalyzeSurveyDataLLMController()
 slides_survey_data_analysis_controller = SlidesSurveyDataAnalysisController()
 slides_charts_image_controller = SlidesChartsImageController()
+slides_template_controller = SlidesTemplateController()
 google_drive_file_controller = GoogleDriveFileController()
 google_slides_file_controller = GoogleSlidesFileController()
 
@@ -81,11 +100,11 @@ def get_create_llm_survey_data_analysis_service() -> CreateLLMSurveyDataAnalysis
     return CreateLLMSurveyDataAnalysisService()
 
 
-def get_create_charts_image_service() -> CreateChartsImageService:
+def get_create_charts_image_service(
+    storage_provider: IStorageProvider = Depends(get_app_storage_provider),
+) -> CreateChartsImageService:
     """Get create charts image service."""
 
-    storage_provider = get_storage_provider(settings.storage_provider)
-
     return CreateChartsImageService(storage_provider)
 
 
@@ -113,6 +132,276 @@ def get_copy_google_drive_file_service() -> CopyGoogleDriveFileService:
     return CopyGoogleDriveFileService()
 
 
+# Pipeline stages, the stage graph passes them the results of their dependencies by name
+async def download_survey(
+    file_id: str,
+    show_google_drive_file_service: ShowGoogleDriveFileService,
+) -> SurveyFrame:
+    """Get the source file as a columnar survey, built once for the prompt and the charts."""
+
+    source_file_content = await google_drive_file_controller.show(
+        file_id,
+        show_google_drive_file_service,
+    )
+    with stage("survey_frame"):
+        return await asyncio.to_thread(
+            SurveyFrame.from_rows,
+            source_file_content.headers,
+            source_file_content.rows,
+        )
+
+
+async def download_question_structure(
+    file_id: Optional[str],
+    show_google_drive_file_service: ShowGoogleDriveFileService,
+) -> Optional[dict[str, dict[str, str]]]:
+    """Get the hierarchical questions structure from the structured questions file (if any)."""
+
+    if not file_id:
+        return None
+
+    structured_questions_file_content = await google_drive_file_controller.show(
+        file_id,
+        show_google_drive_file_service,
+    )
+    return get_hierarchical_question_structure(
+        structured_questions_file_content.data,
+    )
+
+
+async def copy_template(
+    copy_google_drive_file_service: CopyGoogleDriveFileService,
+) -> dict[str, Any]:
+    """Drive - Copy Template Slides."""
+
+    google_drive_copy_file = await google_drive_file_controller.copy(
+        settings.quinn_google_drive_template_slides_id,
+        copy_google_drive_file_service,
+    )
+    if not google_drive_copy_file or not google_drive_copy_file["id"]:
+        raise HTTPException(status_code=404, detail="Template slides file not found")
+
+    return google_drive_copy_file
+
+
+async def rename_copy(
+    drive_copy: dict[str, Any],
+    update_google_drive_file_service: UpdateGoogleDriveFileService,
+) -> None:
+    """Drive - Update file name."""
+
+    await google_drive_file_controller.update(
+        drive_copy.get("id", ""),
+        {
+            "name": f"Quinn_presentation_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}",
+        },
+        update_google_drive_file_service,
+    )
+
+
+async def analyze_survey(
+    drive_download: SurveyFrame,
+    questions_download: Optional[dict[str, dict[str, str]]],
+    prompt: str,
+    description_prompt: str,
+    create_llm_survey_data_analysis_service: CreateLLMSurveyDataAnalysisService,
+) -> Slideshow:
+    """Create slides for survey data analysis."""
+
+    return await slides_survey_data_analysis_controller.create(
+        drive_download,
+        description_prompt,
+        prompt,
+        create_llm_survey_data_analysis_service,
+        questions_download,
+    )
+
+
+async def create_charts(
+    llm: Slideshow,
+    drive_download: SurveyFrame,
+    questions_download: Optional[dict[str, dict[str, str]]],
+    create_charts_image_service: CreateChartsImageService,
+) -> Slideshow:
+    """Create charts images."""
+
+    return await slides_charts_image_controller.create(
+        llm,
+        drive_download,
+        create_charts_image_service,
+        questions_download,
+    )
+
+
+async def update_slides(
+    charts: Slideshow,
+    drive_copy: dict[str, Any],
+    template: TemplateIndex,
+    update_google_slides_file_service: UpdateGoogleSlidesFileService,
+    show_google_slides_file_service: ShowGoogleSlidesFileService,
+) -> None:
+    """Slides - Upload Slides to Google Drive."""
+
+    # The copy has the layouts of the template, its presentation id is its file id
+    presentation_id = drive_copy["id"]
+    try:
+        await google_slides_file_controller.update(
+            presentation_id,
+            {
+                "requests": create_google_slides_presentation(
+                    charts.slides,
+                    presentation_id,
+                    template,
+                ),
+            },
+            update_google_slides_file_service,
+        )
+    except HTTPException as err:
+        if not is_missing_layout_error(err):
+            raise
+
+        # The template changed while being copied, retry with the copy's own layouts
+        logger.warning(
+            f"Slides update of {presentation_id} failed on a missing layout, "
+            "retrying with its layouts",
+        )
+        copy_template = await slides_template_controller.compile(
+            presentation_id,
+            show_google_slides_file_service,
+        )
+        await google_slides_file_controller.update(
+            presentation_id,
+            {
+                "requests": create_google_slides_presentation(
+                    charts.slides,
+                    presentation_id,
+                    copy_template,
+                    id_suffix=f"_{secrets.token_hex(4)}",
+                ),
+            },
+            update_google_slides_file_service,
+        )
+
+
+async def notify_make(
+    drive_copy: dict[str, Any],
+    drive_update: None,
+    slides_batch_update: None,
+    input_spreadsheet_row: int,
+) -> None:
+    """Update Make Scenario."""
+
+    async with httpx.AsyncClient() as client:
+        await client.post(
+            settings.quinn_make_webhook_url,
+            data={
+                "presentation_url": f"https://docs.google.com/presentation/d/{drive_copy['id']}/view",
+                "row": input_spreadsheet_row,
+            },
+            timeout=30,
+        )
+
+
+def build_generate_slides_graph(
+    source_file_drive_id: str,
+    structured_questions_file_drive_id: Optional[str],
+    description_prompt: str,
+    input_spreadsheet_row: int,
+    show_google_drive_file_service: ShowGoogleDriveFileService,
+    show_analyze_survey_data_prompt_service: ShowAnalyzeSurveyDataPromptService,
+    create_llm_survey_data_analysis_service: CreateLLMSurveyDataAnalysisService,
+    create_charts_image_service: CreateChartsImageService,
+    update_google_drive_file_service: UpdateGoogleDriveFileService,
+    update_google_slides_file_service: UpdateGoogleSlidesFileService,
+    show_google_slides_file_service: ShowGoogleSlidesFileService,
+    copy_google_drive_file_service: CopyGoogleDriveFileService,
+) -> StageGraph:
+    """
+    Stages of the slides generation.
+
+    Independent stages run concurrently, e.g. the template copy overlaps the
+    LLM call.
+    """
+
+    return (
+        StageGraph()
+        .add(
+            "drive_download",
+            partial(
+                download_survey,
+                source_file_drive_id,
+                show_google_drive_file_service,
+            ),
+        )
+        .add(
+            "questions_download",
+            partial(
+                download_question_structure,
+                structured_questions_file_drive_id,
+                show_google_drive_file_service,
+            ),
+        )
+        .add("drive_copy", partial(copy_template, copy_google_drive_file_service))
+        .add(
+            "drive_update",
+            partial(
+                rename_copy,
+                update_google_drive_file_service=update_google_drive_file_service,
+            ),
+            ("drive_copy",),
+        )
+        # Get the analyze survey data prompt
+        .add(
+            "prompt",
+            partial(
+                analyze_survey_data_llm_controller.show,
+                show_analyze_survey_data_prompt_service,
+            ),
+        )
+        .add(
+            "llm",
+            partial(
+                analyze_survey,
+                description_prompt=description_prompt,
+                create_llm_survey_data_analysis_service=create_llm_survey_data_analysis_service,
+            ),
+            ("drive_download", "questions_download", "prompt"),
+        )
+        .add(
+            "charts",
+            partial(
+                create_charts,
+                create_charts_image_service=create_charts_image_service,
+            ),
+            ("llm", "drive_download", "questions_download"),
+        )
+        # Slides - Compiled layouts of the template, cached while it is unchanged
+        .add(
+            "template",
+            partial(
+                slides_template_controller.show,
+                settings.quinn_google_drive_template_slides_id,
+                show_google_drive_file_service,
+                show_google_slides_file_service,
+            ),
+        )
+        .add(
+            "slides_batch_update",
+            partial(
+                update_slides,
+                update_google_slides_file_service=update_google_slides_file_service,
+                show_google_slides_file_service=show_google_slides_file_service,
+            ),
+            ("charts", "drive_copy", "template"),
+        )
+        .add(
+            "make_webhook",
+            partial(notify_make, input_spreadsheet_row=input_spreadsheet_row),
+            ("drive_copy", "drive_update", "slides_batch_update"),
+        )
+    )
+
+
 # Routes
 class GenerateSlideBody(BaseModel):
     """Generate slide body."""
@@ -126,6 +415,7 @@ class GenerateSlideBody(BaseModel):
 @router.post("/generate-slides", response_model=Slideshow)
 async def generate_slides(
     body: GenerateSlideBody,
+    request: Request,
     show_google_drive_file_service: ShowGoogleDriveFileService = Depends(
         get_show_google_drive_file_service,
     ),
@@ -162,104 +452,35 @@ async def generate_slides(
     input_spreadsheet_row = body.input_spreadsheet_row
     structured_questions_file_drive_url = body.structured_questions_file_drive_url
 
-    # Get the dict content of the source file
     source_file_drive_id = get_google_drive_id(source_file_drive_url)
     if not source_file_drive_id:
         raise HTTPException(status_code=400, detail="Invalid source file drive URL")
 
-    source_file_content = await google_drive_file_controller.show(
-        source_file_drive_id,
-        show_google_drive_file_service,
-    )
-
-    # Get the structured questions from the structured questions file (if any)
-    structured_questions_file_content = None
+    structured_questions_file_drive_id = None
     if structured_questions_file_drive_url:
-        structured_questions_file_content = await google_drive_file_controller.show(
+        structured_questions_file_drive_id = get_google_drive_id(
             structured_questions_file_drive_url,
-            show_google_drive_file_service,
         )
+        if not structured_questions_file_drive_id:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid structured questions file drive URL",
+            )
 
-    # Drive - Copy Template Slides
-    google_drive_copy_file = await google_drive_file_controller.copy(
-        settings.quinn_google_drive_template_slides_id,
-        copy_google_drive_file_service,
-    )
-    if not google_drive_copy_file or not google_drive_copy_file["id"]:
-        raise HTTPException(status_code=404, detail="Template slides file not found")
-
-    # Drive - Update file name
-    await google_drive_file_controller.update(
-        google_drive_copy_file.get("id", ""),
-        {
-            "name": f"Quinn_presentation_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}",
-        },
-        update_google_drive_file_service,
-    )
-
-    # Get the analyze survey data prompt
-    analyze_survey_data_prompt = await analyze_survey_data_llm_controller.show(
-        show_analyze_survey_data_prompt_service,
-    )
-
-    # Get the hierarchical questions structure (if any)
-    hierarchical_questions = None
-    if structured_questions_file_content:
-        hierarchical_questions = get_hierarchical_question_structure(
-            structured_questions_file_content.data,
-        )
-
-    # Create slides for survey data analysis
-    slides_data = await slides_survey_data_analysis_controller.create(
-        source_file_content,
+    stage_graph = build_generate_slides_graph(
+        source_file_drive_id,
+        structured_questions_file_drive_id,
         description_prompt,
-        analyze_survey_data_prompt,
+        input_spreadsheet_row,
+        show_google_drive_file_service,
+        show_analyze_survey_data_prompt_service,
         create_llm_survey_data_analysis_service,
-        hierarchical_questions,
-    )
-
-    # Create charts images
-    slides_data = await slides_charts_image_controller.create(
-        slides_data,
-        source_file_content,
         create_charts_image_service,
-        hierarchical_questions,
-    )
-
-    # Slides - Find presentation
-    google_slides_find_presentation = await google_slides_file_controller.show(
-        google_drive_copy_file["id"],
-        show_google_slides_file_service,
-    )
-    if (
-        not google_slides_find_presentation
-        or not google_slides_find_presentation["presentationId"]
-    ):
-        raise HTTPException(status_code=404, detail="Slides file not found")
-
-    # Slides - Upload Slides to Google Drive
-    requests = create_google_slides_presentation(
-        slides_data.slides,
-        google_slides_find_presentation["presentationId"],
-        google_slides_find_presentation["layouts"],
-    )
-    await google_slides_file_controller.update(
-        google_slides_find_presentation["presentationId"],
-        {
-            "requests": requests,
-        },
+        update_google_drive_file_service,
         update_google_slides_file_service,
+        show_google_slides_file_service,
+        copy_google_drive_file_service,
     )
+    results = await cancel_on_disconnect(request, stage_graph.run())
 
-    # Update Make Scenario
-    async with httpx.AsyncClient() as client:
-        await client.post(
-            settings.quinn_make_scenario_url,
-            data={
-                "presentation_url": f"https://docs.google.com/presentation/d/{google_slides_find_presentation['presentationId']}/view",
-                "row": input_spreadsheet_row,
-            },
-            timeout=30,
-        )
-
-    return slides_data
+    return results["charts"]
@@ -2,9 +2,14 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.core.infra.sql_alchemy.dependencies import get_db_session
+from apps.core.middlewares.quinn_server_middleware import verify_quinn_api_key
+from apps.core.providers.embedding_provider import embedding_lru_cache
 from apps.modules.shared.rag.controllers.rag_resources_controller import (
     RAGResourcesController,
 )
+from apps.modules.shared.rag.infra.sql_alchemy.repositories.embedding_cache_repository import (
+    EmbeddingCacheRepository,
+)
 from apps.modules.shared.rag.infra.sql_alchemy.repositories.resource_chunks_repository import (
     ResourceChunksRepository,
 )
@@ -31,11 +36,13 @@ def get_rag_resources_service(
 
     resources_repository = ResourcesRepository(db)
     resource_chunks_repository = ResourceChunksRepository(db)
+    embedding_cache_repository = EmbeddingCacheRepository(db)
 
     return CreateRAGResourcesService(
         folder_path="apps/core/rag_storage",
         resources_repository=resources_repository,
         resource_chunks_repository=resource_chunks_repository,
+        embedding_cache_repository=embedding_cache_repository,
     )
 
 
@@ -44,7 +51,10 @@ def get_list_resource_chunks_service(
 ) -> ListResourceChunksService:
     """Get list resource chunks service."""
 
-    resource_chunks_repository = ResourceChunksRepository(db)
+    resource_chunks_repository = ResourceChunksRepository(
+        db,
+        EmbeddingCacheRepository(db),
+    )
 
     return ListResourceChunksService(resource_chunks_repository)
 
@@ -65,3 +75,17 @@ async def add_resources(
     await rag_resources_controller.create(
         rag_resources_service,
     )
+
+
+@router.get(
+    "/embedding-cache-stats",
+    dependencies=[Depends(verify_quinn_api_key)],
+)
+async def embedding_cache_stats() -> dict[str, int]:
+    """
+    Embedding cache counters.
+
+    It returns the in-process cache size and its hit/miss counters.
+    """
+
+    return embedding_lru_cache.stats()
@@ -0,0 +1 @@
+"""Latency benchmarks of the API against the local stand-ins."""
@@ -0,0 +1,70 @@
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from apps.benchmarks.runner import SCENARIOS, compare, format_report, load_report, run
+from apps.core.config import settings
+
+
+def main() -> None:
+    """
+    Entrypoint of the benchmarks.
+
+    Run the API with `STANDINS_URL` pointing at `python -m apps.standins`,
+    then e.g. `python -m apps.benchmarks -c 16 -n 200 -o results.json`.
+    """
+    parser = argparse.ArgumentParser(prog="python -m apps.benchmarks")
+    parser.add_argument(
+        "-s",
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="scenario to run, can be repeated (default: all)",
+    )
+    parser.add_argument("-n", "--requests", type=int, default=50)
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("-w", "--warmup", type=int, default=2)
+    parser.add_argument("-t", "--timeout", type=float, default=300)
+    parser.add_argument(
+        "-u",
+        "--base-url",
+        default=f"http://{settings.host}:{settings.port}",
+    )
+    parser.add_argument("-o", "--output", help="store the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed regression ratio against the baseline (default: 0.1)",
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run(
+            args.base_url,
+            args.scenario or sorted(SCENARIOS),
+            args.requests,
+            args.concurrency,
+            args.warmup,
+            args.timeout,
+        ),
+    )
+    print(format_report(report))  # noqa: T201
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+    baseline = load_report(args.baseline)
+    if baseline:
+        regressions = compare(report, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")  # noqa: T201
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
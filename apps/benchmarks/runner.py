@@ -0,0 +1,253 @@
+import asyncio
+import contextlib
+import json
+import platform
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import httpx
+
+from apps.core.config import settings
+from apps.core.utils.metrics import summarize
+
+
+@dataclass
+class Scenario:
+    """An endpoint to benchmark and how to call it."""
+
+    name: str
+    path: str
+    headers: Callable[[], dict[str, str]]
+    body: Callable[[int], dict[str, Any]]
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "quinn": Scenario(
+        name="quinn",
+        path="/api/v1/quinn/generate-slides",
+        headers=lambda: {"X-Quinn-API-Key": settings.quinn_api_key},
+        body=lambda i: {
+            # Stand-in Drive ids starting with `csv` are served as CSV surveys
+            "source_file_drive_url": f"https://drive.google.com/file/d/csv-survey-{i % 8}/view",
+            "description_prompt": "Team survey results for the quarterly review",
+            "input_spreadsheet_row": i + 1,
+        },
+    ),
+    "ava": Scenario(
+        name="ava",
+        path="/api/v1/ava/messages",
+        headers=lambda: {"X-Ava-API-Key": settings.ava_api_key},
+        body=lambda i: {"content": f"How many vacation days do I get? ({i})"},
+    ),
+}
+
+
+@dataclass
+class ScenarioResult:
+    """Samples collected while running a scenario."""
+
+    latencies: list[float] = field(default_factory=list)
+    stages: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+    duration: float = 0.0
+
+    def add_error(self, error: str) -> None:
+        """Count an error by status code or exception name."""
+
+        self.errors[error] = self.errors.get(error, 0) + 1
+
+
+def parse_server_timing(header: str) -> dict[str, float]:
+    """Parse a `Server-Timing` header into stage durations (ms)."""
+
+    timings = {}
+    for metric in header.split(","):
+        name, _, params = metric.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur" and name:
+                with contextlib.suppress(ValueError):
+                    timings[name] = float(value)
+    return timings
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    warmup: int = 0,
+) -> ScenarioResult:
+    """Send `requests` requests with at most `concurrency` in flight."""
+
+    result = ScenarioResult()
+    counter = iter(range(warmup + requests))
+
+    async def worker() -> None:
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                response = await client.post(
+                    scenario.path,
+                    json=scenario.body(i),
+                    headers=scenario.headers(),
+                )
+            except httpx.HTTPError as e:
+                if i >= warmup:
+                    result.add_error(type(e).__name__)
+                continue
+
+            latency = (time.perf_counter() - start) * 1000
+            if i < warmup:
+                continue
+            if response.is_error:
+                result.add_error(str(response.status_code))
+                continue
+
+            result.latencies.append(latency)
+            timings = parse_server_timing(response.headers.get("Server-Timing", ""))
+            for name, duration in timings.items():
+                result.stages.setdefault(name, []).append(duration)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(max(concurrency, 1))])
+    result.duration = time.perf_counter() - start
+
+    return result
+
+
+async def run(
+    base_url: str,
+    scenario_names: list[str],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    timeout: float,
+) -> dict[str, Any]:
+    """Run the scenarios one after the other and build the report."""
+
+    report: dict[str, Any] = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "base_url": base_url,
+        "requests": requests,
+        "concurrency": concurrency,
+        "python": platform.python_version(),
+        "scenarios": {},
+    }
+
+    limits = httpx.Limits(
+        max_connections=concurrency,
+        max_keepalive_connections=concurrency,
+    )
+    # The metrics endpoints are protected by the Quinn API key
+    metrics_headers = {"X-Quinn-API-Key": settings.quinn_api_key}
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        timeout=timeout,
+        limits=limits,
+    ) as client:
+        for name in scenario_names:
+            scenario = SCENARIOS[name]
+
+            # Reset the server metrics so the loop lag covers this scenario only
+            await client.delete("/api/v1/metrics", headers=metrics_headers)
+            result = await run_scenario(client, scenario, requests, concurrency, warmup)
+            server_metrics = (
+                await client.get("/api/v1/metrics", headers=metrics_headers)
+            ).json()
+
+            report["scenarios"][name] = {
+                "latency_ms": summarize(result.latencies),
+                "throughput_rps": (
+                    round(len(result.latencies) / result.duration, 3)
+                    if result.duration
+                    else 0.0
+                ),
+                "errors": result.errors,
+                "stages_ms": {
+                    stage: summarize(samples)
+                    for stage, samples in sorted(result.stages.items())
+                },
+                "loop_lag_ms": server_metrics.get("loop_lag", {}),
+            }
+
+    return report
+
+
+def compare(
+    report: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float,
+) -> list[str]:
+    """
+    Compare a report to a baseline.
+
+    It returns a line per latency percentile or throughput that got worse by
+    more than `threshold` (a ratio, e.g. 0.1 for 10%).
+    """
+
+    regressions = []
+    for name, current in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+
+        series = [("latency", current["latency_ms"], previous["latency_ms"])]
+        series.extend(
+            (f"stage {stage}", current["stages_ms"][stage], previous_stage)
+            for stage, previous_stage in previous.get("stages_ms", {}).items()
+            if stage in current["stages_ms"]
+        )
+        for label, now, before in series:
+            for pct in ("p50", "p95", "p99"):
+                if before.get(pct) and now[pct] > before[pct] * (1 + threshold):
+                    regressions.append(
+                        f"{name} {label} {pct}: {before[pct]:.1f}ms -> {now[pct]:.1f}ms",
+                    )
+
+        before_rps = previous.get("throughput_rps", 0)
+        if before_rps and current["throughput_rps"] < before_rps * (1 - threshold):
+            regressions.append(
+                f"{name} throughput: {before_rps:.2f} -> {current['throughput_rps']:.2f} rps",
+            )
+
+    return regressions
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Human readable summary of a report."""
+
+    lines = []
+    for name, scenario in report["scenarios"].items():
+        latency = scenario["latency_ms"]
+        lag = scenario["loop_lag_ms"]
+        lines.append(
+            f"{name}: {latency['count']} ok, {sum(scenario['errors'].values())} errors, "
+            f"{scenario['throughput_rps']} rps",
+        )
+        lines.append(
+            f"  latency  p50={latency['p50']:.1f} p95={latency['p95']:.1f} "
+            f"p99={latency['p99']:.1f} ms",
+        )
+        if lag:
+            lines.append(
+                f"  loop lag p50={lag['p50']:.1f} p95={lag['p95']:.1f} "
+                f"p99={lag['p99']:.1f} max={lag['max']:.1f} ms",
+            )
+        for stage, stats in scenario["stages_ms"].items():
+            lines.append(
+                f"  {stage:<20} p50={stats['p50']:.1f} p95={stats['p95']:.1f} "
+                f"p99={stats['p99']:.1f} ms",
+            )
+    return "\n".join(lines)
+
+
+def load_report(path: Optional[str]) -> Optional[dict[str, Any]]:
+    """Load a stored report, if any."""
+
+    if not path:
+        return None
+    return json.loads(Path(path).read_text())
@@ -0,0 +1,202 @@
+import argparse
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+from apps.modules.quinn.slides.utils.charts import prepare_chart_data
+from apps.modules.quinn.slides.utils.survey_frame import (
+    SurveyFrame,
+    compile_hierarchy_masks,
+)
+
+DEPARTMENTS = [
+    "Engineering",
+    "Design",
+    "Sales",
+    "Marketing",
+    "Support",
+    "Finance",
+    "HR",
+    "Legal",
+]
+REASONS = ["Pay", "Team", "Growth", "Flexibility", "Mission"]
+FOLLOW_UPS = ["Salary", "Bonus", "Equity", "Benefits"]
+
+
+def generate_survey(
+    rows: int,
+    columns: int,
+    seed: int = 0,
+) -> tuple[list[str], list[tuple[str, ...]], dict[str, dict[str, str]]]:
+    """
+    Synthetic survey with chained dependent questions.
+
+    After an id and a department column, columns come in groups of four: a
+    Yes/No question, a reason only asked on Yes, a follow-up only asked when
+    the reason is Pay, and a 1-5 rating.
+    """
+
+    rng = np.random.default_rng(seed)
+    headers = ["Respondent ID", "Department"]
+    cells: list[np.ndarray] = [
+        np.arange(1, rows + 1).astype(str),
+        rng.choice(DEPARTMENTS, rows),
+    ]
+    hierarchical_questions: dict[str, dict[str, str]] = {}
+
+    group = 0
+    while len(headers) < columns:
+        group += 1
+        recommend = f"Would you recommend area {group}?"
+        reason = f"Main reason for area {group}"
+        follow_up = f"What about pay in area {group}?"
+        rating = f"How satisfied are you with area {group}?"
+
+        recommend_cells = rng.choice(["Yes", "No"], rows)
+        # Answers of unasked questions are left in, as some survey tools do
+        group_cells = [
+            recommend_cells,
+            rng.choice(REASONS, rows),
+            rng.choice(FOLLOW_UPS, rows),
+            rng.integers(1, 6, rows).astype(str),
+        ]
+        for header, column in zip([recommend, reason, follow_up, rating], group_cells):
+            if len(headers) < columns:
+                headers.append(header)
+                cells.append(column)
+
+        hierarchical_questions[reason] = {"dependsOn": recommend, "value": "Yes"}
+        hierarchical_questions[follow_up] = {"dependsOn": reason, "value": "Pay"}
+
+    return (
+        headers,
+        list(zip(*[column.tolist() for column in cells])),
+        hierarchical_questions,
+    )
+
+
+def mask_rows_reference(
+    rows: list[dict[str, Any]],
+    hierarchical_questions: dict[str, dict[str, str]],
+) -> list[dict[str, Any]]:
+    """Row by row masking, as done before the compiled masks."""
+
+    valid_survey_data = []
+    for row in rows:
+        copy_row = row.copy()
+
+        for dependent_column, rule in hierarchical_questions.items():
+            depends_on_column = rule.get("dependsOn")
+            required_value = rule.get("value", "").lower()
+
+            if (
+                depends_on_column
+                and str(copy_row.get(depends_on_column, "")).lower()
+                != str(required_value)
+                and dependent_column in copy_row
+            ):
+                del copy_row[dependent_column]
+
+        valid_survey_data.append(copy_row)
+
+    return valid_survey_data
+
+
+def _best_of(repeat: int, function: Callable[[], Any]) -> float:
+    """Best duration (ms) of a few runs."""
+
+    durations = []
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+    return min(durations)
+
+
+def run_survey_benchmark(
+    rows: int,
+    columns: int,
+    repeat: int = 3,
+    reference: bool = True,
+) -> dict[str, float]:
+    """Time building the frame, masking it and preparing a chart per group."""
+
+    headers, survey_rows, hierarchical_questions = generate_survey(rows, columns)
+    frame = SurveyFrame.from_rows(headers, survey_rows)
+    charts = [
+        {
+            "type": "bar",
+            "data": {
+                "x": {"label": "Follow-up", "header_column": follow_up},
+                "y": {"label": "Satisfaction", "header_column": "Department"},
+            },
+        }
+        for follow_up in list(hierarchical_questions)[1::2]
+    ]
+
+    def mask_and_prepare() -> None:
+        masked = frame.with_hierarchy(hierarchical_questions)
+        for chart in charts:
+            prepare_chart_data(chart, masked)
+
+    results = {
+        "rows": rows,
+        "columns": len(headers),
+        "rules": len(hierarchical_questions),
+        "charts": len(charts),
+        "frame_build_ms": _best_of(
+            1,
+            lambda: SurveyFrame.from_rows(headers, survey_rows),
+        ),
+        "mask_compile_ms": _best_of(
+            repeat,
+            lambda: compile_hierarchy_masks(frame, hierarchical_questions),
+        ),
+        "mask_and_charts_ms": _best_of(repeat, mask_and_prepare),
+    }
+
+    if reference:
+        row_dicts = [dict(zip(headers, row)) for row in survey_rows]
+        results["reference_mask_ms"] = _best_of(
+            1,
+            lambda: mask_rows_reference(row_dicts, hierarchical_questions),
+        )
+
+    return results
+
+
+def main() -> None:
+    """
+    Benchmark the survey frame on a synthetic survey.
+
+    E.g. `python -m apps.benchmarks.survey --rows 50000 --columns 200`.
+    """
+    parser = argparse.ArgumentParser(prog="python -m apps.benchmarks.survey")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--columns", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--no-reference",
+        action="store_true",
+        help="skip the row by row masking, which needs a lot of memory",
+    )
+    args = parser.parse_args()
+
+    results = run_survey_benchmark(
+        args.rows,
+        args.columns,
+        args.repeat,
+        not args.no_reference,
+    )
+    for name, value in results.items():
+        line = (
+            f"{name:<20} {value:.1f}"
+            if isinstance(value, float)
+            else f"{name:<20} {value}"
+        )
+        print(line)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,11 @@ import enum
 import os
 from pathlib import Path
 from tempfile import gettempdir
-from typing import Any, Literal
+from typing import Literal
 
-from openai import AsyncOpenAI, OpenAI
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from yarl import URL
 
-from apps.core.utils.google import get_google_drive_service, get_google_slides_service
-
 TEMP_DIR = Path(gettempdir())
 
 
@@ -72,8 +69,64 @@ class Settings(BaseSettings):
         "o3-mini",
     )
 
-    # Storage provider
-    storage_provider: Literal["disk", "s3"] = os.getenv("STORAGE_PROVIDER", "disk")  # type: ignore[assignment]
+    # OpenAI client pools, one per purpose (embeddings, chat, reasoning)
+    openai_max_connections: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "50"))
+    openai_max_keepalive_connections: int = int(
+        os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"),
+    )
+    openai_keepalive_expiry: float = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "60"))
+    openai_connect_timeout: float = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+    openai_timeout: float = float(os.getenv("OPENAI_TIMEOUT", "60"))
+    openai_reasoning_timeout: float = float(
+        os.getenv("OPENAI_REASONING_TIMEOUT", "600"),
+    )
+    openai_max_retries: int = int(os.getenv("OPENAI_MAX_RETRIES", "3"))
+
+    # OpenAI embeddings
+    openai_embedding_model: str = os.getenv(
+        "OPENAI_EMBEDDING_MODEL",
+        "text-embedding-3-small",
+    )
+    openai_embedding_batch_size: int = int(
+        os.getenv("OPENAI_EMBEDDING_BATCH_SIZE", "100"),
+    )
+    # Maximum embedding batches in flight, lowered automatically on 429s
+    openai_embedding_max_concurrency: int = int(
+        os.getenv("OPENAI_EMBEDDING_MAX_CONCURRENCY", "8"),
+    )
+    openai_embedding_max_retries: int = int(
+        os.getenv("OPENAI_EMBEDDING_MAX_RETRIES", "5"),
+    )
+
+    # Embedding cache, in-process LRU entries and persistent table eviction
+    embedding_cache_lru_size: int = int(os.getenv("EMBEDDING_CACHE_LRU_SIZE", "10000"))
+    embedding_cache_max_age_days: int = int(
+        os.getenv("EMBEDDING_CACHE_MAX_AGE_DAYS", "90"),
+    )
+    embedding_cache_max_rows: int = int(
+        os.getenv("EMBEDDING_CACHE_MAX_ROWS", "200000"),
+    )
+
+    # RAG vector search, the HNSW index is built by migration 128375abdb14. Searches
+    # filtered by resource scan more candidates, and with pgvector >= 0.8 can
+    # iterate the index scan ("relaxed_order" or "strict_order", off when empty)
+    rag_hnsw_ef_search: int = int(os.getenv("RAG_HNSW_EF_SEARCH", "40"))
+    rag_hnsw_filtered_ef_search: int = int(
+        os.getenv("RAG_HNSW_FILTERED_EF_SEARCH", "200"),
+    )
+    rag_hnsw_iterative_scan: str = os.getenv("RAG_HNSW_ITERATIVE_SCAN", "")
+
+    # Storage provider, `tiered` writes to disk and replicates to S3 in the background
+    storage_provider: Literal["disk", "s3", "tiered"] = os.getenv("STORAGE_PROVIDER", "disk")  # type: ignore[assignment]
+    storage_replication_queue_size: int = int(
+        os.getenv("STORAGE_REPLICATION_QUEUE_SIZE", "1000"),
+    )
+    storage_replication_workers: int = int(
+        os.getenv("STORAGE_REPLICATION_WORKERS", "4"),
+    )
+    storage_replication_drain_timeout: float = float(
+        os.getenv("STORAGE_REPLICATION_DRAIN_TIMEOUT", "30"),
+    )
 
     # AWS S3 settings
     aws_access_key_id: str = os.getenv("AWS_ACCESS_KEY_ID", "")
@@ -81,12 +134,56 @@ class Settings(BaseSettings):
     aws_region: str = os.getenv("AWS_REGION", "us-east-1")
     s3_bucket_name: str = os.getenv("S3_BUCKET_NAME", "ai-automation-team")
     s3_bucket_folder: str = os.getenv("S3_BUCKET_FOLDER", "quinn")
+    # S3 calls in flight, also the size of the client connection pool
+    s3_max_concurrency: int = int(os.getenv("S3_MAX_CONCURRENCY", "16"))
+    s3_timeout: float = float(os.getenv("S3_TIMEOUT", "60"))
+    s3_max_retries: int = int(os.getenv("S3_MAX_RETRIES", "4"))
+    # Objects from this size are uploaded in parts, of at least 5 MiB
+    s3_multipart_threshold: int = int(
+        os.getenv("S3_MULTIPART_THRESHOLD", str(8 * 1024 * 1024)),
+    )
+    s3_multipart_chunk_size: int = int(
+        os.getenv("S3_MULTIPART_CHUNK_SIZE", str(8 * 1024 * 1024)),
+    )
 
     # Google Cloud
     google_cloud_impersonated_account: str = os.getenv(
         "GOOGLE_CLOUD_IMPERSONATED_ACCOUNT",
         "angie@x-team.com",
     )
+    google_api_timeout: float = float(os.getenv("GOOGLE_API_TIMEOUT", "60"))
+    google_api_max_retries: int = int(os.getenv("GOOGLE_API_MAX_RETRIES", "4"))
+    google_api_max_workers: int = int(os.getenv("GOOGLE_API_MAX_WORKERS", "16"))
+    # In-flight calls per API, keep them under the per-user Google quotas
+    google_drive_max_concurrency: int = int(
+        os.getenv("GOOGLE_DRIVE_MAX_CONCURRENCY", "10"),
+    )
+    google_slides_max_concurrency: int = int(
+        os.getenv("GOOGLE_SLIDES_MAX_CONCURRENCY", "5"),
+    )
+    # Drive files are downloaded and parsed in chunks of this many bytes
+    google_drive_download_chunk_size: int = int(
+        os.getenv("GOOGLE_DRIVE_DOWNLOAD_CHUNK_SIZE", str(4 * 1024 * 1024)),
+    )
+    # Parsed Drive files (survey responses) cached on disk, opt-in, at most
+    # `max_files` entries reused while their modifiedTime/md5Checksum/version match
+    google_drive_cache_enabled: bool = (
+        os.getenv("GOOGLE_DRIVE_CACHE_ENABLED", "False") == "True"
+    )
+    google_drive_cache_path: str = os.getenv(
+        "GOOGLE_DRIVE_CACHE_PATH",
+        str(TEMP_DIR / "drive_cache"),
+    )
+    google_drive_cache_max_files: int = int(
+        os.getenv("GOOGLE_DRIVE_CACHE_MAX_FILES", "100"),
+    )
+    # Access tokens are refreshed in the background this long before they expire
+    google_token_refresh_margin: int = int(
+        os.getenv("GOOGLE_TOKEN_REFRESH_MARGIN", "300"),
+    )
+    google_token_refresh_interval: int = int(
+        os.getenv("GOOGLE_TOKEN_REFRESH_INTERVAL", "60"),
+    )
 
     # Disk storage settings
     disk_storage_path: str = os.getenv("DISK_STORAGE_PATH", "storage/uploads")
@@ -94,6 +191,19 @@ class Settings(BaseSettings):
         "DISK_STORAGE_BASE_URL",
         "http://localhost:8000/static",
     )
+    # Least recently used files are evicted above this many bytes, 0 to keep all
+    disk_storage_max_bytes: int = int(
+        os.getenv("DISK_STORAGE_MAX_BYTES", str(1024 * 1024 * 1024)),
+    )
+    # Files unused for this many seconds are evicted, 0 to keep them
+    disk_storage_ttl: float = float(os.getenv("DISK_STORAGE_TTL", "0"))
+    disk_storage_eviction_interval: float = float(
+        os.getenv("DISK_STORAGE_EVICTION_INTERVAL", "300"),
+    )
+    # Files are copied in blocks of this many bytes
+    disk_storage_block_size: int = int(
+        os.getenv("DISK_STORAGE_BLOCK_SIZE", str(1024 * 1024)),
+    )
 
     # Quinn Settings
     quinn_make_scenario_url: str = os.getenv("QUINN_MAKE_SCENARIO_URL", "")
@@ -101,32 +211,84 @@ class Settings(BaseSettings):
         "QUINN_GOOGLE_DRIVE_TEMPLATE_SLIDES_ID",
         "102Thay7QPpYp4YIl2osChQPrN4yb-oPy1h7O5ZBeCMs",
     )
+    # Survey data in the analysis prompt: compact `csv`/`tsv` table or the rows `repr`
+    quinn_prompt_format: Literal["csv", "tsv", "repr"] = os.getenv("QUINN_PROMPT_FORMAT", "csv")  # type: ignore[assignment]
+    quinn_prompt_header_aliases: bool = (
+        os.getenv("QUINN_PROMPT_HEADER_ALIASES", "True") == "True"
+    )
+    quinn_prompt_dictionary_encoding: bool = (
+        os.getenv("QUINN_PROMPT_DICTIONARY_ENCODING", "True") == "True"
+    )
+    # Above this many responses, send column profiles plus a stratified sample
+    quinn_prompt_profile_row_threshold: int = int(
+        os.getenv("QUINN_PROMPT_PROFILE_ROW_THRESHOLD", "1000"),
+    )
+    quinn_prompt_sample_size: int = int(os.getenv("QUINN_PROMPT_SAMPLE_SIZE", "200"))
+    # Chart rendering processes, -1 for one per core up to 4 and 0 to render in threads
+    chart_render_workers: int = int(os.getenv("CHART_RENDER_WORKERS", "-1"))
+    chart_render_max_pending: int = int(os.getenv("CHART_RENDER_MAX_PENDING", "32"))
+
+    # Latency metrics (`GET /api/v1/metrics`)
+    metrics_window_size: int = int(os.getenv("METRICS_WINDOW_SIZE", "2048"))
+    metrics_loop_lag_interval_ms: int = int(
+        os.getenv("METRICS_LOOP_LAG_INTERVAL_MS", "100"),
+    )
+
+    # Local stand-ins for external services, see `python -m apps.standins`.
+    # When set, OpenAI, Google, S3 and Make calls go to this URL instead.
+    standins_url: str = os.getenv("STANDINS_URL", "")
+    standins_host: str = os.getenv("STANDINS_HOST", "127.0.0.1")
+    standins_port: int = int(os.getenv("STANDINS_PORT", "8100"))
+    # `service=value` lists, services are openai, drive, slides, s3 and make.
+    # A bare number applies to every service.
+    standins_latency_ms: str = os.getenv(
+        "STANDINS_LATENCY_MS",
+        "openai=1500,drive=150,slides=200,s3=40,make=80",
+    )
+    standins_jitter_ratio: float = float(os.getenv("STANDINS_JITTER_RATIO", "0.1"))
+    standins_error_rate: str = os.getenv("STANDINS_ERROR_RATE", "0")
+    standins_error_status: int = int(os.getenv("STANDINS_ERROR_STATUS", "503"))
+    standins_seed: int = int(os.getenv("STANDINS_SEED", "42"))
+    standins_survey_rows: int = int(os.getenv("STANDINS_SURVEY_ROWS", "500"))
+    standins_survey_columns: int = int(os.getenv("STANDINS_SURVEY_COLUMNS", "12"))
+    # Directory of `<file_id>.csv` files served instead of synthetic surveys
+    standins_fixtures_path: str = os.getenv("STANDINS_FIXTURES_PATH", "")
 
     @property
-    def openai_client(self) -> OpenAI:
-        """OpenAI client."""
-        return OpenAI(
-            api_key=self.openai_api_key,
-            organization=self.openai_organization_id,
-        )
+    def openai_api_url(self) -> str:
+        """OpenAI API URL."""
+        if self.standins_url:
+            return f"{self.standins_url}/v1"
+        return self.openai_base_url
 
     @property
-    def openai_client_async(self) -> AsyncOpenAI:
-        """Async OpenAI client."""
-        return AsyncOpenAI(
-            api_key=self.openai_api_key,
-            organization=self.openai_organization_id,
-        )
+    def google_drive_api_endpoint(self) -> str | None:
+        """Google Drive API endpoint override."""
+        return f"{self.standins_url}/drive/v3/" if self.standins_url else None
+
+    @property
+    def google_slides_api_endpoint(self) -> str | None:
+        """Google Slides API endpoint override."""
+        return f"{self.standins_url}/" if self.standins_url else None
+
+    @property
+    def s3_endpoint_url(self) -> str | None:
+        """S3 endpoint override."""
+        return f"{self.standins_url}/s3" if self.standins_url else None
 
     @property
-    def google_drive_service(self) -> Any:
-        """Google Drive service."""
-        return get_google_drive_service(self.google_cloud_impersonated_account)
+    def s3_public_url(self) -> str:
+        """Base URL of the public S3 objects."""
+        if self.s3_endpoint_url:
+            return f"{self.s3_endpoint_url}/{self.s3_bucket_name}"
+        return f"https://{self.s3_bucket_name}.s3.{self.aws_region}.amazonaws.com"
 
     @property
-    def google_slides_service(self) -> Any:
-        """Google Slides service."""
-        return get_google_slides_service()
+    def quinn_make_webhook_url(self) -> str:
+        """Quinn Make scenario webhook URL."""
+        if self.standins_url:
+            return f"{self.standins_url}/make/quinn"
+        return self.quinn_make_scenario_url
 
     @property
     def db_url(self) -> URL:
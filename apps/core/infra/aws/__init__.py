@@ -0,0 +1 @@
+"""AWS core infrastructure."""
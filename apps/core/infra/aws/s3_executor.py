@@ -0,0 +1,140 @@
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError, HTTPClientError
+from fastapi import logger as fastapi_logger
+
+from apps.core.config import settings
+
+logger = fastapi_logger.logger
+
+T = TypeVar("T")
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+RETRYABLE_CODES = {"RequestTimeout", "SlowDown", "Throttling", "ThrottlingException"}
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether a failed S3 call is worth retrying."""
+
+    if isinstance(error, ClientError):
+        status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        code = error.response.get("Error", {}).get("Code")
+        return status in RETRYABLE_STATUSES or code in RETRYABLE_CODES
+    return isinstance(error, HTTPClientError)
+
+
+class S3Executor:
+    """
+    Run blocking boto3 S3 calls without blocking the event loop.
+
+    A single, long-lived S3 client is shared by every call (boto3 clients are
+    thread-safe), with a connection pool as large as the number of calls
+    allowed in flight. Calls run on a dedicated thread pool, at most
+    `max_concurrency` at a time, and 429/5xx or connection errors are retried
+    with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = settings.s3_max_concurrency,
+        timeout: float = settings.s3_timeout,
+        max_retries: int = settings.s3_max_retries,
+    ) -> None:
+        self.max_concurrency = max(max_concurrency, 1)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._client: Optional[Any] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def client(self) -> Any:
+        """S3 client, built on first use."""
+
+        if self._client is None:
+            # Stand-ins take any credentials and serve buckets under a path
+            standin_credential = "standin" if settings.s3_endpoint_url else None
+            self._client = boto3.session.Session().client(
+                "s3",
+                aws_access_key_id=settings.aws_access_key_id or standin_credential,
+                aws_secret_access_key=(
+                    settings.aws_secret_access_key or standin_credential
+                ),
+                region_name=settings.aws_region,
+                endpoint_url=settings.s3_endpoint_url,
+                config=Config(
+                    max_pool_connections=self.max_concurrency,
+                    connect_timeout=self.timeout,
+                    read_timeout=self.timeout,
+                    # Retries are done here, per call
+                    retries={"mode": "standard", "total_max_attempts": 1},
+                    s3=(
+                        {"addressing_style": "path"}
+                        if settings.s3_endpoint_url
+                        else None
+                    ),
+                ),
+            )
+        return self._client
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool of the S3 calls."""
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="s3",
+            )
+        return self._executor
+
+    async def start(self) -> None:
+        """Build the client ahead of the first upload."""
+
+        try:
+            await asyncio.to_thread(lambda: self.client)
+        except Exception as err:
+            logger.error(f"Error building the S3 client: {err}")
+
+    async def run(
+        self,
+        function: Callable[[Any], T],
+        description: str = "S3 call",
+    ) -> T:
+        """Run a blocking function of the S3 client, e.g. `lambda client: client.put_object(...)`."""
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        loop = asyncio.get_running_loop()
+        client = self.client
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore:
+                    return await loop.run_in_executor(self.executor, function, client)
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    raise
+
+                backoff = random.uniform(0, min(2**attempt, 32))  # noqa: S311
+                logger.warning(
+                    f"{description} failed ({e!r}), retrying in {backoff:.2f}s",
+                )
+                await asyncio.sleep(backoff)
+
+        raise RuntimeError(f"{description} retries exhausted")
+
+    def shutdown(self) -> None:
+        """Shut the thread pool down, without waiting for running calls."""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+s3_api = S3Executor()
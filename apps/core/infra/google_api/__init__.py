@@ -0,0 +1 @@
+"""Google APIs core infrastructure."""
@@ -0,0 +1,182 @@
+import asyncio
+import contextlib
+import random
+import socket
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+import httplib2
+from fastapi import logger as fastapi_logger
+from googleapiclient.errors import HttpError
+
+from apps.core.config import settings
+from apps.core.infra.google_api.client_manager import (
+    GoogleApi,
+    GoogleClientManager,
+    google_clients,
+)
+
+logger = fastapi_logger.logger
+
+T = TypeVar("T")
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = (
+    asyncio.TimeoutError,
+    socket.timeout,
+    ConnectionError,
+    httplib2.HttpLib2Error,
+)
+
+
+def _get_backoff(error: Exception, attempt: int) -> float:
+    """Retry-After of a Google error, or exponential backoff with full jitter."""
+
+    resp = getattr(error, "resp", None)
+    retry_after = resp.get("retry-after") if resp is not None else None
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+
+    return random.uniform(0, min(2**attempt, 32))  # noqa: S311
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether a failed Google call is worth retrying."""
+
+    if isinstance(error, HttpError):
+        return error.resp.status in RETRYABLE_STATUSES
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+class GoogleApiExecutor:
+    """
+    Run blocking googleapiclient calls without blocking the event loop.
+
+    Calls run on a bounded, dedicated thread pool, each with its own HTTP
+    object, at most `max_concurrency[api]` at a time per API to stay within
+    the Google quotas. Every attempt is bounded by `timeout` and 429/5xx or
+    connection errors of idempotent calls are retried with jittered
+    exponential backoff.
+    """
+
+    def __init__(
+        self,
+        client_manager: GoogleClientManager,
+        max_workers: int = settings.google_api_max_workers,
+        max_concurrency: Optional[dict[GoogleApi, int]] = None,
+        timeout: float = settings.google_api_timeout,
+        max_retries: int = settings.google_api_max_retries,
+    ) -> None:
+        self.client_manager = client_manager
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._semaphores = {
+            api: asyncio.Semaphore(limit)
+            for api, limit in (
+                max_concurrency
+                or {
+                    "drive": settings.google_drive_max_concurrency,
+                    "slides": settings.google_slides_max_concurrency,
+                }
+            ).items()
+        }
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool of the Google calls."""
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="google-api",
+            )
+        return self._executor
+
+    async def execute(
+        self,
+        api: GoogleApi,
+        request: Any,
+        description: str = "",
+        retry: bool = True,
+    ) -> Any:
+        """
+        Execute a googleapiclient request, e.g. `drive.files().get(...)`.
+
+        Pass `retry=False` for requests that aren't idempotent, such as
+        `files().copy` or `presentations().batchUpdate`: a timed out attempt
+        may still have been applied.
+        """
+
+        return await self.run(
+            api,
+            lambda: request.execute(http=self.client_manager.http(api), num_retries=0),
+            description or getattr(request, "methodId", "Google API call"),
+            retry,
+        )
+
+    async def run(
+        self,
+        api: GoogleApi,
+        function: Callable[[], T],
+        description: str = "Google API call",
+        retry: bool = True,
+    ) -> T:
+        """Run a blocking function doing Google calls, with the same limits and retries."""
+
+        max_retries = self.max_retries if retry else 0
+        for attempt in range(max_retries + 1):
+            try:
+                return await self._run_once(api, function)
+            except Exception as e:
+                if attempt >= max_retries or not _is_retryable(e):
+                    raise
+
+                backoff = _get_backoff(e, attempt)
+                logger.warning(
+                    f"{description} failed ({e!r}), retrying in {backoff:.2f}s",
+                )
+                await asyncio.sleep(backoff)
+
+        raise RuntimeError(f"{description} retries exhausted")
+
+    async def _run_once(self, api: GoogleApi, function: Callable[[], T]) -> T:
+        """
+        Run a single attempt in the thread pool, bounded by `timeout`.
+
+        The concurrency slot is released once the thread is done rather than
+        on timeout, a timed out call keeps running and still counts towards
+        the limit.
+        """
+
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores[api]
+
+        def release(_: Future[T]) -> None:
+            # The loop may be closed by the time a call abandoned on shutdown ends
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(semaphore.release)
+
+        await semaphore.acquire()
+        try:
+            future = self.executor.submit(function)
+        except BaseException:
+            semaphore.release()
+            raise
+        future.add_done_callback(release)
+
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+
+    def shutdown(self) -> None:
+        """Shut the thread pool down, without waiting for running calls."""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+google_api = GoogleApiExecutor(google_clients)
@@ -0,0 +1,151 @@
+import asyncio
+import contextlib
+import datetime
+from typing import Any, Literal, Optional
+
+import google_auth_httplib2
+import httplib2
+from fastapi import logger as fastapi_logger
+from google.auth.credentials import AnonymousCredentials, Credentials
+from google.auth.transport.requests import Request
+
+from apps.core.config import settings
+from apps.core.utils.google import (
+    get_google_credentials,
+    get_google_drive_service,
+    get_google_slides_service,
+)
+
+logger = fastapi_logger.logger
+
+GoogleApi = Literal["drive", "slides"]
+
+SCOPES: dict[GoogleApi, list[str]] = {
+    "drive": ["https://www.googleapis.com/auth/drive"],
+    "slides": ["https://www.googleapis.com/auth/presentations"],
+}
+
+
+class GoogleClientManager:
+    """
+    Process-wide Google API clients.
+
+    Credentials and service objects are built once, from the discovery
+    documents bundled with googleapiclient, and shared. Service objects are
+    not thread-safe on their own, so every request must be executed with its
+    own HTTP object from `http`, e.g. `request.execute(http=...)`. Access
+    tokens are refreshed in the background before they expire, keeping the
+    token round trip off the request path.
+    """
+
+    def __init__(self) -> None:
+        self._credentials: dict[GoogleApi, Credentials] = {}
+        self._services: dict[GoogleApi, Any] = {}
+        self._refresh_task: Optional[asyncio.Task[None]] = None
+
+    def credentials(self, api: GoogleApi) -> Credentials:
+        """Get the cached credentials of an API."""
+
+        creds = self._credentials.get(api)
+        if creds is None:
+            creds = get_google_credentials(
+                SCOPES[api],
+                settings.google_cloud_impersonated_account if api == "drive" else None,
+                self._api_endpoint(api),
+            )
+            self._credentials[api] = creds
+        return creds
+
+    def service(self, api: GoogleApi) -> Any:
+        """Get the cached service object of an API."""
+
+        service = self._services.get(api)
+        if service is None:
+            if api == "drive":
+                service = get_google_drive_service(
+                    settings.google_cloud_impersonated_account,
+                    settings.google_drive_api_endpoint,
+                    self.credentials(api),
+                )
+            else:
+                service = get_google_slides_service(
+                    settings.google_slides_api_endpoint,
+                    self.credentials(api),
+                )
+            self._services[api] = service
+        return service
+
+    @property
+    def drive(self) -> Any:
+        """Google Drive service."""
+        return self.service("drive")
+
+    @property
+    def slides(self) -> Any:
+        """Google Slides service."""
+        return self.service("slides")
+
+    def http(self, api: GoogleApi) -> google_auth_httplib2.AuthorizedHttp:
+        """New authorized HTTP object for one request, sharing the credentials."""
+
+        return google_auth_httplib2.AuthorizedHttp(
+            self.credentials(api),
+            http=httplib2.Http(timeout=settings.google_api_timeout),
+        )
+
+    async def start(self) -> None:
+        """Build the clients, get the first tokens and start refreshing them."""
+
+        try:
+            for api in SCOPES:
+                self.service(api)
+        except Exception as err:
+            logger.error(f"Error building Google clients: {err}")
+        await self.refresh_credentials()
+
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def aclose(self) -> None:
+        """Stop refreshing the tokens."""
+
+        if self._refresh_task is None:
+            return
+        self._refresh_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._refresh_task
+        self._refresh_task = None
+
+    async def refresh_credentials(self) -> None:
+        """Refresh the tokens that are missing or close to expiring."""
+
+        margin = datetime.timedelta(seconds=settings.google_token_refresh_margin)
+        for api, creds in self._credentials.items():
+            if isinstance(creds, AnonymousCredentials):
+                continue
+
+            # `expiry` is a naive UTC datetime in google-auth
+            expiry = getattr(creds, "expiry", None)
+            now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+            if creds.token and expiry and expiry - now > margin:
+                continue
+
+            try:
+                await asyncio.to_thread(creds.refresh, Request())
+                logger.debug(f"Refreshed Google {api} access token")
+            except Exception as err:
+                logger.error(f"Error refreshing Google {api} access token: {err}")
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.google_token_refresh_interval)
+            await self.refresh_credentials()
+
+    @staticmethod
+    def _api_endpoint(api: GoogleApi) -> Optional[str]:
+        if api == "drive":
+            return settings.google_drive_api_endpoint
+        return settings.google_slides_api_endpoint
+
+
+google_clients = GoogleClientManager()
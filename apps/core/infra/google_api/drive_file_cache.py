@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+from fastapi import logger as fastapi_logger
+
+from apps.core.config import settings
+from apps.core.utils.google import GoogleDriveFileContentDict
+
+logger = fastapi_logger.logger
+
+# Metadata fields needed to download a file and to tell whether it changed
+DRIVE_FILE_FIELDS = "id,name,mimeType,modifiedTime,md5Checksum,version"
+
+VALIDATOR_FIELDS = ("modifiedTime", "md5Checksum", "version")
+
+
+def get_validator(file: dict[str, Any]) -> Optional[dict[str, str]]:
+    """
+    Fields of the Drive metadata that change with the file content.
+
+    Google Docs files have no `md5Checksum`, their `version` and
+    `modifiedTime` are used alone. Without any of them the file can't be
+    cached.
+    """
+
+    validator = {
+        field: str(file[field]) for field in VALIDATOR_FIELDS if file.get(field)
+    }
+    return validator or None
+
+
+class DriveFileCache:
+    """
+    On-disk cache of parsed Drive files.
+
+    Entries are keyed by file id and hold the Drive metadata fields that
+    change with the content (`modifiedTime`, `md5Checksum`, `version`). An
+    entry is only served while they match the current metadata. Files are
+    written atomically and readable by the app user only, and the least
+    recently used ones are removed above `max_files`. The cache is opt-in,
+    see `settings.google_drive_cache_enabled`.
+    """
+
+    def __init__(self, path: str, max_files: int) -> None:
+        self.path = Path(path)
+        self.max_files = max_files
+
+    def get(self, file: dict[str, Any]) -> Optional[GoogleDriveFileContentDict]:
+        """Parsed content of a file, if cached for its current version."""
+
+        validator = get_validator(file)
+        if validator is None:
+            return None
+
+        entry_path = self._entry_path(file["id"])
+        try:
+            with entry_path.open("r", encoding="utf-8") as entry_file:
+                entry = json.load(entry_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as err:
+            logger.warning(f"Invalid Drive cache entry {entry_path}: {err}")
+            entry_path.unlink(missing_ok=True)
+            return None
+
+        if entry.get("validator") != validator:
+            return None
+
+        # Mark the entry as recently used for the eviction
+        os.utime(entry_path)
+        # Keep one copy of each answer per column, as the download does
+        seen: list[dict[str, str]] = [{} for _ in entry["headers"]]
+        return GoogleDriveFileContentDict.model_construct(
+            headers=entry["headers"],
+            rows=[
+                tuple(
+                    values.setdefault(value, value) for values, value in zip(seen, row)
+                )
+                for row in entry["rows"]
+            ],
+        )
+
+    def set(self, file: dict[str, Any], content: GoogleDriveFileContentDict) -> None:
+        """Cache the parsed content of a file."""
+
+        validator = get_validator(file)
+        if validator is None:
+            return
+
+        # Entries hold survey responses, keep them private to the app user
+        self.path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        entry_path = self._entry_path(file["id"])
+        entry = {
+            "validator": validator,
+            "headers": content.headers,
+            "rows": content.rows,
+        }
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as entry_file:
+                json.dump(entry, entry_file, ensure_ascii=False, separators=(",", ":"))
+            Path(tmp_path).replace(entry_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        self._evict()
+
+    def _entry_path(self, file_id: str) -> Path:
+        """Entry file of a Drive file id, hashed to be a safe file name."""
+
+        return self.path / f"{hashlib.sha256(file_id.encode()).hexdigest()}.json"
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries above `max_files`."""
+
+        entries = sorted(
+            self.path.glob("*.json"),
+            key=lambda entry: entry.stat().st_mtime,
+            reverse=True,
+        )
+        for entry in entries[self.max_files :]:
+            entry.unlink(missing_ok=True)
+
+
+drive_file_cache = DriveFileCache(
+    settings.google_drive_cache_path,
+    settings.google_drive_cache_max_files,
+)
@@ -0,0 +1 @@
+"""OpenAI core infrastructure."""
@@ -0,0 +1,90 @@
+import asyncio
+import weakref
+from typing import Literal
+
+import httpx
+from fastapi import logger as fastapi_logger
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from apps.core.config import settings
+
+logger = fastapi_logger.logger
+
+OpenAIClientPurpose = Literal["embeddings", "chat", "reasoning"]
+
+
+class OpenAIClientRegistry:
+    """
+    Async OpenAI clients, one per purpose and event loop.
+
+    Each purpose gets its own keep-alive connection pool, so long reasoning
+    calls can't starve the embedding or chat calls of connections, and its own
+    timeouts. Clients are created on startup (or on first use outside of the
+    API, e.g. in scripts) and closed on shutdown.
+
+    Pooled connections belong to the loop that opened them, so every loop
+    gets its own clients. E.g. CrewAI runs async tools with `asyncio.run` in
+    a worker thread, a new loop per call, and its clients go away with it.
+
+    The SDK retries are disabled, callers retry with `call_with_retries` or
+    their own limiter.
+    """
+
+    purposes: tuple[OpenAIClientPurpose, ...] = ("embeddings", "chat", "reasoning")
+
+    def __init__(self) -> None:
+        self._clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop,
+            dict[OpenAIClientPurpose, AsyncOpenAI],
+        ] = weakref.WeakKeyDictionary()
+
+    def get(self, purpose: OpenAIClientPurpose) -> AsyncOpenAI:
+        """Get the client of a purpose on the running loop, creating it if needed."""
+
+        clients = self._clients.setdefault(asyncio.get_running_loop(), {})
+        client = clients.get(purpose)
+        if client is None:
+            client = self._create_client(purpose)
+            clients[purpose] = client
+        return client
+
+    def start(self) -> None:
+        """Create the clients of every purpose on the running loop."""
+
+        for purpose in self.purposes:
+            self.get(purpose)
+
+    async def aclose(self) -> None:
+        """Close the clients of the running loop and their connection pools."""
+
+        clients = self._clients.pop(asyncio.get_running_loop(), {})
+        for client in clients.values():
+            await client.close()
+
+    def _create_client(self, purpose: OpenAIClientPurpose) -> AsyncOpenAI:
+        """Create a client with its own pool and timeouts."""
+
+        read_timeout = (
+            settings.openai_reasoning_timeout
+            if purpose == "reasoning"
+            else settings.openai_timeout
+        )
+        timeout = httpx.Timeout(read_timeout, connect=settings.openai_connect_timeout)
+        limits = httpx.Limits(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+            keepalive_expiry=settings.openai_keepalive_expiry,
+        )
+        logger.debug(f"Creating OpenAI {purpose} client")
+
+        return AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            organization=settings.openai_organization_id,
+            base_url=settings.openai_api_url,
+            timeout=timeout,
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(timeout=timeout, limits=limits),
+        )
+
+
+openai_clients = OpenAIClientRegistry()
@@ -0,0 +1,95 @@
+import asyncio
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+from fastapi import logger as fastapi_logger
+from openai import APIConnectionError, InternalServerError, RateLimitError
+
+from apps.core.config import settings
+
+logger = fastapi_logger.logger
+
+T = TypeVar("T")
+
+# Errors worth retrying, `APITimeoutError` is an `APIConnectionError`
+RETRYABLE_ERRORS = (
+    RateLimitError,
+    APIConnectionError,
+    InternalServerError,
+    asyncio.TimeoutError,
+)
+
+
+def get_retry_after(response: Optional[httpx.Response], attempt: int) -> float:
+    """Get how long to wait before retrying, honoring the Retry-After headers."""
+
+    headers = response.headers if response is not None else {}
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+                return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
+            except (TypeError, ValueError):
+                pass
+
+    # Exponential backoff with jitter when the API does not tell us
+    return min(2**attempt, 30) + random.uniform(0, 1)  # noqa: S311
+
+
+async def call_with_retries(
+    call: Callable[[], Awaitable[T]],
+    timeout: Optional[float] = None,
+    max_retries: int = settings.openai_max_retries,
+    description: str = "OpenAI call",
+    deadline: Optional[float] = None,
+) -> T:
+    """
+    Await an OpenAI call, retrying transient errors with backoff.
+
+    `call` is invoked once per attempt and each attempt is bounded by
+    `timeout` seconds. Rate limits, connection errors, 5xx and timeouts are
+    retried up to `max_retries` times, anything else is raised right away.
+    `deadline` bounds all the attempts and their backoffs together, in
+    seconds: an attempt only gets the time left, and no retry starts after it.
+    """
+
+    loop = asyncio.get_running_loop()
+    expires_at = loop.time() + deadline if deadline is not None else None
+
+    for attempt in range(max_retries + 1):
+        attempt_timeout = timeout
+        if expires_at is not None:
+            remaining = max(expires_at - loop.time(), 0)
+            attempt_timeout = remaining if timeout is None else min(timeout, remaining)
+
+        try:
+            return await asyncio.wait_for(call(), timeout=attempt_timeout)
+        except RETRYABLE_ERRORS as e:
+            backoff = get_retry_after(getattr(e, "response", None), attempt)
+            out_of_time = expires_at is not None and loop.time() + backoff >= expires_at
+            if attempt >= max_retries or out_of_time:
+                logger.error(
+                    f"{description} failed after {attempt + 1} attempts: {e!r}",
+                )
+                raise
+
+            logger.warning(
+                f"{description} failed ({e!r}), retrying in {backoff:.2f}s",
+            )
+            await asyncio.sleep(backoff)
+
+    raise RuntimeError(f"{description} retries exhausted")
@@ -0,0 +1,41 @@
+"""Add content hashes to resources and resource chunks
+
+Revision ID: f74c7e752ad6
+Revises: c9cfd2471ae3
+Create Date: 2026-10-18 09:12:41.513204
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "f74c7e752ad6"
+down_revision = "c9cfd2471ae3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "resources",
+        sa.Column("content_hash", sa.String(64), nullable=True),
+    )
+    op.add_column(
+        "resource_chunks",
+        sa.Column("content_hash", sa.String(64), nullable=True),
+    )
+    op.create_index(
+        "ix_resource_chunks_resource_id_content_hash",
+        "resource_chunks",
+        ["resource_id", "content_hash"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_resource_chunks_resource_id_content_hash",
+        table_name="resource_chunks",
+    )
+    op.drop_column("resource_chunks", "content_hash")
+    op.drop_column("resources", "content_hash")
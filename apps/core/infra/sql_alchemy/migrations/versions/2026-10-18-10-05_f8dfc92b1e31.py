@@ -0,0 +1,50 @@
+"""Add embedding cache table
+
+Revision ID: f8dfc92b1e31
+Revises: f74c7e752ad6
+Create Date: 2026-10-18 10:05:12.340871
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+# revision identifiers, used by Alembic.
+revision = "f8dfc92b1e31"
+down_revision = "f74c7e752ad6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "embedding_cache",
+        sa.Column("model", sa.String(), primary_key=True),
+        sa.Column("dimensions", sa.Integer(), primary_key=True),
+        sa.Column("text_hash", sa.String(64), primary_key=True),
+        sa.Column("embedding", Vector(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            onupdate=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_embedding_cache_created_at",
+        "embedding_cache",
+        ["created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_embedding_cache_created_at", table_name="embedding_cache")
+    op.drop_table("embedding_cache")
@@ -0,0 +1,33 @@
+"""Add ANN index on resource chunk embeddings
+
+HNSW index with the L2 operator class, matching the distance used by the
+search queries.
+
+Revision ID: 128375abdb14
+Revises: f8dfc92b1e31
+Create Date: 2026-10-18 10:41:27.902316
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "128375abdb14"
+down_revision = "f8dfc92b1e31"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build without locking writes on resource_chunks
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_resource_chunks_embedding "
+            "ON resource_chunks USING hnsw (embedding vector_l2_ops) "
+            "WITH (m = 16, ef_construction = 64)",
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY ix_resource_chunks_embedding")
@@ -1,6 +1,6 @@
 from typing import Awaitable, Callable
 
-from fastapi import HTTPException, Request, Response
+from fastapi import Header, HTTPException, Request, Response
 from fastapi import logger as fastapi_logger
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
@@ -10,6 +10,42 @@ from apps.core.config import settings
 logger = fastapi_logger.logger
 
 
+def validate_quinn_api_key(quinn_api_key: str | None, path: str) -> None:
+    """Validate a Quinn API key, raising 500, 401 or 403 if it can't be used."""
+
+    if not settings.quinn_api_key or settings.quinn_api_key.strip() == "":
+        logger.error("No Quinn API key configured in environment variables")
+        raise HTTPException(
+            status_code=500,
+            detail="Server configuration error: Quinn API key not configured. Please contact admin",
+        )
+
+    if not quinn_api_key:
+        logger.warning(f"Quinn API key missing for request to {path}")
+        raise HTTPException(
+            status_code=401,
+            detail="Quinn API key required. Please include 'X-Quinn-API-Key' header.",
+        )
+
+    if quinn_api_key.strip() != settings.quinn_api_key.strip():
+        logger.warning(
+            f"Invalid Quinn API key provided for request to {path}",
+        )
+        raise HTTPException(
+            status_code=403,
+            detail="Invalid Quinn API key provided.",
+        )
+
+
+async def verify_quinn_api_key(
+    request: Request,
+    x_quinn_api_key: str = Header(None),
+) -> None:
+    """Dependency protecting a route with the Quinn API key."""
+
+    validate_quinn_api_key(x_quinn_api_key, request.url.path)
+
+
 class QuinnServerMiddleware(BaseHTTPMiddleware):
     """
     Middleware to validate Quinn API key in request headers.
@@ -62,29 +98,10 @@ class QuinnServerMiddleware(BaseHTTPMiddleware):
             return await call_next(request)
 
         logger.info(f"Protecting path {request.url.path} - checking API key")
-        if not settings.quinn_api_key or settings.quinn_api_key.strip() == "":
-            logger.error("No Quinn API key configured in environment variables")
-            raise HTTPException(
-                status_code=500,
-                detail="Server configuration error: Quinn API key not configured. Please contact admin",
-            )
-
-        quinn_api_key = request.headers.get("X-Quinn-API-Key")
-        if not quinn_api_key:
-            logger.warning(f"Quinn API key missing for request to {request.url.path}")
-            raise HTTPException(
-                status_code=401,
-                detail="Quinn API key required. Please include 'X-Quinn-API-Key' header.",
-            )
-
-        if quinn_api_key.strip() != settings.quinn_api_key.strip():
-            logger.warning(
-                f"Invalid Quinn API key provided for request to {request.url.path}",
-            )
-            raise HTTPException(
-                status_code=403,
-                detail="Invalid Quinn API key provided.",
-            )
+        validate_quinn_api_key(
+            request.headers.get("X-Quinn-API-Key"),
+            request.url.path,
+        )
 
         logger.debug(f"Valid Quinn API key provided for request to {request.url.path}")
         return await call_next(request)
@@ -0,0 +1,59 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from apps.core.utils.metrics import LatencyRecorder, start_stage_timings
+
+
+class ServerTimingMiddleware:
+    """
+    Middleware to time requests and their pipeline stages.
+
+    Stages timed with `apps.core.utils.metrics.stage` are returned in a
+    `Server-Timing` header, next to the total, and recorded per path in the
+    latency recorder exposed by the monitor router.
+
+    It is a plain ASGI middleware so the endpoint runs in the same context as
+    the stage timings.
+    """
+
+    def __init__(self, app: ASGIApp, recorder: LatencyRecorder) -> None:
+        """
+        Initialize the Server-Timing middleware.
+
+        Args:
+            app: The ASGI application
+            recorder: Where request and stage latencies are recorded
+        """
+        self.app = app
+        self.recorder = recorder
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Time the request and add the `Server-Timing` header."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        start = time.perf_counter()
+        timings = start_stage_timings()
+
+        async def send_with_server_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                total = (time.perf_counter() - start) * 1000
+                header = [
+                    f"{name};dur={duration:.1f}" for name, duration in timings.items()
+                ]
+                header.append(f"total;dur={total:.1f}")
+                MutableHeaders(scope=message).append("Server-Timing", ", ".join(header))
+
+                # Unknown paths would grow the recorder without bound
+                if message["status"] != 404:
+                    self.recorder.record(f"request:{path}", total)
+                    for name, duration in timings.items():
+                        self.recorder.record(f"stage:{path}:{name}", duration)
+
+            await send(message)
+
+        await self.app(scope, receive, send_with_server_timing)
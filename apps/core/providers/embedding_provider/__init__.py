@@ -0,0 +1,43 @@
+from functools import lru_cache
+from typing import Optional
+
+from apps.core.config import settings
+from apps.core.providers.embedding_provider.repositories.cached_embedding_repository import (
+    CachedEmbeddingRepository,
+    EmbeddingLRUCache,
+)
+from apps.core.providers.embedding_provider.repositories.openai_embedding_repository import (
+    OpenAIEmbeddingRepository,
+)
+from apps.core.providers.embedding_provider.repository_interfaces.embedding_cache_repository_interface import (
+    IEmbeddingCacheRepository,
+)
+from apps.core.providers.embedding_provider.repository_interfaces.embedding_repository_interface import (
+    IEmbeddingProvider,
+)
+
+embedding_lru_cache = EmbeddingLRUCache(settings.embedding_cache_lru_size)
+
+
+@lru_cache(maxsize=1)
+def _get_openai_embedding_provider() -> IEmbeddingProvider:
+    """Get the process-wide OpenAI embedding provider."""
+
+    return OpenAIEmbeddingRepository()
+
+
+def get_embedding_provider(
+    cache_repository: Optional[IEmbeddingCacheRepository] = None,
+) -> IEmbeddingProvider:
+    """
+    Get the embedding provider.
+
+    Every call shares the process-wide LRU cache; `cache_repository` adds the
+    persistent cache behind it.
+    """
+
+    return CachedEmbeddingRepository(
+        _get_openai_embedding_provider(),
+        embedding_lru_cache,
+        cache_repository,
+    )
@@ -0,0 +1,127 @@
+import hashlib
+from collections import OrderedDict
+from typing import List, Optional
+
+from apps.core.providers.embedding_provider.repository_interfaces.embedding_cache_repository_interface import (
+    IEmbeddingCacheRepository,
+)
+from apps.core.providers.embedding_provider.repository_interfaces.embedding_repository_interface import (
+    IEmbeddingProvider,
+)
+
+CacheKey = tuple[str, int, str]
+
+
+class EmbeddingLRUCache:
+    """In-process LRU cache of embeddings with hit/miss counters."""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[CacheKey, list[float]] = OrderedDict()
+
+    def get(self, key: CacheKey) -> Optional[list[float]]:
+        """Get an embedding, marking it as recently used."""
+
+        embedding = self._entries.get(key)
+        if embedding is not None:
+            self._entries.move_to_end(key)
+        return embedding
+
+    def set(self, key: CacheKey, embedding: list[float]) -> None:
+        """Store an embedding, evicting the least recently used ones."""
+
+        if self.max_size <= 0:
+            return
+
+        self._entries[key] = embedding
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        """Get cache counters."""
+
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+        }
+
+
+class CachedEmbeddingRepository(IEmbeddingProvider):
+    """
+    Embedding repository with a two-level cache.
+
+    Lookups go to the in-process LRU first, then to the persistent cache
+    repository (if any), and only the remaining texts reach the wrapped
+    provider. Entries are keyed by (model, dimensions, sha256(text)).
+    """
+
+    def __init__(
+        self,
+        provider: IEmbeddingProvider,
+        lru_cache: EmbeddingLRUCache,
+        cache_repository: Optional[IEmbeddingCacheRepository] = None,
+    ) -> None:
+        self.provider = provider
+        self.lru_cache = lru_cache
+        self.cache_repository = cache_repository
+        self.model = provider.model
+        self.dimensions = provider.dimensions
+
+    async def embed(self, texts: List[str]) -> List[list[float]]:
+        """Embed texts, only sending cache misses to the provider."""
+
+        dimensions = self.dimensions or 0
+        text_hashes = [
+            hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts
+        ]
+        texts_by_hash = dict(zip(text_hashes, texts))
+
+        embeddings: dict[str, list[float]] = {}
+        for text_hash in texts_by_hash:
+            embedding = self.lru_cache.get((self.model, dimensions, text_hash))
+            if embedding is not None:
+                embeddings[text_hash] = embedding
+        self.lru_cache.hits += len(embeddings)
+
+        missing_hashes = [h for h in texts_by_hash if h not in embeddings]
+        if missing_hashes and self.cache_repository:
+            stored_embeddings = await self.cache_repository.get_many(
+                self.model,
+                dimensions,
+                missing_hashes,
+            )
+            self.lru_cache.store_hits += len(stored_embeddings)
+            for text_hash, embedding in stored_embeddings.items():
+                embeddings[text_hash] = embedding
+                self.lru_cache.set((self.model, dimensions, text_hash), embedding)
+            missing_hashes = [h for h in missing_hashes if h not in embeddings]
+
+        if missing_hashes:
+            self.lru_cache.misses += len(missing_hashes)
+            new_embeddings = dict(
+                zip(
+                    missing_hashes,
+                    await self.provider.embed(
+                        [texts_by_hash[h] for h in missing_hashes],
+                    ),
+                ),
+            )
+            for text_hash, embedding in new_embeddings.items():
+                embeddings[text_hash] = embedding
+                self.lru_cache.set((self.model, dimensions, text_hash), embedding)
+
+            if self.cache_repository:
+                await self.cache_repository.set_many(
+                    self.model,
+                    dimensions,
+                    new_embeddings,
+                )
+
+        return [embeddings[text_hash] for text_hash in text_hashes]
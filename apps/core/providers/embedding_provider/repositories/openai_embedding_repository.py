@@ -0,0 +1,103 @@
+import asyncio
+from typing import List
+
+from fastapi import logger as fastapi_logger
+from openai import APIConnectionError, AsyncOpenAI, InternalServerError, RateLimitError
+
+from apps.core.config import settings
+from apps.core.infra.open_ai.client_registry import openai_clients
+from apps.core.infra.open_ai.retries import get_retry_after
+from apps.core.providers.embedding_provider.repository_interfaces.embedding_repository_interface import (
+    IEmbeddingProvider,
+)
+from apps.core.utils.concurrency import AdaptiveConcurrencyLimiter
+
+logger = fastapi_logger.logger
+
+
+class OpenAIEmbeddingRepository(IEmbeddingProvider):
+    """OpenAI embedding repository."""
+
+    def __init__(
+        self,
+        model: str = settings.openai_embedding_model,
+        dimensions: int | None = None,
+        batch_size: int = settings.openai_embedding_batch_size,
+        max_concurrency: int = settings.openai_embedding_max_concurrency,
+        max_retries: int = settings.openai_embedding_max_retries,
+    ) -> None:
+        self.model = model
+        self.dimensions = dimensions
+        self.batch_size = max(batch_size, 1)
+        self.max_retries = max_retries
+        self.limiter = AdaptiveConcurrencyLimiter(max_concurrency)
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """Pooled embeddings client, retries are handled by the limiter."""
+
+        return openai_clients.get("embeddings")
+
+    async def embed(self, texts: List[str]) -> List[list[float]]:
+        """Embed texts concurrently in batches, preserving their order."""
+
+        if not texts:
+            return []
+
+        batches = [
+            texts[i : i + self.batch_size]
+            for i in range(0, len(texts), self.batch_size)
+        ]
+        tasks = [asyncio.create_task(self._embed_batch(batch)) for batch in batches]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            # A failed batch cancels its siblings, its own error is re-raised as is
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        return [embedding for result in results for embedding in result]
+
+    async def _embed_batch(self, batch: List[str]) -> List[list[float]]:
+        """Embed a single batch, retrying on rate limits and transient errors."""
+
+        for attempt in range(self.max_retries + 1):
+            backoff = 0.0
+            async with self.limiter.slot():
+                try:
+                    if self.dimensions:
+                        response = await self.client.embeddings.create(
+                            input=batch,
+                            model=self.model,
+                            dimensions=self.dimensions,
+                        )
+                    else:
+                        response = await self.client.embeddings.create(
+                            input=batch,
+                            model=self.model,
+                        )
+                except RateLimitError as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    self.limiter.record_rate_limit(get_retry_after(e.response, attempt))
+                    continue
+                except (APIConnectionError, InternalServerError) as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    backoff = get_retry_after(getattr(e, "response", None), attempt)
+                    logger.warning(
+                        f"Embedding batch failed ({e}), retrying in {backoff:.2f}s",
+                    )
+
+            if backoff:
+                await asyncio.sleep(backoff)
+                continue
+
+            self.limiter.record_success()
+            return [
+                item.embedding for item in sorted(response.data, key=lambda d: d.index)
+            ]
+
+        raise RuntimeError("Embedding batch retries exhausted")
@@ -0,0 +1 @@
+"""Embedding Provider Repository Interfaces."""
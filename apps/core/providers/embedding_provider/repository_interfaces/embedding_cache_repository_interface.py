@@ -0,0 +1,29 @@
+from abc import abstractmethod
+from datetime import timedelta
+from typing import List
+
+
+class IEmbeddingCacheRepository:
+    """Persistent embedding cache repository interface."""
+
+    @abstractmethod
+    async def get_many(
+        self,
+        model: str,
+        dimensions: int,
+        text_hashes: List[str],
+    ) -> dict[str, list[float]]:
+        """Get cached embeddings by text hash."""
+
+    @abstractmethod
+    async def set_many(
+        self,
+        model: str,
+        dimensions: int,
+        embeddings: dict[str, list[float]],
+    ) -> None:
+        """Store embeddings by text hash."""
+
+    @abstractmethod
+    async def evict(self, max_age: timedelta, max_rows: int) -> int:
+        """Evict entries older than `max_age` or beyond `max_rows`."""
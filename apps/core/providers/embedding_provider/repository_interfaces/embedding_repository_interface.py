@@ -0,0 +1,13 @@
+from abc import abstractmethod
+from typing import List
+
+
+class IEmbeddingProvider:
+    """Embedding provider interface."""
+
+    model: str
+    dimensions: int | None
+
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> List[list[float]]:
+        """Embed texts, preserving their order."""
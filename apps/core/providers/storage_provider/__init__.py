@@ -1,11 +1,16 @@
 from typing import Literal
 
+from starlette.requests import Request
+
 from apps.core.providers.storage_provider.repositories.disk_storage_repository import (
     DiskStorageRepository,
 )
 from apps.core.providers.storage_provider.repositories.s3_storage_repository import (
     S3StorageRepository,
 )
+from apps.core.providers.storage_provider.repositories.tiered_storage_repository import (
+    TieredStorageRepository,
+)
 from apps.core.providers.storage_provider.repository_interfaces.storage_repository_interface import (
     IStorageProvider,
 )
@@ -13,14 +18,26 @@ from apps.core.providers.storage_provider.repository_interfaces.storage_reposito
 options = {
     "s3": S3StorageRepository,
     "disk": DiskStorageRepository,
+    "tiered": TieredStorageRepository,
 }
 
 
-def get_storage_provider(type: Literal["s3", "disk"]) -> IStorageProvider:
-    """Get the storage provider."""
+def get_storage_provider(type: Literal["s3", "disk", "tiered"]) -> IStorageProvider:
+    """
+    Get a new storage provider.
+
+    The application creates one in its lifespan, get it with
+    `get_app_storage_provider`.
+    """
 
     storage_provider = options.get(type)
     if not storage_provider:
         raise ValueError(f"Storage provider {type} not found")
 
     return storage_provider()
+
+
+def get_app_storage_provider(request: Request) -> IStorageProvider:
+    """Get the storage provider of the application, started by the lifespan."""
+
+    return request.app.state.storage_provider
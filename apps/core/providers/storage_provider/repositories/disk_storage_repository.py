@@ -1,6 +1,12 @@
-import base64
-import uuid
+import asyncio
+import errno
+import os
+import shutil
+import tempfile
+import time
+from contextlib import suppress
 from pathlib import Path
+from typing import Any, BinaryIO, Callable, Container, Optional
 
 from fastapi import HTTPException
 from fastapi import logger as fastapi_logger
@@ -8,18 +14,112 @@ from fastapi import logger as fastapi_logger
 from apps.core.config import settings
 from apps.core.providers.storage_provider.repository_interfaces.storage_repository_interface import (
     IStorageProvider,
+    decode_base64,
 )
 
 logger = fastapi_logger.logger
 
 
+# Errors of kernel copies between files that don't support them, e.g. across file systems
+UNSUPPORTED_COPY_ERRORS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+}
+
+
+def _copy_file(source: BinaryIO, destination: BinaryIO, block_size: int) -> None:
+    """
+    Copy a file object to a file in blocks.
+
+    Regular files are copied in the kernel with `copy_file_range` or
+    `sendfile` when the platform has them, other streams through a buffer.
+    """
+
+    try:
+        source_fd = source.fileno()
+        destination_fd = destination.fileno()
+        # Start where the file object is, it may have buffered some data
+        os.lseek(source_fd, source.tell(), os.SEEK_SET)
+    except OSError:
+        shutil.copyfileobj(source, destination, block_size)
+        return
+
+    destination.flush()
+    if hasattr(os, "copy_file_range"):
+        try:
+            while os.copy_file_range(source_fd, destination_fd, block_size):
+                pass
+            return
+        except OSError as e:
+            if e.errno not in UNSUPPORTED_COPY_ERRORS:
+                raise
+
+    if hasattr(os, "sendfile"):
+        try:
+            while os.sendfile(destination_fd, source_fd, None, block_size):
+                pass
+            return
+        except OSError as e:
+            if e.errno not in UNSUPPORTED_COPY_ERRORS:
+                raise
+
+    shutil.copyfileobj(source, destination, block_size)
+
+
 class DiskStorageRepository(IStorageProvider):
-    """Disk storage repository."""
+    """
+    Disk storage repository.
+
+    Files are written on a thread, aside then renamed into place. A
+    background task evicts the least recently used files above `max_bytes`
+    and the files unused for `ttl` seconds. Reusing a file through `exists`
+    counts as a use. Paths in `pinned`, e.g. files still to be replicated,
+    are never evicted.
+    """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        max_bytes: int = settings.disk_storage_max_bytes,
+        ttl: float = settings.disk_storage_ttl,
+        eviction_interval: float = settings.disk_storage_eviction_interval,
+        block_size: int = settings.disk_storage_block_size,
+    ) -> None:
         """Initialize disk storage directory."""
         self.storage_path = Path(settings.disk_storage_path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.eviction_interval = eviction_interval
+        self.block_size = block_size
+        self.pinned: Container[Path] = frozenset()
+        self._eviction_task: Optional[asyncio.Task[None]] = None
+
+    async def start(self) -> None:
+        """Create the storage directory and start the eviction."""
+
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        if (self.max_bytes > 0 or self.ttl > 0) and self._eviction_task is None:
+            self._eviction_task = asyncio.create_task(self._eviction_loop())
+
+    async def health(self) -> dict[str, bool]:
+        """Whether the storage directory is writable."""
+
+        return {
+            "disk": self.storage_path.is_dir()
+            and os.access(self.storage_path, os.W_OK),
+        }
+
+    async def aclose(self) -> None:
+        """Stop the eviction."""
+
+        if self._eviction_task is None:
+            return
+        self._eviction_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._eviction_task
+        self._eviction_task = None
 
     async def upload_file(self, file_path: str, file_name: str) -> str:
         """Upload a file to the local disk storage.
@@ -31,40 +131,153 @@ class DiskStorageRepository(IStorageProvider):
         Returns:
             The public URL of the uploaded file
         """
+        file_data = decode_base64(file_path)
+        if file_data is not None:
+            return await self.upload_bytes(file_data, file_name)
+
+        source_path = Path(file_path)
+        if not source_path.exists():
+            raise HTTPException(
+                status_code=404,
+                detail=f"File not found: {file_path}",
+            )
+
+        with source_path.open("rb") as file_obj:
+            return await self.upload_stream(file_obj, file_name)
+
+    async def upload_bytes(
+        self,
+        data: bytes | bytearray | memoryview,
+        file_name: str,
+        content_type: Optional[str] = None,
+    ) -> str:
+        """
+        Write raw data to the local disk storage, returning its public URL.
+
+        The content type is served from the file extension.
+        """
+
+        return await self._write(file_name, lambda file: file.write(data))
+
+    async def upload_stream(
+        self,
+        stream: BinaryIO,
+        file_name: str,
+        content_type: Optional[str] = None,
+    ) -> str:
+        """Copy a binary file object to the local disk storage, returning its public URL."""
+
+        return await self._write(
+            file_name,
+            lambda file: _copy_file(stream, file, self.block_size),
+        )
+
+    async def exists(self, file_name: str) -> bool:
+        """Check if a file was already uploaded to the disk storage under this name."""
+
+        path = self.get_path(file_name)
         try:
-            file_extension = Path(file_name).suffix
-            unique_filename = (
-                f"{Path(file_name).stem}_{uuid.uuid4().hex[:8]}{file_extension}"
+            # Mark the file as recently used for the eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return path.is_file()
+
+    def get_url(self, file_name: str) -> str:
+        """Get the public URL of a file in the disk storage."""
+
+        return f"{settings.disk_storage_base_url}/{file_name}"
+
+    def get_path(self, file_name: str) -> Path:
+        """Get the path of a file name, which must stay in the storage directory."""
+
+        path = (self.storage_path / file_name).resolve()
+        if not path.is_relative_to(self.storage_path.resolve()):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid file name: {file_name}",
             )
-            destination_path = self.storage_path / unique_filename
+        return path
 
-            if self._is_base64(file_path):
-                file_data = base64.b64decode(file_path)
-                with destination_path.open("wb") as f:
-                    f.write(file_data)
-            else:
-                source_path = Path(file_path)
-                if not source_path.exists():
-                    raise HTTPException(
-                        status_code=404,
-                        detail=f"File not found: {file_path}",
-                    )
+    def evict(self) -> int:
+        """
+        Remove the files unused for `ttl` seconds, then the LRU ones above `max_bytes`.
+
+        Least recently used files are removed until the directory is under
+        `max_bytes`, pinned files are skipped. Temporary files of writes that
+        didn't finish are removed after an hour. It returns the number of
+        bytes freed.
+        """
+
+        now = time.time()
+        files: list[tuple[float, int, Path]] = []
+        freed = 0
+        # Resolved, like the paths of `get_path` that get pinned
+        for path in self.storage_path.resolve().rglob("*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if not path.is_file() or path in self.pinned:
+                continue
+
+            age = now - stat.st_mtime
+            if (path.suffix == ".tmp" and age > 3600) or (
+                path.suffix != ".tmp" and self.ttl > 0 and age > self.ttl
+            ):
+                path.unlink(missing_ok=True)
+                freed += stat.st_size
+            elif path.suffix != ".tmp":
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        if self.max_bytes > 0 and total > self.max_bytes:
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                freed += size
 
-                with source_path.open("rb") as src, destination_path.open("wb") as dst:
-                    dst.write(src.read())
+        return freed
 
-            return f"{settings.disk_storage_base_url}/{unique_filename}"
+    async def _eviction_loop(self) -> None:
+        while True:
+            try:
+                freed = await asyncio.to_thread(self.evict)
+                if freed:
+                    logger.info(f"Evicted {freed} bytes from the disk storage")
+            except Exception as err:
+                logger.error(f"Error evicting files from the disk storage: {err}")
+            await asyncio.sleep(self.eviction_interval)
 
+    async def _write(self, file_name: str, write: Callable[[BinaryIO], Any]) -> str:
+        """Write a file in the storage directory on a thread, returning its public URL."""
+
+        try:
+            destination_path = self.get_path(file_name)
+            await asyncio.to_thread(self._write_atomically, destination_path, write)
+            return self.get_url(file_name)
+
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Failed to upload file to disk storage: {e}")
             raise HTTPException(status_code=500, detail=f"Upload failed: {e!s}") from e
 
-    def _is_base64(self, data: str) -> bool:
-        """Check if string is base64 encoded."""
+    @staticmethod
+    def _write_atomically(
+        destination_path: Path,
+        write: Callable[[BinaryIO], Any],
+    ) -> None:
+        """Write a file aside then rename it, so it's never seen half written."""
+
+        destination_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=destination_path.parent, suffix=".tmp")
         try:
-            if len(data) % 4 != 0:
-                return False
-            base64.b64decode(data, validate=True)
-            return True
-        except Exception:
-            return False
+            with os.fdopen(fd, "wb") as file:
+                write(file)
+            Path(tmp_path).replace(destination_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
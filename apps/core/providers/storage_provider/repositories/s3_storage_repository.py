@@ -1,37 +1,123 @@
-import base64
+import asyncio
+import io
 from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, NoReturn, Optional, Union
 
-import boto3
-from botocore.exceptions import ClientError, NoCredentialsError
+from botocore.exceptions import ClientError
 from fastapi import HTTPException
 from fastapi import logger as fastapi_logger
 
 from apps.core.config import settings
+from apps.core.infra.aws.s3_executor import S3Executor, s3_api
 from apps.core.providers.storage_provider.repository_interfaces.storage_repository_interface import (
     IStorageProvider,
+    decode_base64,
+    get_content_type,
 )
 
 logger = fastapi_logger.logger
 
+# Smallest part S3 accepts, but for the last one
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+Body = Union[bytes, bytearray, memoryview]
+
+
+class MemoryViewReader(io.RawIOBase):
+    """Seekable file object reading a memory view, without copying it."""
+
+    def __init__(self, view: memoryview) -> None:
+        self._view = view.cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        """The view can be read."""
+
+        return True
+
+    def seekable(self) -> bool:
+        """Botocore seeks the body to hash it and to rewind it."""
+
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Read the next bytes of the view into a buffer."""
+
+        target = memoryview(buffer).cast("B")
+        chunk = self._view[self._position : self._position + len(target)]
+        target[: len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move to a position in the view."""
+
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(offset, 0)
+        return self._position
+
+    def tell(self) -> int:
+        """Current position in the view."""
+
+        return self._position
+
+
+def _get_body(data: Body) -> Body | MemoryViewReader:
+    """
+    Get the request body of some data.
+
+    boto3 takes bytes and bytearrays as is, memory views are read through a
+    file object rather than copied. A new one is needed for each attempt.
+    """
+
+    return MemoryViewReader(data) if isinstance(data, memoryview) else data
+
 
 class S3StorageRepository(IStorageProvider):
-    """S3 storage repository."""
+    """
+    S3 storage repository.
+
+    Calls go through the shared S3 executor, so uploads run concurrently off
+    the event loop on one long-lived client. Objects from
+    `multipart_threshold` bytes are uploaded in parts, in parallel, each
+    retried on its own.
+    """
+
+    def __init__(
+        self,
+        api: S3Executor = s3_api,
+        multipart_threshold: int = settings.s3_multipart_threshold,
+        multipart_chunk_size: int = settings.s3_multipart_chunk_size,
+    ) -> None:
+        self.api = api
+        self.multipart_chunk_size = max(multipart_chunk_size, MIN_PART_SIZE)
+        self.multipart_threshold = max(multipart_threshold, self.multipart_chunk_size)
+
+    async def start(self) -> None:
+        """Build the S3 client ahead of the first upload."""
+
+        await self.api.start()
+
+    async def health(self) -> dict[str, bool]:
+        """Whether the bucket can be reached."""
 
-    def __init__(self) -> None:
-        """Initialize S3 client."""
         try:
-            self.s3_client = boto3.client(
-                "s3",
-                aws_access_key_id=settings.aws_access_key_id,
-                aws_secret_access_key=settings.aws_secret_access_key,
-                region_name=settings.aws_region,
+            await self.api.run(
+                lambda client: client.head_bucket(Bucket=settings.s3_bucket_name),
+                "S3 head bucket",
             )
-        except NoCredentialsError as e:
-            logger.error("AWS credentials not found")
-            raise HTTPException(
-                status_code=500,
-                detail="AWS credentials not configured",
-            ) from e
+            return {"s3": True}
+        except Exception as e:
+            logger.error(f"S3 health check failed: {e}")
+            return {"s3": False}
+
+    async def aclose(self) -> None:
+        """Stop the S3 calls thread pool."""
+
+        self.api.shutdown()
 
     async def upload_file(self, file_path: str, file_name: str) -> str:
         """Upload a file to the S3 storage provider.
@@ -43,69 +129,233 @@ class S3StorageRepository(IStorageProvider):
         Returns:
             The public URL of the uploaded file
         """
-        try:
-            file_key = f"{settings.s3_bucket_folder}/{file_name}"
+        file_data = decode_base64(file_path)
+        if file_data is not None:
+            return await self.upload_bytes(file_data, file_name)
 
-            if self._is_base64(file_path):
-                file_data = base64.b64decode(file_path)
+        if not Path(file_path).exists():
+            raise HTTPException(
+                status_code=404,
+                detail=f"File not found: {file_path}",
+            )
 
-                logger.info(f"Uploading base64 file: {file_name}")
-                self.s3_client.put_object(
-                    Bucket=settings.s3_bucket_name,
-                    Key=file_key,
-                    Body=file_data,
-                    ContentType=self._get_content_type(file_name),
-                )
-            else:
-                if not Path(file_path).exists():
-                    raise HTTPException(
-                        status_code=404,
-                        detail=f"File not found: {file_path}",
-                    )
+        with Path(file_path).open("rb") as file_obj:
+            return await self.upload_stream(file_obj, file_name)
+
+    async def upload_bytes(
+        self,
+        data: bytes | bytearray | memoryview,
+        file_name: str,
+        content_type: Optional[str] = None,
+    ) -> str:
+        """Upload raw data to S3, returning its public URL."""
 
-                with Path(file_path).open("rb") as file_obj:
-                    self.s3_client.upload_fileobj(
-                        file_obj,
-                        settings.s3_bucket_name,
-                        file_key,
-                        ExtraArgs={"ContentType": self._get_content_type(file_name)},
+        view = memoryview(data).cast("B")
+
+        async def parts() -> AsyncIterator[Body]:
+            for start in range(0, len(view), self.multipart_chunk_size):
+                yield view[start : start + self.multipart_chunk_size]
+
+        if len(view) < self.multipart_threshold:
+            await self._put_object(file_name, data, content_type)
+        else:
+            await self._upload_multipart(file_name, parts(), content_type)
+
+        return self.get_url(file_name)
+
+    async def upload_stream(
+        self,
+        stream: BinaryIO,
+        file_name: str,
+        content_type: Optional[str] = None,
+    ) -> str:
+        """
+        Upload a binary file object to S3, returning its public URL.
+
+        The stream is read a part at a time, only parts being uploaded are
+        held in memory.
+        """
+
+        head = await asyncio.to_thread(stream.read, self.multipart_threshold)
+
+        async def parts() -> AsyncIterator[Body]:
+            view = memoryview(head)
+            for start in range(0, len(view), self.multipart_chunk_size):
+                head_part = view[start : start + self.multipart_chunk_size]
+                if len(head_part) == self.multipart_chunk_size:
+                    yield head_part
+                else:
+                    # Complete the last part of the head from the stream
+                    rest = await asyncio.to_thread(
+                        stream.read,
+                        self.multipart_chunk_size - len(head_part),
                     )
+                    yield head_part.tobytes() + rest
+            while part := await asyncio.to_thread(
+                stream.read,
+                self.multipart_chunk_size,
+            ):
+                yield part
+
+        if len(head) < self.multipart_threshold:
+            await self._put_object(file_name, head, content_type)
+        else:
+            await self._upload_multipart(file_name, parts(), content_type)
+
+        return self.get_url(file_name)
 
-            return f"https://{settings.s3_bucket_name}.s3.{settings.aws_region}.amazonaws.com/{file_key}"
+    async def exists(self, file_name: str) -> bool:
+        """Check if a file was already uploaded to S3 under this name."""
 
+        try:
+            await self.api.run(
+                lambda client: client.head_object(
+                    Bucket=settings.s3_bucket_name,
+                    Key=self._get_key(file_name),
+                ),
+                f"S3 head {file_name}",
+            )
+            return True
         except ClientError as e:
-            logger.error(f"Failed to upload file to S3: {e}")
+            if e.response.get("Error", {}).get("Code") in (
+                "404",
+                "NoSuchKey",
+                "NotFound",
+            ):
+                return False
+            logger.error(f"Failed to check file in S3: {e}")
             raise HTTPException(
                 status_code=500,
-                detail=f"Failed to upload file: {e!s}",
+                detail=f"Failed to check file: {e!s}",
             ) from e
+
+    def get_url(self, file_name: str) -> str:
+        """Get the public URL of a file uploaded to S3."""
+
+        return f"{settings.s3_public_url}/{self._get_key(file_name)}"
+
+    def _get_key(self, file_name: str) -> str:
+        """Get the S3 key of a file name."""
+
+        return f"{settings.s3_bucket_folder}/{file_name}"
+
+    async def _put_object(
+        self,
+        file_name: str,
+        data: Body,
+        content_type: Optional[str],
+    ) -> None:
+        """Upload an object in a single request."""
+
+        logger.info(f"Uploading file: {file_name}")
+        try:
+            await self.api.run(
+                lambda client: client.put_object(
+                    Bucket=settings.s3_bucket_name,
+                    Key=self._get_key(file_name),
+                    Body=_get_body(data),
+                    ContentType=content_type or get_content_type(file_name),
+                ),
+                f"S3 upload {file_name}",
+            )
         except Exception as e:
-            logger.error(f"Unexpected error during S3 upload: {e}")
-            raise HTTPException(status_code=500, detail=f"Upload failed: {e!s}") from e
+            self._raise_upload_error(e)
 
-    def _is_base64(self, data: str) -> bool:
-        """Check if string is base64 encoded."""
+    async def _upload_multipart(
+        self,
+        file_name: str,
+        parts: AsyncIterator[Body],
+        content_type: Optional[str],
+    ) -> None:
+        """
+        Upload an object in parts.
 
+        Parts are uploaded as they are read, at most as many at a time as the
+        executor runs calls, and each is retried on its own. The upload is
+        aborted on failure so S3 doesn't keep the parts.
+        """
+
+        key = self._get_key(file_name)
+        logger.info(f"Uploading file in parts: {file_name}")
         try:
-            if len(data) % 4 != 0:
-                return False
-            base64.b64decode(data, validate=True)
-            return True
-        except Exception:
-            return False
-
-    def _get_content_type(self, file_name: str) -> str:
-        """Get content type based on file extension."""
-
-        extension = file_name.lower().split(".")[-1]
-        content_types = {
-            "png": "image/png",
-            "jpg": "image/jpeg",
-            "jpeg": "image/jpeg",
-            "gif": "image/gif",
-            "pdf": "application/pdf",
-            "txt": "text/plain",
-            "csv": "text/csv",
-            "json": "application/json",
-        }
-        return content_types.get(extension, "application/octet-stream")
+            upload = await self.api.run(
+                lambda client: client.create_multipart_upload(
+                    Bucket=settings.s3_bucket_name,
+                    Key=key,
+                    ContentType=content_type or get_content_type(file_name),
+                ),
+                f"S3 create multipart upload {file_name}",
+            )
+        except Exception as e:
+            self._raise_upload_error(e)
+        upload_id = upload["UploadId"]
+
+        # Bounds the parts read ahead of the uploads
+        slots = asyncio.Semaphore(self.api.max_concurrency)
+
+        async def upload_part(part_number: int, body: Body) -> dict[str, object]:
+            try:
+                response = await self.api.run(
+                    lambda client: client.upload_part(
+                        Bucket=settings.s3_bucket_name,
+                        Key=key,
+                        UploadId=upload_id,
+                        PartNumber=part_number,
+                        Body=_get_body(body),
+                    ),
+                    f"S3 upload part {part_number} of {file_name}",
+                )
+                return {"PartNumber": part_number, "ETag": response["ETag"]}
+            finally:
+                slots.release()
+
+        tasks: list[asyncio.Task[dict[str, object]]] = []
+        try:
+            part_number = 0
+            async for body in parts:
+                await slots.acquire()
+                part_number += 1
+                tasks.append(asyncio.create_task(upload_part(part_number, body)))
+            uploaded_parts = await asyncio.gather(*tasks)
+
+            await self.api.run(
+                lambda client: client.complete_multipart_upload(
+                    Bucket=settings.s3_bucket_name,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": uploaded_parts},
+                ),
+                f"S3 complete multipart upload {file_name}",
+            )
+        except BaseException as e:
+            for task in tasks:
+                task.cancel()
+            try:
+                await self.api.run(
+                    lambda client: client.abort_multipart_upload(
+                        Bucket=settings.s3_bucket_name,
+                        Key=key,
+                        UploadId=upload_id,
+                    ),
+                    f"S3 abort multipart upload {file_name}",
+                )
+            except Exception as abort_error:
+                logger.error(f"Failed to abort S3 upload of {file_name}: {abort_error}")
+            if not isinstance(e, Exception):
+                raise
+            self._raise_upload_error(e)
+
+    def _raise_upload_error(self, error: Exception) -> NoReturn:
+        """Turn the error of an upload into an HTTP error."""
+
+        if isinstance(error, ClientError):
+            logger.error(f"Failed to upload file to S3: {error}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to upload file: {error!s}",
+            ) from error
+        logger.error(f"Unexpected error during S3 upload: {error}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Upload failed: {error!s}",
+        ) from error
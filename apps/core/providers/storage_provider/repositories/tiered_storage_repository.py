@@ -0,0 +1,192 @@
+import asyncio
+from collections import Counter
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from fastapi import logger as fastapi_logger
+
+from apps.core.config import settings
+from apps.core.providers.storage_provider.repositories.disk_storage_repository import (
+    DiskStorageRepository,
+)
+from apps.core.providers.storage_provider.repositories.s3_storage_repository import (
+    S3StorageRepository,
+)
+from apps.core.providers.storage_provider.repository_interfaces.storage_repository_interface import (
+    IStorageProvider,
+    get_content_type,
+)
+
+logger = fastapi_logger.logger
+
+
+class TieredStorageRepository(IStorageProvider):
+    """
+    Disk storage replicated to S3 in the background (write-behind).
+
+    Files are written to the disk storage and its URL returned right away,
+    S3 latency stays off the request path. File names are queued and
+    uploaded to S3 by `workers` tasks. When `max_queue` files are waiting,
+    uploads wait for room in the queue. On shutdown the queue is drained for
+    up to `drain_timeout` seconds. Files are pinned in the disk storage until
+    replicated, so the eviction can't lose them.
+    """
+
+    def __init__(
+        self,
+        local: Optional[DiskStorageRepository] = None,
+        remote: Optional[S3StorageRepository] = None,
+        max_queue: int = settings.storage_replication_queue_size,
+        workers: int = settings.storage_replication_workers,
+        drain_timeout: float = settings.storage_replication_drain_timeout,
+    ) -> None:
+        self.local = local or DiskStorageRepository()
+        self.remote = remote or S3StorageRepository()
+        self.workers = max(workers, 1)
+        self.drain_timeout = drain_timeout
+        self._queue: asyncio.Queue[tuple[str, Optional[str]]] = asyncio.Queue(
+            max(max_queue, 1),
+        )
+        self._tasks: list[asyncio.Task[None]] = []
+        self._pending: Counter[Path] = Counter()
+        self.local.pinned = self._pending.keys()
+
+    async def start(self) -> None:
+        """Start both storages and the replication tasks."""
+
+        await self.local.start()
+        await self.remote.start()
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._replicate()) for _ in range(self.workers)
+            ]
+
+    async def health(self) -> dict[str, bool]:
+        """Health of both storages and of the replication."""
+
+        local_health, remote_health = await asyncio.gather(
+            self.local.health(),
+            self.remote.health(),
+        )
+        return {
+            **local_health,
+            **remote_health,
+            "replication": (
+                bool(self._tasks) and not any(task.done() for task in self._tasks)
+            ),
+        }
+
+    async def aclose(self) -> None:
+        """Replicate the queued files, within the drain timeout, then stop."""
+
+        if self._tasks:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=self.drain_timeout)
+            except asyncio.TimeoutError:
+                logger.error(
+                    f"{self._queue.qsize()} files not replicated to S3 on shutdown",
+                )
+
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+
+        await self.local.aclose()
+        await self.remote.aclose()
+
+    async def upload_file(self, file_path: str, file_name: str) -> str:
+        """Upload a file path or base64 encoded data to disk, then to S3."""
+
+        path = self._pin(file_name)
+        try:
+            url = await self.local.upload_file(file_path, file_name)
+            await self._enqueue(file_name, None)
+        except BaseException:
+            self._unpin(path)
+            raise
+        return url
+
+    async def upload_bytes(
+        self,
+        data: bytes | bytearray | memoryview,
+        file_name: str,
+        content_type: Optional[str] = None,
+    ) -> str:
+        """Write raw data to disk, returning its URL, then upload it to S3."""
+
+        path = self._pin(file_name)
+        try:
+            url = await self.local.upload_bytes(data, file_name, content_type)
+            await self._enqueue(file_name, content_type)
+        except BaseException:
+            self._unpin(path)
+            raise
+        return url
+
+    async def upload_stream(
+        self,
+        stream: BinaryIO,
+        file_name: str,
+        content_type: Optional[str] = None,
+    ) -> str:
+        """Copy a binary file object to disk, returning its URL, then upload it to S3."""
+
+        path = self._pin(file_name)
+        try:
+            url = await self.local.upload_stream(stream, file_name, content_type)
+            await self._enqueue(file_name, content_type)
+        except BaseException:
+            self._unpin(path)
+            raise
+        return url
+
+    async def exists(self, file_name: str) -> bool:
+        """Check if a file is in the disk storage, which serves the URLs."""
+
+        return await self.local.exists(file_name)
+
+    def get_url(self, file_name: str) -> str:
+        """Get the disk storage URL of a file."""
+
+        return self.local.get_url(file_name)
+
+    def _pin(self, file_name: str) -> Path:
+        """Keep a file from being evicted from the disk storage until replicated."""
+
+        path = self.local.get_path(file_name)
+        self._pending[path] += 1
+        return path
+
+    def _unpin(self, path: Path) -> None:
+        """Let the eviction remove a file again once all its uploads are replicated."""
+
+        self._pending[path] -= 1
+        if self._pending[path] <= 0:
+            del self._pending[path]
+
+    async def _enqueue(self, file_name: str, content_type: Optional[str]) -> None:
+        """Queue a file for replication, waiting for room when the queue is full."""
+
+        if self._queue.full():
+            logger.warning(f"S3 replication queue full, waiting to queue {file_name}")
+        await self._queue.put((file_name, content_type))
+
+    async def _replicate(self) -> None:
+        """Upload the queued files to S3, logging failures."""
+
+        while True:
+            file_name, content_type = await self._queue.get()
+            path = self.local.get_path(file_name)
+            try:
+                with path.open("rb") as file_obj:
+                    await self.remote.upload_stream(
+                        file_obj,
+                        file_name,
+                        content_type or get_content_type(file_name),
+                    )
+            except Exception as e:
+                logger.error(f"Failed to replicate {file_name} to S3: {e}")
+            finally:
+                self._unpin(path)
+                self._queue.task_done()
@@ -1,9 +1,86 @@
+import base64
 from abc import abstractmethod
+from typing import BinaryIO, Optional
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "gif": "image/gif",
+    "pdf": "application/pdf",
+    "txt": "text/plain",
+    "csv": "text/csv",
+    "json": "application/json",
+}
+
+
+def get_content_type(file_name: str) -> str:
+    """Get content type based on file extension."""
+
+    extension = file_name.lower().split(".")[-1]
+    return CONTENT_TYPES.get(extension, "application/octet-stream")
+
+
+def decode_base64(data: str) -> Optional[bytes]:
+    """Decode base64 encoded data, `None` when it isn't base64."""
+
+    if len(data) % 4 != 0:
+        return None
+    try:
+        return base64.b64decode(data, validate=True)
+    except ValueError:
+        return None
 
 
 class IStorageProvider:
-    """Storage provider interface."""
+    """
+    Storage provider interface.
+
+    Providers are created once, started and closed by the application
+    lifespan, see `get_storage_provider`.
+    """
+
+    async def start(self) -> None:
+        """Warm the provider up before the first upload."""
+
+    async def health(self) -> dict[str, bool]:
+        """Whether the provider, and any storage behind it, can be used."""
+
+        return {}
+
+    async def aclose(self) -> None:
+        """Release the resources of the provider."""
 
     @abstractmethod
     async def upload_file(self, file_path: str, file_name: str) -> str:
-        """Upload a file to the storage provider."""
+        """
+        Upload a file path or base64 encoded data to the storage provider.
+
+        Kept for legacy callers, prefer `upload_bytes` and `upload_stream`.
+        """
+
+    @abstractmethod
+    async def upload_bytes(
+        self,
+        data: bytes | bytearray | memoryview,
+        file_name: str,
+        content_type: Optional[str] = None,
+    ) -> str:
+        """Upload raw data to the storage provider, returning its public URL."""
+
+    @abstractmethod
+    async def upload_stream(
+        self,
+        stream: BinaryIO,
+        file_name: str,
+        content_type: Optional[str] = None,
+    ) -> str:
+        """Upload a binary file object to the storage provider, returning its public URL."""
+
+    @abstractmethod
+    async def exists(self, file_name: str) -> bool:
+        """Check if a file was already uploaded under this name."""
+
+    @abstractmethod
+    def get_url(self, file_name: str) -> str:
+        """Get the public URL of a file uploaded under this name."""
@@ -0,0 +1,120 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, TypeVar
+
+from fastapi import HTTPException, Request
+from fastapi import logger as fastapi_logger
+
+logger = fastapi_logger.logger
+
+T = TypeVar("T")
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limiter that adapts to upstream rate limits.
+
+    The limit starts at ``max_limit``. Every rate-limit signal halves it and
+    pauses new acquisitions until the upstream ``Retry-After`` has elapsed;
+    every ``increase_every`` consecutive successes raise it by one again.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        increase_every: int = 10,
+    ) -> None:
+        self.max_limit = max(max_limit, 1)
+        self.min_limit = max(min(min_limit, self.max_limit), 1)
+        self.increase_every = max(increase_every, 1)
+        self.limit = self.max_limit
+        self.in_flight = 0
+        self._successes = 0
+        self._paused_until = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        """Wait for a free slot and take it."""
+
+        async with self._condition:
+            while True:
+                delay = self._paused_until - time.monotonic()
+                if delay <= 0 and self.in_flight < self.limit:
+                    self.in_flight += 1
+                    return
+
+                try:
+                    await asyncio.wait_for(
+                        self._condition.wait(),
+                        timeout=delay if delay > 0 else None,
+                    )
+                except asyncio.TimeoutError:
+                    continue
+
+    async def release(self) -> None:
+        """Give a slot back and wake up waiters."""
+
+        async with self._condition:
+            self.in_flight = max(self.in_flight - 1, 0)
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block."""
+
+        await self.acquire()
+        try:
+            yield
+        finally:
+            await self.release()
+
+    def record_success(self) -> None:
+        """Register a successful call, growing the limit back over time."""
+
+        self._successes += 1
+        if self._successes >= self.increase_every and self.limit < self.max_limit:
+            self.limit += 1
+            self._successes = 0
+
+    def record_rate_limit(self, retry_after: float) -> None:
+        """Register a rate-limited call, shrinking the limit and pausing."""
+
+        self._successes = 0
+        self.limit = max(self.limit // 2, self.min_limit)
+        self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        logger.warning(
+            f"Rate limited, concurrency lowered to {self.limit} "
+            f"and paused for {retry_after:.2f}s",
+        )
+
+
+async def cancel_on_disconnect(
+    request: Request,
+    awaitable: Awaitable[T],
+    poll_interval: float = 1.0,
+) -> T:
+    """
+    Await `awaitable`, cancelling it if the client disconnects meanwhile.
+
+    Long LLM calls would otherwise keep running (and billing) for a response
+    nobody will read.
+    """
+
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+
+            if await request.is_disconnected():
+                logger.warning(
+                    f"Client disconnected from {request.url.path}, cancelling",
+                )
+                task.cancel()
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        if not task.done():
+            task.cancel()
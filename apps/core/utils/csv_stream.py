@@ -0,0 +1,125 @@
+import codecs
+from typing import Iterable, Iterator, Optional, Sequence, overload
+
+from fastapi import logger as fastapi_logger
+
+logger = fastapi_logger.logger
+
+UTF8_BOM = codecs.BOM_UTF8
+
+
+def detect_encoding(block: bytes, fallback: str = "latin-1") -> str:
+    """
+    Encoding of a text from its first block.
+
+    UTF-8, with or without a BOM, when the block decodes as UTF-8 (a
+    character cut at the end of the block is fine), `fallback` otherwise.
+    """
+
+    if block.startswith(UTF8_BOM):
+        return "utf-8-sig"
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(block, final=False)
+    except UnicodeDecodeError:
+        return fallback
+    return "utf-8"
+
+
+def iter_decoded(chunks: Iterable[bytes], fallback: str = "latin-1") -> Iterator[str]:
+    """
+    Decode byte chunks as they arrive.
+
+    The encoding is detected on the first chunk. If a later chunk turns out
+    not to be UTF-8, the text from its first invalid byte on is decoded with
+    `fallback`, which must accept any byte.
+    """
+
+    decoder: Optional[codecs.IncrementalDecoder] = None
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if decoder is None:
+            encoding = detect_encoding(chunk, fallback)
+            if encoding == fallback:
+                logger.info(f"utf-8 decoding failed, falling back to {fallback}")
+            decoder = codecs.getincrementaldecoder(encoding)()
+
+        pending, _ = decoder.getstate()
+        try:
+            yield decoder.decode(chunk)
+        except UnicodeDecodeError as err:
+            logger.info(f"utf-8 decoding failed mid-stream, falling back to {fallback}")
+            data = pending + chunk
+            yield data[: err.start].decode("utf-8")
+            decoder = codecs.getincrementaldecoder(fallback)()
+            yield decoder.decode(data[err.start :])
+
+    if decoder is not None:
+        yield decoder.decode(b"", final=True)
+
+
+def iter_lines(texts: Iterable[str]) -> Iterator[str]:
+    r"""
+    Split text chunks into lines, keeping the line endings.
+
+    Lines are split on `\n` only, so `\r\n` and line breaks inside quoted
+    CSV fields are left to the `csv` module.
+    """
+
+    pending = ""
+    for text in texts:
+        pending += text
+        if "\n" not in pending:
+            continue
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+
+    if pending:
+        yield pending
+
+
+class RowDictView(Sequence[dict[str, str]]):
+    """
+    Read-only sequence of rows as dicts, over rows stored as tuples.
+
+    Dicts are built on access, so iterating the view never holds more than
+    one of them.
+    """
+
+    def __init__(self, headers: Sequence[str], rows: Sequence[tuple[str, ...]]) -> None:
+        self.headers = headers
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @overload
+    def __getitem__(self, index: int) -> dict[str, str]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[dict[str, str]]: ...
+
+    def __getitem__(self, index: int | slice) -> dict[str, str] | list[dict[str, str]]:
+        if isinstance(index, slice):
+            return [dict(zip(self.headers, row)) for row in self.rows[index]]
+        return dict(zip(self.headers, self.rows[index]))
+
+    def __iter__(self) -> Iterator[dict[str, str]]:
+        headers = self.headers
+        for row in self.rows:
+            yield dict(zip(headers, row))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RowDictView):
+            return list(self.headers) == list(other.headers) and list(
+                self.rows,
+            ) == list(
+                other.rows,
+            )
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
@@ -1,10 +1,14 @@
 import csv
+import hashlib
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 import PyPDF2
 
-from apps.core.config import settings
+from apps.core.providers.embedding_provider import get_embedding_provider
+from apps.core.providers.embedding_provider.repository_interfaces.embedding_cache_repository_interface import (
+    IEmbeddingCacheRepository,
+)
 
 
 def extract_text_from_pdf(pdf_path: Path) -> str:
@@ -71,41 +75,48 @@ def split_text(text: str, chunk_size: int = 2000, overlap: int = 100) -> List[st
     return chunks
 
 
-def get_embedding(text: str, model: str = "text-embedding-3-small") -> list[float]:
+def get_content_hash(text: str) -> str:
+    """
+    Gets the SHA-256 fingerprint of a text.
+
+    Whitespace is normalized first so re-extracting the same document yields
+    the same hash.
+    """
+
+    normalized_text = " ".join(text.split())
+    return hashlib.sha256(normalized_text.encode("utf-8")).hexdigest()
+
+
+async def get_embedding(
+    text: str,
+    cache_repository: Optional[IEmbeddingCacheRepository] = None,
+) -> list[float]:
     """Get embeddings using OpenAI API."""
 
-    response = settings.openai_client.embeddings.create(input=text, model=model)
-    return response.data[0].embedding
+    embeddings = await get_embedding_provider(cache_repository).embed([text])
+    return embeddings[0]
 
 
-def get_embeddings_rag_batch(
+async def get_embeddings_rag_batch(
     texts: List[str],
-    model: str = "text-embedding-3-small",
-    batch_size: int = 50,
+    cache_repository: Optional[IEmbeddingCacheRepository] = None,
 ) -> List[list[float]]:
-    """Gets embeddings for a batch of texts."""
-
-    all_embeddings = []
+    """
+    Gets embeddings for a batch of texts.
 
-    # Process in batches to avoid rate limits and memory issues
-    for i in range(0, len(texts), batch_size):
-        batch = texts[i : i + batch_size]
-        response = settings.openai_client.embeddings.create(input=batch, model=model)
-        batch_embeddings = [item.embedding for item in response.data]
-        all_embeddings.extend(batch_embeddings)
+    Cached texts are served from the embedding cache; the rest are sent in
+    concurrent batches by the embedding provider, which adapts its in-flight
+    limit to the API rate limits.
+    """
 
-    return all_embeddings
+    return await get_embedding_provider(cache_repository).embed(texts)
 
 
-def text_to_vector(
+async def text_to_vector(
     text: str,
-    model: str = "text-embedding-3-small",
+    cache_repository: Optional[IEmbeddingCacheRepository] = None,
 ) -> List[float]:
     """Convert text to PostgreSQL vector format."""
 
-    response = settings.openai_client.embeddings.create(
-        model=model,
-        input=text,
-    )
-
-    return response.data[0].embedding
+    embeddings = await get_embedding_provider(cache_repository).embed([text])
+    return embeddings[0]
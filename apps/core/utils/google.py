@@ -1,15 +1,20 @@
 import csv
-import io
 import os
 import re
-from typing import Any, Optional
+import threading
+from typing import Any, Iterable, Iterator, Optional
 
 from fastapi import logger as fastapi_logger
+from google.auth.credentials import AnonymousCredentials
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseDownload
 from pydantic import BaseModel
 
+from apps.core.config import settings
+from apps.core.utils.csv_stream import RowDictView, iter_decoded, iter_lines
+from apps.core.utils.metrics import TransferProgress, transfers
+
 logger = fastapi_logger.logger
 
 
@@ -18,28 +23,77 @@ SERVICE_ACCOUNT_FILE = "apps/core/config/secrets/service_account.json"
 
 # GOOGLE DRIVE
 class GoogleDriveFileContentDict(BaseModel):
-    """Google Drive File Content Dict."""
+    """
+    Google Drive File Content Dict.
+
+    Rows are stored as tuples in the order of `headers`. `data` is a lazy
+    view of them as dicts.
+    """
 
     headers: list[str]
-    data: list[dict[str, Any]]
+    rows: list[tuple[str, ...]]
+
+    @property
+    def data(self) -> RowDictView:
+        """Rows as dicts keyed by header, built on access."""
+        return RowDictView(self.headers, self.rows)
+
+
+def get_google_credentials(
+    scopes: list[str],
+    subject: Optional[str] = None,
+    api_endpoint: Optional[str] = None,
+) -> Any:
+    """
+    Get the service account credentials.
+
+    With an `api_endpoint` another host, such as the local stand-ins, is used
+    and anonymous credentials are returned instead.
+    """
 
+    if api_endpoint:
+        return AnonymousCredentials()
 
-def get_google_drive_service(impersonated_account: str) -> Any:
-    """Get the drive service."""
+    return service_account.Credentials.from_service_account_file(
+        SERVICE_ACCOUNT_FILE,
+        scopes=scopes,
+        subject=subject,
+    )
+
+
+def get_google_drive_service(
+    impersonated_account: str,
+    api_endpoint: Optional[str] = None,
+    credentials: Any = None,
+) -> Any:
+    """
+    Get the drive service.
 
-    creds = None
+    `api_endpoint` points the service at another host, such as the local
+    stand-ins, using anonymous credentials. The discovery document bundled
+    with googleapiclient is used, so nothing is fetched.
+    """
+
+    creds = credentials
 
     try:
-        creds = service_account.Credentials.from_service_account_file(
-            SERVICE_ACCOUNT_FILE,
-            scopes=["https://www.googleapis.com/auth/drive"],
-            subject=impersonated_account,
-        )
+        if creds is None:
+            creds = get_google_credentials(
+                ["https://www.googleapis.com/auth/drive"],
+                impersonated_account,
+                api_endpoint,
+            )
     except Exception as err:
         logger.error("Error getting drive service: %s", err)
 
     try:
-        return build("drive", "v3", credentials=creds)
+        return build(
+            "drive",
+            "v3",
+            credentials=creds,
+            client_options={"api_endpoint": api_endpoint} if api_endpoint else None,
+            static_discovery=True,
+        )
     except Exception as err:
         logger.error("Error building drive service: %s", err)
 
@@ -55,15 +109,51 @@ def get_google_drive_id(url: str) -> Optional[str]:
 
 def get_google_drive_file_content_dict(
     file: dict[str, str],
+    google_drive_service: Any = None,
+    http: Any = None,
 ) -> GoogleDriveFileContentDict:
-    """Get the Google Drive file content."""
+    """
+    Get the Google Drive file content.
+
+    `http` is the HTTP object to download with instead of the service's own.
+    """
 
-    google_drive_service = get_google_drive_service(
-        os.getenv(
-            "GOOGLE_CLOUD_IMPERSONATED_ACCOUNT",
-            "angie@x-team.com",
-        ),
+    downloader = DriveChunkDownloader(
+        get_google_drive_media_request(file, google_drive_service, http),
+        f"drive:{file.get('id', '')}",
     )
+
+    def iter_chunks() -> Iterator[bytes]:
+        with transfers.track("drive") as progress:
+            while not downloader.done:
+                chunks = downloader.next_chunk()
+                progress.total_bytes = downloader.total_size
+                for chunk in chunks:
+                    progress.add(len(chunk))
+                    yield chunk
+            downloader.log_done(progress)
+
+    return parse_csv_content(iter_chunks())
+
+
+def get_google_drive_media_request(
+    file: dict[str, str],
+    google_drive_service: Any = None,
+    http: Any = None,
+) -> Any:
+    """
+    Get the request downloading a Google Drive file, as CSV for spreadsheets.
+
+    `http` is the HTTP object to download with instead of the service's own.
+    """
+
+    if google_drive_service is None:
+        google_drive_service = get_google_drive_service(
+            os.getenv(
+                "GOOGLE_CLOUD_IMPERSONATED_ACCOUNT",
+                "angie@x-team.com",
+            ),
+        )
     mime_type = file.get("mimeType", "")
     file_id = file.get("id", "")
 
@@ -78,59 +168,132 @@ def get_google_drive_file_content_dict(
             supportsAllDrives=True,
         )
 
-    fh = io.BytesIO()
-    downloader = MediaIoBaseDownload(fh, request)
-    done = False
-    while not done:
-        status, done = downloader.next_chunk()
-        logger.info(f"Download in progress: {int(status.progress() * 100)}%")
+    if http is not None:
+        request.http = http
 
-    fh.seek(0)
-    csv_content = fh.read()
-    try:
-        decoded_content = csv_content.decode("utf-8")
-    except UnicodeDecodeError:
-        logger.info("utf-8 decoding failed, falling back to latin-1")
-        decoded_content = csv_content.decode("latin-1")
-
-    csv_file = io.StringIO(decoded_content)
-    reader = csv.reader(csv_file)
-    headers = next(reader)
-
-    cleaned_headers = [
-        header.strip().replace("\n", " ").replace("  ", " ") for header in headers
-    ]
-    data_body = []
+    return request
+
+
+def parse_csv_content(chunks: Iterable[bytes]) -> GoogleDriveFileContentDict:
+    """Decode and parse CSV content as its byte chunks arrive."""
+
+    headers: list[str] = []
+    rows: list[tuple[str, ...]] = []
+    reader = csv.reader(iter_lines(iter_decoded(chunks)))
     for row in reader:
-        if len(row) == len(cleaned_headers):
-            row_object = dict(zip(cleaned_headers, row))
-            data_body.append(row_object)
+        if not headers:
+            headers = [
+                header.strip().replace("\n", " ").replace("  ", " ") for header in row
+            ]
+            # Survey answers repeat a lot, keep one copy of each per column
+            seen: list[dict[str, str]] = [{} for _ in headers]
+            continue
+
+        if len(row) == len(headers):
+            rows.append(
+                tuple(
+                    values.setdefault(value, value) for values, value in zip(seen, row)
+                ),
+            )
         else:
             logger.info(
-                f"Skipping malformed row. Expected {len(cleaned_headers)} columns, but found {len(row)}.",
+                f"Skipping malformed row. Expected {len(headers)} columns, but found {len(row)}.",
             )
 
-    return GoogleDriveFileContentDict(
-        headers=cleaned_headers,
-        data=data_body,
-    )
+    # The rows come from the CSV reader, there is nothing to validate or copy
+    return GoogleDriveFileContentDict.model_construct(headers=headers, rows=rows)
+
+
+class _ChunkBuffer:
+    """File-like sink keeping the chunks written by `MediaIoBaseDownload`."""
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(data)
+        return len(data)
+
+
+class DriveChunkDownloader:
+    """
+    Download a media request one chunk per `next_chunk` call.
+
+    Each call is a single HTTP request, so it can be bounded and retried on
+    its own. Calls are serialized: a retry started while a timed out call is
+    still running waits for it, and gets its chunks too.
+    """
+
+    def __init__(
+        self,
+        request: Any,
+        name: str,
+        chunk_size: int = settings.google_drive_download_chunk_size,
+    ) -> None:
+        self.name = name
+        self.done = False
+        self.total_size: Optional[int] = None
+        self._buffer = _ChunkBuffer()
+        self._downloader = MediaIoBaseDownload(
+            self._buffer,
+            request,
+            chunksize=chunk_size,
+        )
+        self._lock = threading.Lock()
+
+    def next_chunk(self) -> list[bytes]:
+        """Download the next chunk, returning the chunks not returned yet."""
+
+        with self._lock:
+            if not self.done:
+                status, self.done = self._downloader.next_chunk()
+                self.total_size = status.total_size
+                logger.debug(
+                    f"Download of {self.name} in progress: {int(status.progress() * 100)}%",
+                )
+            chunks, self._buffer.chunks = self._buffer.chunks, []
+            return chunks
+
+    def log_done(self, progress: TransferProgress) -> None:
+        """Log the size and throughput of the finished download."""
+
+        logger.info(
+            f"Downloaded {self.name}: {progress.bytes} bytes in {progress.elapsed:.2f}s "
+            f"({progress.bytes_per_second / 1024:.0f} KiB/s)",
+        )
 
 
 # GOOGLE SLIDES
-def get_google_slides_service() -> Any:
-    """Get the slides service."""
+def get_google_slides_service(
+    api_endpoint: Optional[str] = None,
+    credentials: Any = None,
+) -> Any:
+    """
+    Get the slides service.
+
+    `api_endpoint` points the service at another host, such as the local
+    stand-ins, using anonymous credentials. The discovery document bundled
+    with googleapiclient is used, so nothing is fetched.
+    """
 
-    creds = None
+    creds = credentials
 
     try:
-        creds = service_account.Credentials.from_service_account_file(
-            SERVICE_ACCOUNT_FILE,
-            scopes=["https://www.googleapis.com/auth/presentations"],
-        )
+        if creds is None:
+            creds = get_google_credentials(
+                ["https://www.googleapis.com/auth/presentations"],
+                api_endpoint=api_endpoint,
+            )
     except Exception as err:
         logger.error("Error getting slides service: %s", err)
 
     try:
-        return build("slides", "v1", credentials=creds)
+        return build(
+            "slides",
+            "v1",
+            credentials=creds,
+            client_options={"api_endpoint": api_endpoint} if api_endpoint else None,
+            static_discovery=True,
+        )
     except Exception as err:
         logger.error("Error building slides service: %s", err)
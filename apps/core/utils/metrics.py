@@ -0,0 +1,243 @@
+import asyncio
+import itertools
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Optional
+
+from fastapi import logger as fastapi_logger
+
+logger = fastapi_logger.logger
+
+# Stage durations (ms) of the request being served, set by the Server-Timing middleware
+_stage_timings: ContextVar[Optional[dict[str, float]]] = ContextVar(
+    "stage_timings",
+    default=None,
+)
+
+
+def percentile(values: Iterable[float], pct: float) -> float:
+    """Percentile of the values using linear interpolation."""
+
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(values: Iterable[float]) -> dict[str, float]:
+    """Count, mean, max and p50/p95/p99 of a series of samples."""
+
+    samples = list(values)
+    if not samples:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+    return {
+        "count": len(samples),
+        "mean": round(sum(samples) / len(samples), 3),
+        "p50": round(percentile(samples, 50), 3),
+        "p95": round(percentile(samples, 95), 3),
+        "p99": round(percentile(samples, 99), 3),
+        "max": round(max(samples), 3),
+    }
+
+
+class LatencyRecorder:
+    """Keeps the most recent samples per series, bounded by ``window_size``."""
+
+    def __init__(self, window_size: int) -> None:
+        self.window_size = max(window_size, 1)
+        self._series: defaultdict[str, deque[float]] = defaultdict(
+            lambda: deque(maxlen=self.window_size),
+        )
+
+    def record(self, name: str, value: float) -> None:
+        """Record a sample for a series."""
+
+        self._series[name].append(value)
+
+    def summary(self, prefix: str = "") -> dict[str, dict[str, float]]:
+        """Summaries of the series starting with ``prefix``, without it."""
+
+        return {
+            name[len(prefix) :]: summarize(samples)
+            for name, samples in sorted(self._series.items())
+            if name.startswith(prefix)
+        }
+
+    def reset(self) -> None:
+        """Drop all samples."""
+
+        self._series.clear()
+
+
+def start_stage_timings() -> dict[str, float]:
+    """Start collecting stage durations for the current request."""
+
+    timings: dict[str, float] = {}
+    _stage_timings.set(timings)
+    return timings
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a pipeline stage of the current request.
+
+    Durations of repeated stages are added up. Outside of a request (no
+    middleware) this is a no-op besides the clock reads.
+    """
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _stage_timings.get()
+        if timings is not None:
+            elapsed = (time.perf_counter() - start) * 1000
+            timings[name] = timings.get(name, 0.0) + elapsed
+
+
+@dataclass
+class TransferProgress:
+    """Progress of a running transfer."""
+
+    name: str
+    total_bytes: Optional[int] = None
+    bytes: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    def add(self, size: int) -> None:
+        """Count transferred bytes."""
+
+        self.bytes += size
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the transfer started."""
+
+        return time.perf_counter() - self.started
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Average throughput so far."""
+
+        elapsed = self.elapsed
+        return self.bytes / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Snapshot of the progress."""
+
+        return {
+            "name": self.name,
+            "bytes": self.bytes,
+            "total_bytes": self.total_bytes,
+            "progress": (
+                round(self.bytes / self.total_bytes, 3) if self.total_bytes else None
+            ),
+            "bytes_per_second": round(self.bytes_per_second, 1),
+        }
+
+
+class TransferMonitor:
+    """
+    Progress of running transfers and throughput of finished ones.
+
+    Transfers may run in worker threads, so the running ones are guarded by
+    a lock.
+    """
+
+    def __init__(self, window_size: int = 1000) -> None:
+        self.recorder = LatencyRecorder(window_size)
+        self._running: dict[int, TransferProgress] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(
+        self,
+        name: str,
+        total_bytes: Optional[int] = None,
+    ) -> Iterator[TransferProgress]:
+        """Track a transfer, recording its size and throughput once done."""
+
+        progress = TransferProgress(name, total_bytes)
+        with self._lock:
+            transfer_id = next(self._ids)
+            self._running[transfer_id] = progress
+        try:
+            yield progress
+        finally:
+            with self._lock:
+                self._running.pop(transfer_id, None)
+                self.recorder.record(f"{name}:bytes", progress.bytes)
+                self.recorder.record(
+                    f"{name}:bytes_per_second",
+                    progress.bytes_per_second,
+                )
+
+    def summary(self) -> dict[str, Any]:
+        """Running transfers and summaries of the finished ones."""
+
+        with self._lock:
+            return {
+                "running": [progress.as_dict() for progress in self._running.values()],
+                "finished": self.recorder.summary(),
+            }
+
+    def reset(self) -> None:
+        """Drop the samples of the finished transfers."""
+
+        with self._lock:
+            self.recorder.reset()
+
+
+# Process-wide, transfers run outside of any request-scoped object
+transfers = TransferMonitor()
+
+
+class EventLoopLagMonitor:
+    """
+    Measures event-loop lag by sleeping ``interval`` seconds in a loop.
+
+    The lag is how much later than scheduled the sleep returns, which is the
+    time other callbacks held the loop.
+    """
+
+    def __init__(self, recorder: LatencyRecorder, interval: float) -> None:
+        self.recorder = recorder
+        self.interval = interval
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        """Start monitoring on the running loop."""
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop monitoring."""
+
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - scheduled, 0) * 1000
+            self.recorder.record("loop_lag", lag)
+            if lag > self.interval * 1000:
+                logger.debug(f"Event loop lagged {lag:.1f}ms")
@@ -0,0 +1,76 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from apps.core.utils.metrics import stage
+
+StageFunction = Callable[..., Awaitable[Any]]
+
+
+class StageGraph:
+    """
+    Dependency graph of async pipeline stages.
+
+    Each stage starts as soon as the stages it depends on are done, and gets
+    their results as keyword arguments named after them. Stages can only
+    depend on stages added before them, so the graph can't have cycles. Every
+    stage is timed with `apps.core.utils.metrics.stage`, from the moment its
+    dependencies are met.
+    """
+
+    def __init__(self) -> None:
+        self._stages: dict[str, tuple[StageFunction, tuple[str, ...]]] = {}
+
+    def add(
+        self,
+        name: str,
+        function: StageFunction,
+        depends_on: tuple[str, ...] = (),
+    ) -> "StageGraph":
+        """Add a stage."""
+
+        if name in self._stages:
+            raise ValueError(f"Stage {name} already added")
+        unknown = [
+            dependency for dependency in depends_on if dependency not in self._stages
+        ]
+        if unknown:
+            raise ValueError(f"Stage {name} depends on unknown stages {unknown}")
+
+        self._stages[name] = (function, depends_on)
+        return self
+
+    async def run(self) -> dict[str, Any]:
+        """
+        Run every stage and return their results by name.
+
+        The first failing stage cancels the ones still running and its error
+        is raised.
+        """
+
+        tasks: dict[str, asyncio.Task[Any]] = {}
+
+        async def run_stage(name: str) -> Any:
+            function, depends_on = self._stages[name]
+            results = await asyncio.gather(
+                *[tasks[dependency] for dependency in depends_on],
+            )
+            with stage(name):
+                return await function(**dict(zip(depends_on, results)))
+
+        for name in self._stages:
+            tasks[name] = asyncio.create_task(run_stage(name), name=name)
+
+        try:
+            done, pending = await asyncio.wait(
+                tasks.values(),
+                return_when=asyncio.FIRST_EXCEPTION,
+            )
+            for task in done:
+                if not task.cancelled() and task.exception():
+                    raise task.exception()  # type: ignore[misc]
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        return {name: task.result() for name, task in tasks.items()}
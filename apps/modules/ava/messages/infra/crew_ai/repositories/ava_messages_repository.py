@@ -2,6 +2,7 @@ from crewai import Crew, Process
 from fastapi import logger as fastapi_logger
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from apps.core.utils.metrics import stage
 from apps.modules.ava.messages.infra.crew_ai.agents.knowledge_researcher import (
     KnowledgeResearcher,
 )
@@ -46,11 +47,12 @@ class AvaMessagesRepository(IAvaMessagesRepositoryInterface):
             verbose=False,
         )
 
-        result = await crew.kickoff_async(
-            inputs={
-                "user_query": content,
-            },
-        )
+        with stage("crew"):
+            result = await crew.kickoff_async(
+                inputs={
+                    "user_query": content,
+                },
+            )
 
         logger.info(f"Tasks Output: {result.tasks_output}")
         logger.info(f"Token Usage: {result.token_usage}")
@@ -2,6 +2,12 @@ from crewai.tools import BaseTool
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from apps.core.config import settings
+from apps.core.infra.open_ai.client_registry import openai_clients
+from apps.core.infra.open_ai.retries import call_with_retries
+from apps.core.utils.metrics import stage
+from apps.modules.shared.rag.infra.sql_alchemy.repositories.embedding_cache_repository import (
+    EmbeddingCacheRepository,
+)
 from apps.modules.shared.rag.infra.sql_alchemy.repositories.resource_chunks_repository import (
     ResourceChunksRepository,
 )
@@ -32,40 +38,48 @@ class AvaSearchXteamDocuments(BaseTool):
         """Search the Handbook, FAQ, and Relevant Links for information."""
 
         async with self._session_factory() as session:
-            resource_chunks_repository = ResourceChunksRepository(session)
+            resource_chunks_repository = ResourceChunksRepository(
+                session,
+                EmbeddingCacheRepository(session),
+            )
             list_resource_chunks_service = ListResourceChunksService(
                 resource_chunks_repository,
             )
-            vector_search_results = await list_resource_chunks_service.execute(
-                query=query,
-                chunk_top_k=10,
-                resource_names=["ava_relevant_links.csv", "handbook_faq.csv"],
-            )
+            with stage("rag_search"):
+                vector_search_results = await list_resource_chunks_service.execute(
+                    query=query,
+                    chunk_top_k=10,
+                    resource_names=["ava_relevant_links.csv", "handbook_faq.csv"],
+                )
 
             vector_search = "\n".join(
                 [result.text for result in vector_search_results],
             )
 
-            response = await settings.openai_client_async.responses.create(
-                model=settings.base_openai_model,
-                input=[
-                    {
-                        "role": "system",
-                        "content": f"""
-                            ## User asked
-                            {query}
+            response = await call_with_retries(
+                lambda: openai_clients.get("chat").responses.create(
+                    model=settings.base_openai_model,
+                    input=[
+                        {
+                            "role": "system",
+                            "content": f"""
+                                ## User asked
+                                {query}
 
-                            ## Based on the vector search results
-                            {vector_search}
+                                ## Based on the vector search results
+                                {vector_search}
 
-                            ## How to answer the user's question:
-                            Write a clear, complete, and helpful answer to the user's question. Focus on the most relevant information, but include supporting details from the results if they provide useful context or depth.
-                            If multiple entries relate to the same person or topic, group them logically. Do not include information that is unrelated to the user's question or about different topics or people.
-                            If the search results include additional context, such as email addresses or URLs that relate to the user's question, make sure to include them in your answer — even if they were not explicitly asked for.
-                            Respond in tiny paragraphs form, but make sure the information flows logically and doesn't repeat unnecessarily.
-                        """,
-                    },
-                ],
+                                ## How to answer the user's question:
+                                Write a clear, complete, and helpful answer to the user's question. Focus on the most relevant information, but include supporting details from the results if they provide useful context or depth.
+                                If multiple entries relate to the same person or topic, group them logically. Do not include information that is unrelated to the user's question or about different topics or people.
+                                If the search results include additional context, such as email addresses or URLs that relate to the user's question, make sure to include them in your answer — even if they were not explicitly asked for.
+                                Respond in tiny paragraphs form, but make sure the information flows logically and doesn't repeat unnecessarily.
+                            """,
+                        },
+                    ],
+                ),
+                timeout=settings.openai_timeout,
+                description="Handbook answer",
             )
 
             return response.output_text or ""
@@ -44,7 +44,7 @@ class ShowAnalyzeSurveyDataPromptService:
                 ** This field is **ONLY used and should contain a detailed textual description** if the `slide_type` is `Background`, `Image Left`, or `Image Right`.
                 ** If `slide_type` is `Intro`, this field should ideally be omitted, or if included, it MUST be an empty string (`""`).
             * `chart` (object): **Required if** `slide_type` is `Image Left` or `Image Right`:
-            * `type`: chart type, you must find for the python library matplotlib for chart types that best suit the slide data (bar, line or pie).
+            * `type`: chart type, you must find for the python library matplotlib for chart types that best suit the slide data (bar, line, pie or histogram).
             * `title` : title for the chart image. Keep it short.
             * `data` : chart data describes the data for the chart type. Check the `chart` `type` to return a correct response:
                 ** bar or line:
@@ -59,6 +59,23 @@ class ShowAnalyzeSurveyDataPromptService:
                         "label: "string", // y axis label
                         "header_column: "string", // header column to use on the y-axis
                     },
+                    "aggregation": "string", // optional: mean, sum, median, count or percent of the y column per x group. Defaults to mean for numeric columns and count otherwise
+                    "series": { // optional: split every x group by the answers of another column (cross-tab), e.g. answers by department
+                        "label: "string", // legend title
+                        "header_column: "string", // header column whose answers are the series
+                    },
+                }
+                ```
+
+                With `series`, use `count` or `percent` (share of each answer within its x group) to cross-tab two categorical columns. `y` can then be omitted.
+
+                ** histogram (distribution of a numeric column):
+                ```
+                {
+                    "values": {
+                        "header_column: "string", // numeric header column to bin
+                    },
+                    "bins": number, // optional: number of bins, ratings get one bin per value by default
                 }
                 ```
 
@@ -1,10 +1,10 @@
 from typing import Optional
 
-from apps.core.utils.google import GoogleDriveFileContentDict
 from apps.modules.quinn.slides.schemas.survey_data_analysis_schema import Slideshow
 from apps.modules.quinn.slides.services.create_charts_image_service import (
     CreateChartsImageService,
 )
+from apps.modules.quinn.slides.utils.survey_frame import SurveyFrame
 
 
 class SlidesChartsImageController:
@@ -13,7 +13,7 @@ class SlidesChartsImageController:
     async def create(
         self,
         slides_data: Slideshow,
-        source_file_content: GoogleDriveFileContentDict,
+        survey_frame: SurveyFrame,
         create_charts_image_service: CreateChartsImageService,
         hierarchical_questions: Optional[dict[str, dict[str, str]]] = None,
     ) -> Slideshow:
@@ -21,6 +21,6 @@ class SlidesChartsImageController:
 
         return await create_charts_image_service.execute(
             slides_data,
-            source_file_content,
+            survey_frame,
             hierarchical_questions,
         )
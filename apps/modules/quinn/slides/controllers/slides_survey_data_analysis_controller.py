@@ -1,10 +1,10 @@
 from typing import Optional
 
-from apps.core.utils.google import GoogleDriveFileContentDict
 from apps.modules.quinn.slides.schemas.survey_data_analysis_schema import Slideshow
 from apps.modules.quinn.slides.services.create_llm_survey_data_analysis_service import (
     CreateLLMSurveyDataAnalysisService,
 )
+from apps.modules.quinn.slides.utils.survey_frame import SurveyFrame
 
 
 class SlidesSurveyDataAnalysisController:
@@ -12,7 +12,7 @@ class SlidesSurveyDataAnalysisController:
 
     async def create(
         self,
-        source_file_content: GoogleDriveFileContentDict,
+        survey_frame: SurveyFrame,
         structure_description: str,
         analyze_survey_data_prompt: str,
         create_llm_survey_data_analysis_service: CreateLLMSurveyDataAnalysisService,
@@ -21,7 +21,7 @@ class SlidesSurveyDataAnalysisController:
         """Create slides for survey data analysis."""
 
         return await create_llm_survey_data_analysis_service.execute(
-            source_file_content,
+            survey_frame,
             structure_description,
             analyze_survey_data_prompt,
             hierarchical_questions,
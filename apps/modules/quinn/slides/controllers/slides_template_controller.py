@@ -0,0 +1,66 @@
+from fastapi import logger as fastapi_logger
+
+from apps.core.infra.google_api.drive_file_cache import get_validator
+from apps.modules.quinn.slides.utils.google_slides import (
+    TEMPLATE_LAYOUT_FIELDS,
+    TemplateIndex,
+    TemplateIndexCache,
+    template_indexes,
+)
+from apps.modules.shared.google.services.show_google_drive_file_service import (
+    ShowGoogleDriveFileService,
+)
+from apps.modules.shared.google.services.show_google_slides_file_service import (
+    ShowGoogleSlidesFileService,
+)
+
+logger = fastapi_logger.logger
+
+
+class SlidesTemplateController:
+    """Slides Template Controller."""
+
+    def __init__(self, cache: TemplateIndexCache = template_indexes) -> None:
+        self.cache = cache
+
+    async def show(
+        self,
+        template_id: str,
+        show_google_drive_file_service: ShowGoogleDriveFileService,
+        show_google_slides_file_service: ShowGoogleSlidesFileService,
+    ) -> TemplateIndex:
+        """
+        Show the compiled layouts of a template.
+
+        The Drive metadata of the template is checked on every call, its
+        layouts are only fetched and compiled again when it changed.
+        """
+
+        file = await show_google_drive_file_service.execute(template_id)
+        revision = get_validator(file)
+
+        cached = self.cache.get(template_id, revision)
+        if cached is not None:
+            logger.debug(f"Template {template_id} layouts served from cache")
+            return cached
+
+        template_index = await self.compile(
+            template_id,
+            show_google_slides_file_service,
+        )
+        template_index.revision = revision
+        self.cache.set(template_id, template_index)
+        return template_index
+
+    async def compile(
+        self,
+        presentation_id: str,
+        show_google_slides_file_service: ShowGoogleSlidesFileService,
+    ) -> TemplateIndex:
+        """Fetch and compile the layouts of a presentation, without caching them."""
+
+        presentation = await show_google_slides_file_service.execute(
+            presentation_id,
+            TEMPLATE_LAYOUT_FIELDS,
+        )
+        return TemplateIndex.from_layouts(presentation.get("layouts", []))
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel
 
@@ -23,12 +23,22 @@ class Values(BaseModel):
     header_column: str
 
 
+class Series(BaseModel):
+    """Series, splitting each x-axis group by the answers of another column."""
+
+    label: str
+    header_column: str
+
+
 class Data(BaseModel):
     """Data."""
 
     x: Optional[X] = None
     y: Optional[Y] = None
     values: Optional[Values] = None
+    series: Optional[Series] = None
+    aggregation: Optional[Literal["mean", "sum", "median", "count", "percent"]] = None
+    bins: Optional[int] = None
 
 
 class Chart(BaseModel):
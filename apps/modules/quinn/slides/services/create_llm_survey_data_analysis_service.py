@@ -1,12 +1,23 @@
+import asyncio
 import time
 from typing import Optional
 
 from fastapi import HTTPException
 from fastapi import logger as fastapi_logger
+from openai.types.responses import ResponseInputParam
 
 from apps.core.config import settings
-from apps.core.utils.google import GoogleDriveFileContentDict
+from apps.core.infra.open_ai.client_registry import openai_clients
+from apps.core.infra.open_ai.retries import call_with_retries
 from apps.modules.quinn.slides.schemas.survey_data_analysis_schema import Slideshow
+from apps.modules.quinn.slides.utils.survey_frame import SurveyFrame
+from apps.modules.quinn.slides.utils.survey_prompt import (
+    SurveyPrompt,
+    SurveyPromptSerializer,
+    estimate_repr_tokens,
+    estimate_tokens,
+    get_repr_prompt,
+)
 
 logger = fastapi_logger.logger
 
@@ -19,7 +30,7 @@ class CreateLLMSurveyDataAnalysisService:
 
     async def execute(
         self,
-        source_file_content: GoogleDriveFileContentDict,
+        survey_frame: SurveyFrame,
         structure_description: str,
         analyze_survey_data_prompt: str,
         hierarchical_questions: Optional[dict[str, dict[str, str]]] = None,
@@ -29,29 +40,36 @@ class CreateLLMSurveyDataAnalysisService:
         logger.info("Starting the LLM Survey Data Analysis")
         start_time = time.time()
 
+        # Profiling big surveys takes a while, keep it off the event loop
+        survey_prompt, repr_tokens = await asyncio.to_thread(
+            self._get_survey_prompt,
+            survey_frame,
+            hierarchical_questions,
+        )
+
+        input_messages: ResponseInputParam = [
+            {"role": "system", "content": analyze_survey_data_prompt},
+            {
+                "role": "user",
+                "content": f"""
+                    {survey_prompt.content}
+
+                    `structure_description`:
+                    {structure_description}
+                """,
+            },
+        ]
+
         # TODO: Add this to a repository
-        response = settings.openai_client.responses.parse(
-            model=settings.base_reasoning_openai_model,
-            input=[
-                {"role": "system", "content": analyze_survey_data_prompt},
-                {
-                    "role": "user",
-                    "content": f"""
-                        `survey_response_data`:
-                        {source_file_content.data}
-
-                        `structure_description`:
-                        {structure_description}
-
-                        `hierarchical_question_structure`:
-                        {hierarchical_questions or ''}
-
-                        `survey_header_columns`:
-                        {source_file_content.headers}
-                    """,
-                },
-            ],
-            text_format=Slideshow,
+        response = await call_with_retries(
+            lambda: openai_clients.get("reasoning").responses.parse(
+                model=settings.base_reasoning_openai_model,
+                input=input_messages,
+                text_format=Slideshow,
+            ),
+            # Retries share the timeout, a slow reasoning call isn't started over
+            deadline=settings.openai_reasoning_timeout,
+            description="Survey data analysis",
         )
         if not response.output_parsed:
             raise HTTPException(status_code=400, detail="No output parsed")
@@ -61,4 +79,48 @@ class CreateLLMSurveyDataAnalysisService:
             f"LLM Survey Data Analysis completed in {end_time - start_time} seconds",
         )
 
-        return response.output_parsed
+        survey_tokens = survey_prompt.estimated_tokens
+        logger.info(
+            f"Survey prompt ({settings.quinn_prompt_format}): ~{survey_tokens} tokens "
+            f"instead of ~{repr_tokens} ({1 - survey_tokens / max(repr_tokens, 1):.0%} saved), "
+            f"{response.usage.input_tokens if response.usage else '?'} input tokens billed",
+        )
+
+        return SurveyPromptSerializer.restore_slideshow(
+            response.output_parsed,
+            survey_prompt.aliases,
+            survey_prompt.codes,
+        )
+
+    @staticmethod
+    def _get_survey_prompt(
+        survey_frame: SurveyFrame,
+        hierarchical_questions: Optional[dict[str, dict[str, str]]] = None,
+    ) -> tuple[SurveyPrompt, int]:
+        """Get the survey part of the prompt and the `repr` tokens."""
+
+        if settings.quinn_prompt_format == "repr":
+            repr_prompt = get_repr_prompt(
+                survey_frame.headers,
+                survey_frame.data,
+                hierarchical_questions,
+            )
+            repr_tokens = estimate_tokens(repr_prompt)
+            return (
+                SurveyPrompt(
+                    content=repr_prompt,
+                    aliases={},
+                    estimated_tokens=repr_tokens,
+                ),
+                repr_tokens,
+            )
+
+        serialized = SurveyPromptSerializer(
+            settings.quinn_prompt_format,
+            settings.quinn_prompt_header_aliases,
+            settings.quinn_prompt_dictionary_encoding,
+            settings.quinn_prompt_profile_row_threshold,
+            settings.quinn_prompt_sample_size,
+        ).serialize(survey_frame, hierarchical_questions)
+
+        return serialized, estimate_repr_tokens(survey_frame, hierarchical_questions)
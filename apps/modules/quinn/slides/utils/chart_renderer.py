@@ -0,0 +1,140 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Optional
+
+from fastapi import logger as fastapi_logger
+
+from apps.core.config import settings
+from apps.modules.quinn.slides.utils.charts import prewarm_chart_rendering, render_chart
+
+logger = fastapi_logger.logger
+
+
+class ChartRenderer:
+    """
+    Render charts in a pool of worker processes.
+
+    Rendering a PNG with Matplotlib is CPU bound, so charts are rendered out
+    of the event loop and in parallel across cores. Workers are started and
+    warmed up (fonts loaded, a first chart rendered) by `start`. At most
+    `max_pending` charts are queued in the pool, other callers wait their
+    turn. With no workers, charts are rendered in threads instead.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, 1)
+        self._pool: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pool_lock = threading.Lock()
+
+    async def start(self) -> None:
+        """Start the worker processes and warm them up."""
+
+        if self.max_workers <= 0 or self._pool is not None:
+            return
+
+        pool = self._get_pool()
+        loop = asyncio.get_running_loop()
+        try:
+            # Workers are spawned on demand, each warms itself up in the initializer
+            await asyncio.gather(
+                *[
+                    loop.run_in_executor(pool, os.getpid)
+                    for _ in range(self.max_workers)
+                ],
+            )
+            logger.info(f"Chart renderer started with {self.max_workers} workers")
+        except Exception as err:
+            logger.error(f"Error warming up the chart renderer: {err}")
+
+    async def render(
+        self,
+        chart_type: str,
+        chart_data: dict[str, Any],
+        title: str,
+        colors: list[str],
+    ) -> Optional[bytes]:
+        """Render a chart as PNG."""
+
+        if self.max_workers <= 0:
+            return await asyncio.to_thread(
+                render_chart,
+                chart_type,
+                chart_data,
+                title,
+                colors,
+            )
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            pool = self._get_pool()
+            try:
+                return await loop.run_in_executor(
+                    pool,
+                    render_chart,
+                    chart_type,
+                    chart_data,
+                    title,
+                    colors,
+                )
+            except BrokenProcessPool:
+                # A worker died, e.g. killed for memory, start a new pool once
+                self._restart_pool(pool)
+                return await loop.run_in_executor(
+                    self._get_pool(),
+                    render_chart,
+                    chart_type,
+                    chart_data,
+                    title,
+                    colors,
+                )
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _restart_pool(self, broken_pool: Executor) -> None:
+        """Drop a broken pool, unless another render already replaced it."""
+
+        with self._pool_lock:
+            if self._pool is not broken_pool:
+                return
+            logger.error("Chart renderer pool broken, restarting it")
+            broken_pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self) -> Executor:
+        """Get the process pool, starting it if needed."""
+
+        with self._pool_lock:
+            if self._pool is not None:
+                return self._pool
+            # Forking a process running an event loop and threads is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=prewarm_chart_rendering,
+            )
+            return self._pool
+
+
+chart_renderer = ChartRenderer(
+    (
+        settings.chart_render_workers
+        if settings.chart_render_workers >= 0
+        else min(os.cpu_count() or 1, 4)
+    ),
+    settings.chart_render_max_pending,
+)
@@ -1,24 +1,61 @@
-import base64
-import collections
+import asyncio
+import hashlib
 import io
+import json
+import random
 import secrets
-import time
-from typing import Any
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Optional
 
-import matplotlib.pyplot as plt
 import numpy as np
-
+from fastapi import logger as fastapi_logger
+from matplotlib import font_manager
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from apps.core.providers.storage_provider.repository_interfaces.storage_repository_interface import (
+    IStorageProvider,
+)
 from apps.modules.quinn.slides.schemas.survey_data_analysis_schema import Slide
+from apps.modules.quinn.slides.utils.survey_aggregation import (
+    AGGREGATION_LABELS,
+    NUMERIC_AGGREGATIONS,
+    Aggregation,
+    first_appearance_order,
+    group_aggregate,
+    histogram,
+)
+from apps.modules.quinn.slides.utils.survey_frame import SurveyColumn, SurveyFrame
+
+if TYPE_CHECKING:
+    from apps.modules.quinn.slides.utils.chart_renderer import ChartRenderer
+
+logger = fastapi_logger.logger
+
+CHART_DPI = 150
+
+# Bump when the look of the charts changes, so stored charts are rendered again
+CHART_STYLE_VERSION = 1
 
 
-def get_random_hex_colors(n: int) -> list[str]:
-    """Generate n random bright/vibrant hex colors by ensuring high saturation."""
+def get_random_hex_colors(n: int, seed: Optional[str] = None) -> list[str]:
+    """
+    Generate n random bright/vibrant hex colors by ensuring high saturation.
 
+    The same `seed` always gives the same colors.
+    """
+
+    rng = (
+        random.Random(seed)  # noqa: S311
+        if seed is not None
+        else secrets.SystemRandom()
+    )
     colors = []
     for _ in range(n):
-        hue = secrets.randbelow(360)
-        saturation = 70 + secrets.randbelow(31)
-        lightness = 40 + secrets.randbelow(41)
+        hue = rng.randrange(360)
+        saturation = 70 + rng.randrange(31)
+        lightness = 40 + rng.randrange(41)
 
         c = (1 - abs(2 * lightness / 100 - 1)) * saturation / 100
         x = c * (1 - abs((hue / 60) % 2 - 1))
@@ -46,69 +83,107 @@ def get_random_hex_colors(n: int) -> list[str]:
     return colors
 
 
-def create_bar_chart(chart_data: dict[str, Any], title: str, colors: list[str]) -> str:
-    """Create a bar chart."""
+def _new_chart(figsize: tuple[float, float]) -> tuple[Figure, Axes]:
+    """New figure on its own Agg canvas, without pyplot global state."""
 
-    plt.figure(figsize=(10, 6))
-    plt.bar(chart_data.get("x", []), chart_data.get("y", []), color=colors)
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure, figure.add_subplot()
 
-    plt.title(title, fontsize=16, pad=20)
-    plt.ylabel(chart_data.get("y_label", ""), fontsize=12)
-    plt.xlabel(chart_data.get("x_label", ""), fontsize=12)
 
-    plt.xticks(rotation=45, ha="right")
-    plt.grid(axis="y", linestyle="--", alpha=0.7)
-    plt.gca().spines["top"].set_visible(False)
-    plt.gca().spines["right"].set_visible(False)
+def _to_png(figure: Figure) -> bytes:
+    """Render a figure as PNG."""
 
     buf = io.BytesIO()
-    plt.savefig(buf, format="png", dpi=150, bbox_inches="tight")
-    plt.close()
-    image_bytes = buf.getvalue()
-    buf.close()
+    figure.savefig(buf, format="png", dpi=CHART_DPI, bbox_inches="tight")
+    return buf.getvalue()
 
-    return base64.b64encode(image_bytes).decode("utf-8")
 
+def _style_axes(axes: Axes, chart_data: dict[str, Any], title: str) -> None:
+    """Title, axis labels and rotated x labels of bar and line charts."""
 
-def create_line_chart(chart_data: dict[str, Any], title: str) -> str:
-    """Create a line chart."""
+    axes.set_title(title, fontsize=16, pad=20)
+    axes.set_ylabel(chart_data.get("y_label", ""), fontsize=12)
+    axes.set_xlabel(chart_data.get("x_label", ""), fontsize=12)
 
-    plt.figure(figsize=(10, 6))
-    plt.plot(
-        chart_data.get("x", []),
-        chart_data.get("y", []),
-        color="#4A90E2",
-        marker="o",
-        linestyle="-",
-    )
+    for label in axes.get_xticklabels():
+        label.set_rotation(45)
+        label.set_horizontalalignment("right")
+    axes.spines["top"].set_visible(False)
+    axes.spines["right"].set_visible(False)
 
-    plt.title(title, fontsize=16, pad=20)
-    plt.ylabel(chart_data.get("y_label", ""), fontsize=12)
-    plt.xlabel(chart_data.get("x_label", ""), fontsize=12)
 
-    plt.xticks(rotation=45, ha="right")
-    plt.grid(True, linestyle="--", alpha=0.6)
-    plt.gca().spines["top"].set_visible(False)
-    plt.gca().spines["right"].set_visible(False)
+def create_bar_chart(
+    chart_data: dict[str, Any],
+    title: str,
+    colors: list[str],
+) -> bytes:
+    """Create a bar chart."""
 
-    buf = io.BytesIO()
-    plt.savefig(buf, format="png", dpi=150, bbox_inches="tight")
-    plt.close()
-    image_bytes = buf.getvalue()
-    buf.close()
+    figure, axes = _new_chart((10, 6))
+    series = chart_data.get("series")
+    if series:
+        # Grouped bars, one per series within each x group
+        positions = np.arange(len(chart_data.get("x", [])))
+        width = 0.8 / len(series)
+        for i, item in enumerate(series):
+            axes.bar(
+                positions + (i - (len(series) - 1) / 2) * width,
+                item["y"],
+                width,
+                label=item["label"],
+                color=colors[i % len(colors)] if colors else None,
+            )
+        axes.set_xticks(positions, chart_data.get("x", []))
+        axes.legend(title=chart_data.get("series_label"))
+    else:
+        axes.bar(chart_data.get("x", []), chart_data.get("y", []), color=colors)
+
+    _style_axes(axes, chart_data, title)
+    axes.grid(axis="y", linestyle="--", alpha=0.7)
+
+    return _to_png(figure)
+
+
+def create_line_chart(chart_data: dict[str, Any], title: str) -> bytes:
+    """Create a line chart."""
+
+    figure, axes = _new_chart((10, 6))
+    series = chart_data.get("series")
+    if series:
+        for item in series:
+            axes.plot(
+                chart_data.get("x", []),
+                item["y"],
+                marker="o",
+                linestyle="-",
+                label=item["label"],
+            )
+        axes.legend(title=chart_data.get("series_label"))
+    else:
+        axes.plot(
+            chart_data.get("x", []),
+            chart_data.get("y", []),
+            color="#4A90E2",
+            marker="o",
+            linestyle="-",
+        )
 
-    return base64.b64encode(image_bytes).decode("utf-8")
+    _style_axes(axes, chart_data, title)
+    axes.grid(True, linestyle="--", alpha=0.6)
+
+    return _to_png(figure)
 
 
 def create_pie_chart(
     chart_data: dict[str, Any],
     title: str,
     colors: list[str],
-) -> str:
+) -> bytes:
     """Create a pie chart."""
 
-    plt.figure(figsize=(8, 8))
-    plt.pie(
+    figure, axes = _new_chart((8, 8))
+    axes.pie(
         chart_data.get("sizes", []),
         labels=chart_data.get("labels", []),
         colors=colors,
@@ -118,132 +193,360 @@ def create_pie_chart(
         pctdistance=0.8,
         textprops={"color": "black", "weight": "bold"},
     )
-    plt.title(title, fontsize=16, pad=20)
-    plt.axis("equal")
-    buf = io.BytesIO()
-    plt.savefig(buf, format="png", dpi=150, bbox_inches="tight")
-    plt.close()
-    image_bytes = buf.getvalue()
-    buf.close()
+    axes.set_title(title, fontsize=16, pad=20)
+    axes.axis("equal")
+
+    return _to_png(figure)
+
+
+def render_chart(
+    chart_type: str,
+    chart_data: dict[str, Any],
+    title: str,
+    colors: list[str],
+) -> Optional[bytes]:
+    """Render a chart as PNG, `None` for unknown chart types."""
+
+    if chart_type in ["bar", "histogram"]:
+        return create_bar_chart(chart_data, title, colors)
+    if chart_type == "pie":
+        return create_pie_chart(chart_data, title, colors)
+    if chart_type == "line":
+        return create_line_chart(chart_data, title)
+    return None
+
+
+def prewarm_chart_rendering() -> None:
+    """Load the fonts and render a first chart, e.g. in a new worker process."""
 
-    return base64.b64encode(image_bytes).decode("utf-8")
+    font_manager.findfont(font_manager.FontProperties())
+    render_chart("bar", {"x": ["warm-up"], "y": [1]}, "warm-up", ["#4A90E2"])
 
 
-def prepare_chart_data(  # noqa: C901
+def prepare_chart_data(
     chart_info: dict[str, Any],
-    survey_data: list[dict[str, Any]],
+    survey_frame: SurveyFrame,
 ) -> dict[str, Any]:
-    """Prepare chart data for plotting."""
+    """
+    Prepare chart data for plotting.
+
+    Bar and line charts aggregate the y column by the answers of the x
+    column, with `data.aggregation` (mean for numeric columns and count
+    otherwise by default). With `data.series` every x group is split by the
+    answers of another column, a cross-tab when counting. Histograms bin the
+    numbers of `data.values` (or `data.x`).
+    """
 
     chart_type = chart_info.get("type")
-    chart_data = chart_info.get("data", {})
-    data_for_plotting = {}
+    chart_data = chart_info.get("data") or {}
 
     if chart_type == "pie":
-        header = chart_data.get("values", {}).get("header_column", None)
-        responses = collections.Counter(
-            [row.get(header) for row in survey_data if row.get(header)],
+        return _prepare_pie_data(chart_data, survey_frame)
+    if chart_type == "histogram":
+        return _prepare_histogram_data(chart_data, survey_frame)
+    if chart_type in ["bar", "line"]:
+        return _prepare_aggregated_data(chart_data, survey_frame)
+    return {}
+
+
+def _prepare_pie_data(
+    chart_data: dict[str, Any],
+    survey_frame: SurveyFrame,
+) -> dict[str, Any]:
+    """Count the answers of the `data.values` column."""
+
+    column = survey_frame.get((chart_data.get("values") or {}).get("header_column"))
+    if column is None:
+        return {"labels": [], "sizes": []}
+
+    counts = column.counts()
+    order = first_appearance_order(column.codes[column.answered])
+    return {
+        "labels": [column.categories[code] for code in order],
+        "sizes": [int(counts[code]) for code in order],
+    }
+
+
+def _prepare_histogram_data(
+    chart_data: dict[str, Any],
+    survey_frame: SurveyFrame,
+) -> dict[str, Any]:
+    """Bin the numbers of the `data.values` (or `data.x`) column."""
+
+    x_axis = chart_data.get("x") or {}
+    y_axis = chart_data.get("y") or {}
+    column = survey_frame.get(
+        (chart_data.get("values") or {}).get("header_column")
+        or x_axis.get("header_column"),
+    )
+    if column is None or column.type != "numeric":
+        return {}
+
+    labels, counts = histogram(column.values(), chart_data.get("bins"))
+    if not labels:
+        return {}
+    return {
+        "x": labels,
+        "x_label": x_axis.get("label") or column.header,
+        "y": [int(count) for count in counts],
+        "y_label": "Count of " + (y_axis.get("label") or "Responses"),
+    }
+
+
+def _resolve_aggregation(
+    requested: Optional[Aggregation],
+    value: Optional[SurveyColumn],
+) -> Aggregation:
+    """The requested aggregation, falling back to counting for non numeric values."""
+
+    numeric = value is not None and value.type == "numeric"
+    if requested is None:
+        return "mean" if numeric else "count"
+    if requested in NUMERIC_AGGREGATIONS and not numeric:
+        return "count"
+    return requested
+
+
+def _prepare_aggregated_data(
+    chart_data: dict[str, Any],
+    survey_frame: SurveyFrame,
+) -> dict[str, Any]:
+    """Aggregate the y column by the answers of the x column, and of the series."""
+
+    x_axis = chart_data.get("x") or {}
+    y_axis = chart_data.get("y") or {}
+    series_axis = chart_data.get("series") or {}
+    group_by = survey_frame.get(x_axis.get("header_column"))
+    value = survey_frame.get(y_axis.get("header_column"))
+    series = survey_frame.get(series_axis.get("header_column"))
+    if group_by is None or (value is None and series is None):
+        return {}
+
+    aggregation = _resolve_aggregation(chart_data.get("aggregation"), value)
+
+    valid = group_by.answered
+    values = None
+    if value is not None:
+        valid = valid & value.answered
+        if aggregation in NUMERIC_AGGREGATIONS:
+            values = value.values()
+            valid &= ~np.isnan(values)
+    if series is not None:
+        valid &= series.answered
+    if not valid.any():
+        return {}
+
+    y_label_text = f"{AGGREGATION_LABELS[aggregation]} " + (
+        y_axis.get("label")
+        or ("Value" if aggregation in NUMERIC_AGGREGATIONS else "Responses")
+    )
+    data_for_plotting: dict[str, Any] = {
+        "x_label": x_axis.get("label", None),
+        "y_label": y_label_text,
+    }
+
+    valid_values = values[valid] if values is not None else None
+    if series is None:
+        data_for_plotting.update(
+            _aggregate_groups(group_by, valid, aggregation, valid_values),
+        )
+    else:
+        data_for_plotting["series_label"] = series_axis.get("label") or series.header
+        data_for_plotting.update(
+            _aggregate_cross_tab(group_by, series, valid, aggregation, valid_values),
         )
+    return data_for_plotting
 
-        data_for_plotting = {
-            "labels": list(responses.keys()),
-            "sizes": list(responses.values()),
-        }
-    elif chart_type in ["bar", "line"]:
-        group_by_col = chart_data.get("x", {}).get("header_column")
-        value_col = chart_data.get("y", {}).get("header_column")
-
-        if not group_by_col or not value_col:
-            return {}
-
-        grouped_data = collections.defaultdict(list)
-        is_numeric_data = None
-
-        for row in survey_data:
-            key = row.get(group_by_col)
-            value = row.get(value_col)
-
-            if key and value is not None and str(value).strip() != "":
-                if is_numeric_data is None:
-                    is_numeric_data = str(value).replace(".", "", 1).isdigit()
-
-                if is_numeric_data:
-                    if str(value).replace(".", "", 1).isdigit():
-                        grouped_data[key].append(float(value))
-                else:
-                    grouped_data[key].append(value)
-
-        data_for_plotting = {}
-        if grouped_data:
-            if is_numeric_data:
-                sorted_results = sorted(
-                    [(k, np.mean(v)) for k, v in grouped_data.items()],
-                    key=lambda item: item[1],
-                    reverse=True,
-                )
-                y_label_text = "Average " + (
-                    chart_data.get("y", {}).get("label") or "Value"
-                )
-            else:
-                sorted_results = sorted(
-                    [(k, np.float64(len(v))) for k, v in grouped_data.items()],
-                    key=lambda item: item[1],
-                    reverse=True,
-                )
-                y_label_text = "Count of " + (
-                    chart_data.get("y", {}).get("label") or "Responses"
-                )
-
-            data_for_plotting = {
-                "x": [item[0] for item in sorted_results],
-                "x_label": chart_data.get("x", {}).get("label", None),
-                "y": [round(item[1], 2) for item in sorted_results],
-                "y_label": y_label_text,
+
+def _aggregate_groups(
+    group_by: SurveyColumn,
+    valid: np.ndarray,
+    aggregation: Aggregation,
+    values: Optional[np.ndarray],
+) -> dict[str, Any]:
+    """A bar per x answer, biggest first."""
+
+    group_keys = group_by.codes[valid]
+    results, _ = group_aggregate(
+        group_keys,
+        len(group_by.categories),
+        aggregation,
+        values,
+    )
+    # Groups in order of first appearance, then by value, as a stable sort
+    order = first_appearance_order(group_keys)
+    order = order[np.argsort(-results[order], kind="stable")]
+    return {
+        "x": [group_by.categories[code] for code in order],
+        "y": [round(float(results[code]), 2) for code in order],
+    }
+
+
+def _aggregate_cross_tab(
+    group_by: SurveyColumn,
+    series: SurveyColumn,
+    valid: np.ndarray,
+    aggregation: Aggregation,
+    values: Optional[np.ndarray],
+) -> dict[str, Any]:
+    """A group per (x, series) pair of answers, percents are shares within x."""
+
+    group_keys = group_by.codes[valid]
+    series_keys = series.codes[valid]
+    width = len(series.categories)
+    results, counts = group_aggregate(
+        group_keys * width + series_keys,
+        len(group_by.categories) * width,
+        "count" if aggregation == "percent" else aggregation,
+        values,
+    )
+    results = results.reshape(len(group_by.categories), width)
+    counts = counts.reshape(len(group_by.categories), width)
+    if aggregation == "percent":
+        # Share of each series within its x group
+        totals = counts.sum(axis=1, keepdims=True)
+        results = counts * 100 / np.maximum(totals, 1)
+
+    # Biggest groups first, series in order of first appearance
+    group_order = first_appearance_order(group_keys)
+    group_order = group_order[
+        np.argsort(-counts.sum(axis=1)[group_order], kind="stable")
+    ]
+    series_order = first_appearance_order(series_keys)
+
+    return {
+        "x": [group_by.categories[code] for code in group_order],
+        "series": [
+            {
+                "label": series.categories[code],
+                "y": [round(float(results[group, code]), 2) for group in group_order],
             }
+            for code in series_order
+        ],
+    }
 
-    return data_for_plotting
 
+def _digest(value: Any) -> str:
+    """SHA-256 of a JSON value, whatever the order of its keys."""
 
-def process_slides_and_generate_charts(
-    slides_data: list[Slide],
-    survey_data: list[dict[str, Any]],
-) -> list[dict[str, Any]]:
-    """Process slides and generate charts."""
+    payload = json.dumps(
+        value,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class ChartSpec:
+    """
+    A chart to render for a slide.
+
+    Charts are content addressed: `key` hashes everything that changes the
+    image, so the same chart over the same data is stored under the same
+    `file_name`. Its colors are seeded by the chart itself to stay stable.
+    """
+
+    index: int
+    type: str
+    data: dict[str, Any]
+    title: str
+    colors: list[str] = field(default_factory=list)
+    key: str = ""
+
+    def __post_init__(self) -> None:
+        content = {"type": self.type, "title": self.title, "data": self.data}
+        if not self.colors:
+            num_points = (
+                len(self.data.get("series", []))
+                or len(self.data.get("x", []))
+                or len(self.data.get("labels", []))
+            )
+            self.colors = get_random_hex_colors(num_points, _digest(content))
+        self.key = _digest(
+            {
+                **content,
+                "colors": self.colors,
+                "dpi": CHART_DPI,
+                "style": CHART_STYLE_VERSION,
+            },
+        )
+
+    @property
+    def file_name(self) -> str:
+        """Storage name of the chart image."""
+
+        return f"charts/{self.key}.png"
 
-    base64_charts = []
 
+def prepare_slide_charts(
+    slides_data: list[Slide],
+    survey_frame: SurveyFrame,
+) -> list[ChartSpec]:
+    """Charts of the slides with data to plot."""
+
+    charts = []
     for index, slide in enumerate(slides_data):
-        if slide.chart:
-            chart_info = slide.chart
-            chart_title = chart_info.title or slide.title or "Untitled"
-            chart_type = chart_info.type
-
-            plot_data = prepare_chart_data(chart_info.model_dump(), survey_data)
-            if not plot_data:
-                continue
-
-            num_points = len(plot_data.get("x", [])) or len(plot_data.get("labels", []))
-            colors = get_random_hex_colors(num_points) if num_points > 0 else []
-            base64_string = None
-
-            if chart_type == "bar":
-                base64_string = create_bar_chart(plot_data, chart_title, colors)
-            elif chart_type == "pie":
-                base64_string = create_pie_chart(plot_data, chart_title, colors)
-            elif chart_type == "line":
-                base64_string = create_line_chart(plot_data, chart_title)
-
-            if base64_string:
-                timestamp = time.time_ns()
-                unique_title = (
-                    f"{(slide.title or 'chart').lower().replace(' ', '_')}_{timestamp}"
-                )
-                base64_charts.append(
-                    {
-                        "title": unique_title,
-                        "data": base64_string,
-                        "index": index,
-                    },
-                )
-
-    return base64_charts
+        if not slide.chart:
+            continue
+
+        chart_info = slide.chart
+        plot_data = prepare_chart_data(chart_info.model_dump(), survey_frame)
+        if not plot_data:
+            continue
+
+        charts.append(
+            ChartSpec(
+                index,
+                chart_info.type,
+                plot_data,
+                chart_info.title or slide.title or "Untitled",
+            ),
+        )
+
+    return charts
+
+
+async def _get_chart_url(
+    chart: ChartSpec,
+    renderer: "ChartRenderer",
+    storage_provider: IStorageProvider,
+) -> Optional[str]:
+    """URL of a chart, only rendered and uploaded when not stored yet."""
+
+    if await storage_provider.exists(chart.file_name):
+        logger.info(f"Chart {chart.file_name} already stored")
+        return storage_provider.get_url(chart.file_name)
+
+    image = await renderer.render(chart.type, chart.data, chart.title, chart.colors)
+    if not image:
+        return None
+    return await storage_provider.upload_bytes(image, chart.file_name, "image/png")
+
+
+async def process_slides_and_generate_charts(
+    slides_data: list[Slide],
+    survey_frame: SurveyFrame,
+    renderer: "ChartRenderer",
+    storage_provider: IStorageProvider,
+) -> dict[int, str]:
+    """
+    Process slides and generate charts, returning the chart URL per slide index.
+
+    Chart data is prepared here. Charts already in storage are reused, the
+    others are rendered concurrently by the renderer then uploaded. Identical
+    charts of a deck are only handled once.
+    """
+
+    charts = prepare_slide_charts(slides_data, survey_frame)
+    unique_charts = {chart.key: chart for chart in charts}
+    urls = await asyncio.gather(
+        *[
+            _get_chart_url(chart, renderer, storage_provider)
+            for chart in unique_charts.values()
+        ],
+    )
+    url_by_key = dict(zip(unique_charts, urls))
+
+    return {chart.index: url for chart in charts if (url := url_by_key[chart.key])}
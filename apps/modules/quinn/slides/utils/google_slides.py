@@ -1,114 +1,84 @@
-from typing import Any, List
+from dataclasses import dataclass
+from typing import Any, List, Optional
 
 from fastapi import logger as fastapi_logger
+from googleapiclient.errors import HttpError
 
 from apps.modules.quinn.slides.schemas.survey_data_analysis_schema import Slide
 
 logger = fastapi_logger.logger
 
 
-def find_layout_and_placeholders_for_new_structure(  # noqa: C901, PLR0912, PLR0915
-    available_layouts: list[dict[str, Any]],
-    slide_data_item: dict[str, Any],
-) -> tuple[str | None, dict[str, Any]]:
-    """Find the layout and placeholders for a new structure."""
+# Slide types with bullet points and a description, and those with an image
+TEXT_SLIDE_TYPES = ("Background", "Image Left", "Image Right")
+IMAGE_SLIDE_TYPES = ("Image Left", "Image Right")
+
+# Only what compiling the layouts needs from `presentations.get`
+TEMPLATE_LAYOUT_FIELDS = (
+    "presentationId,layouts(objectId,layoutProperties/displayName,"
+    "pageElements(objectId,shape/placeholder,image/placeholder))"
+)
+
+# Content of a slide: title, bullet points, description, image
+SlideContent = tuple[bool, bool, bool, bool]
+
+SLIDE_CONTENTS: tuple[SlideContent, ...] = tuple(
+    (has_title, has_bullets, has_description, has_image)
+    for has_title in (False, True)
+    for has_bullets in (False, True)
+    for has_description in (False, True)
+    for has_image in (False, True)
+)
 
-    slide_type = slide_data_item.get("slide_type")
-    has_title = bool(slide_data_item.get("title"))
-    has_bullets = slide_type in ["Background", "Image Left", "Image Right"] and bool(
-        slide_data_item.get("bullet_points"),
-    )
-    has_description = slide_type in [
-        "Background",
-        "Image Left",
-        "Image Right",
-    ] and bool(
-        slide_data_item.get("description"),
-    )
-    has_image = slide_type in ["Image Left", "Image Right"] and bool(
-        slide_data_item.get("image_url"),
-    )
-
-    chosen_layout_object = None
-    for layout_obj in available_layouts:
-        if layout_obj.get("layoutProperties", {}).get("displayName") == slide_type:
-            chosen_layout_object = layout_obj
-            break
-
-    if not chosen_layout_object:
-        logger.error("Error: No layouts available in 'available_layouts'.")
-        return None, {}
-
-    best_layout_id = chosen_layout_object.get("objectId")
-    best_placeholder_map = {}
 
-    placeholders_on_chosen_layout: dict[str, dict[int, str]] = {}
-    for pe in chosen_layout_object.get("pageElements", []):
+def _get_placeholders(layout: dict[str, Any]) -> dict[str, dict[int, str]]:
+    """Placeholder object ids of a layout by type and index."""
+
+    placeholders: dict[str, dict[int, str]] = {}
+    for pe in layout.get("pageElements", []):
         if pe.get("shape") and pe["shape"].get("placeholder"):
             ph = pe["shape"]["placeholder"]
-            ph_type = ph.get("type")
-            ph_idx = ph.get("index", 0)
-            ph_obj_id = pe.get("objectId")
-
-            if ph_type not in placeholders_on_chosen_layout:
-                placeholders_on_chosen_layout[ph_type] = {}
-            placeholders_on_chosen_layout[ph_type][ph_idx] = ph_obj_id
+            index = ph.get("index", 0)
+            placeholders.setdefault(ph.get("type"), {})[index] = pe.get("objectId")
         elif (
             pe.get("image")
             and pe.get("image").get("placeholder", {}).get("type") == "PICTURE"
         ):
-            if "PICTURE" not in placeholders_on_chosen_layout:
-                placeholders_on_chosen_layout["PICTURE"] = {}
-            placeholders_on_chosen_layout["PICTURE"][0] = pe.get("objectId")
+            placeholders.setdefault("PICTURE", {})[0] = pe.get("objectId")
+    return placeholders
+
+
+def _assign_placeholders(
+    placeholders: dict[str, dict[int, str]],
+    content: SlideContent,
+) -> dict[str, str]:
+    """Layout placeholder of each part of a slide's content."""
+
+    has_title, has_bullets, has_description, has_image = content
+    best_placeholder_map = {}
 
     if has_title:
-        if (
-            "TITLE" in placeholders_on_chosen_layout
-            and 0 in placeholders_on_chosen_layout["TITLE"]
-        ):
-            best_placeholder_map["TITLE"] = placeholders_on_chosen_layout["TITLE"][0]
-        elif (
-            "CENTERED_TITLE" in placeholders_on_chosen_layout
-            and 0 in placeholders_on_chosen_layout["CENTERED_TITLE"]
-        ):
-            best_placeholder_map["TITLE"] = placeholders_on_chosen_layout[
-                "CENTERED_TITLE"
-            ][0]
-        elif (
-            "SUBTITLE" in placeholders_on_chosen_layout
-            and 0 in placeholders_on_chosen_layout["SUBTITLE"]
-        ):
-            best_placeholder_map["TITLE"] = placeholders_on_chosen_layout["SUBTITLE"][0]
-
-    if has_image and "PICTURE" in placeholders_on_chosen_layout:
-        if 0 in placeholders_on_chosen_layout["PICTURE"]:
-            best_placeholder_map["IMAGE"] = placeholders_on_chosen_layout["PICTURE"][0]
-        else:
-            for pic_idx in sorted(placeholders_on_chosen_layout["PICTURE"].keys()):
-                best_placeholder_map["IMAGE"] = placeholders_on_chosen_layout[
-                    "PICTURE"
-                ][pic_idx]
+        for ph_type in ("TITLE", "CENTERED_TITLE", "SUBTITLE"):
+            if 0 in placeholders.get(ph_type, {}):
+                best_placeholder_map["TITLE"] = placeholders[ph_type][0]
                 break
 
-    body_ph_ids_available = []
-    if "BODY" in placeholders_on_chosen_layout:
-        for idx in sorted(placeholders_on_chosen_layout["BODY"].keys()):
-            body_ph_ids_available.append(placeholders_on_chosen_layout["BODY"][idx])
-
-    subtitle_ph_ids_available = []
-    if "SUBTITLE" in placeholders_on_chosen_layout:
-        for idx in sorted(placeholders_on_chosen_layout["SUBTITLE"].keys()):
-            if placeholders_on_chosen_layout["SUBTITLE"][
-                idx
-            ] != best_placeholder_map.get("TITLE"):
-                subtitle_ph_ids_available.append(
-                    placeholders_on_chosen_layout["SUBTITLE"][idx],
-                )
+    if has_image and placeholders.get("PICTURE"):
+        pictures = placeholders["PICTURE"]
+        best_placeholder_map["IMAGE"] = pictures.get(0) or pictures[min(pictures)]
+
+    body_ph_ids_available = [
+        placeholders["BODY"][idx] for idx in sorted(placeholders.get("BODY", {}))
+    ]
+    subtitle_ph_ids_available = [
+        placeholders["SUBTITLE"][idx]
+        for idx in sorted(placeholders.get("SUBTITLE", {}))
+        if placeholders["SUBTITLE"][idx] != best_placeholder_map.get("TITLE")
+    ]
 
     if has_bullets and body_ph_ids_available:
-        best_placeholder_map["BULLETS"] = body_ph_ids_available.pop(
-            0,
-        )  # Take the first available BODY
+        # Take the first available BODY
+        best_placeholder_map["BULLETS"] = body_ph_ids_available.pop(0)
 
     if has_description:
         if body_ph_ids_available:
@@ -116,52 +86,190 @@ def find_layout_and_placeholders_for_new_structure(  # noqa: C901, PLR0912, PLR0
         elif subtitle_ph_ids_available:
             best_placeholder_map["DESCRIPTION"] = subtitle_ph_ids_available.pop(0)
 
-    if has_title and "TITLE" not in best_placeholder_map:
-        logger.warning(
-            f"Warning: Title expected but no 'TITLE', 'CENTERED_TITLE', or 'SUBTITLE' placeholder mapped for layout {best_layout_id}.",
-        )
-    if has_bullets and "BULLETS" not in best_placeholder_map:
-        logger.warning(
-            f"Warning: Bullet points expected for slide_type '{slide_type}' but no 'BODY' placeholder mapped for 'BULLETS' on layout {best_layout_id}.",
-        )
-    if has_description and "DESCRIPTION" not in best_placeholder_map:
-        logger.warning(
-            f"Warning: Description expected for slide_type '{slide_type}' but no ('BODY' or 'SUBTITLE') placeholder mapped for 'DESCRIPTION' on layout {best_layout_id}.",
+    return best_placeholder_map
+
+
+@dataclass
+class CompiledLayout:
+    """A layout with the placeholders of every possible slide content assigned."""
+
+    object_id: str
+    assignments: dict[SlideContent, dict[str, str]]
+
+    @classmethod
+    def compile(cls, layout: dict[str, Any]) -> "CompiledLayout":
+        """Compile a layout of `presentations.get`."""
+
+        object_id = layout.get("objectId")
+        if not isinstance(object_id, str):
+            raise ValueError(f"Layout without an objectId: {layout}")
+
+        placeholders = _get_placeholders(layout)
+        return cls(
+            object_id,
+            {
+                content: _assign_placeholders(placeholders, content)
+                for content in SLIDE_CONTENTS
+            },
         )
-    if has_image and "IMAGE" not in best_placeholder_map:
-        logger.warning(
-            f"Warning: Image expected but no 'PICTURE' placeholder mapped for 'IMAGE' on layout {best_layout_id}.",
+
+
+class TemplateIndex:
+    """
+    Layouts of a template by display name, compiled once.
+
+    A presentation copied from the template has the same layouts, with the
+    same object ids, so the index of the template serves its copies.
+    `revision` holds the Drive metadata fields of the template it was built
+    from, see `get_validator`.
+    """
+
+    def __init__(
+        self,
+        layouts: dict[str, CompiledLayout],
+        revision: Optional[dict[str, str]] = None,
+    ) -> None:
+        self.layouts = layouts
+        self.revision = revision
+
+    @classmethod
+    def from_layouts(
+        cls,
+        available_layouts: list[dict[str, Any]],
+        revision: Optional[dict[str, str]] = None,
+    ) -> "TemplateIndex":
+        """Compile the layouts of a presentation, the first of each display name wins."""
+
+        layouts: dict[str, CompiledLayout] = {}
+        for layout in available_layouts:
+            display_name = layout.get("layoutProperties", {}).get("displayName")
+            if display_name not in layouts:
+                layouts[display_name] = CompiledLayout.compile(layout)
+        return cls(layouts, revision)
+
+    def find(
+        self,
+        slide_data_item: dict[str, Any],
+    ) -> tuple[str | None, dict[str, Any]]:
+        """Find the layout and placeholders of a slide."""
+
+        slide_type = slide_data_item.get("slide_type")
+        content: SlideContent = (
+            bool(slide_data_item.get("title")),
+            slide_type in TEXT_SLIDE_TYPES
+            and bool(slide_data_item.get("bullet_points")),
+            slide_type in TEXT_SLIDE_TYPES and bool(slide_data_item.get("description")),
+            slide_type in IMAGE_SLIDE_TYPES and bool(slide_data_item.get("image_url")),
         )
 
-    return best_layout_id, best_placeholder_map
+        layout = self.layouts.get(slide_type) if isinstance(slide_type, str) else None
+        if layout is None:
+            logger.error(f"Error: No layout '{slide_type}' in the template.")
+            return None, {}
+
+        best_layout_id = layout.object_id
+        best_placeholder_map = dict(layout.assignments[content])
+        has_title, has_bullets, has_description, has_image = content
+
+        if has_title and "TITLE" not in best_placeholder_map:
+            logger.warning(
+                f"Warning: Title expected but no 'TITLE', 'CENTERED_TITLE', or 'SUBTITLE' placeholder mapped for layout {best_layout_id}.",
+            )
+        if has_bullets and "BULLETS" not in best_placeholder_map:
+            logger.warning(
+                f"Warning: Bullet points expected for slide_type '{slide_type}' but no 'BODY' placeholder mapped for 'BULLETS' on layout {best_layout_id}.",
+            )
+        if has_description and "DESCRIPTION" not in best_placeholder_map:
+            logger.warning(
+                f"Warning: Description expected for slide_type '{slide_type}' but no ('BODY' or 'SUBTITLE') placeholder mapped for 'DESCRIPTION' on layout {best_layout_id}.",
+            )
+        if has_image and "IMAGE" not in best_placeholder_map:
+            logger.warning(
+                f"Warning: Image expected but no 'PICTURE' placeholder mapped for 'IMAGE' on layout {best_layout_id}.",
+            )
+
+        return best_layout_id, best_placeholder_map
+
+
+class TemplateIndexCache:
+    """Compiled template indexes by template id, served while the template revision matches."""
+
+    def __init__(self) -> None:
+        self._indexes: dict[str, TemplateIndex] = {}
+
+    def get(
+        self,
+        template_id: str,
+        revision: Optional[dict[str, str]],
+    ) -> Optional[TemplateIndex]:
+        """Index of a template, if compiled for this revision."""
+
+        index = self._indexes.get(template_id)
+        if index is None or revision is None or index.revision != revision:
+            return None
+        return index
+
+    def set(self, template_id: str, index: TemplateIndex) -> None:
+        """Cache the index of a template."""
+
+        if index.revision is not None:
+            self._indexes[template_id] = index
+
+
+template_indexes = TemplateIndexCache()
+
+
+def find_layout_and_placeholders_for_new_structure(
+    available_layouts: list[dict[str, Any]],
+    slide_data_item: dict[str, Any],
+) -> tuple[str | None, dict[str, Any]]:
+    """Find the layout and placeholders for a new structure."""
+
+    return TemplateIndex.from_layouts(available_layouts).find(slide_data_item)
+
+
+def is_missing_layout_error(error: BaseException) -> bool:
+    """
+    Whether a batchUpdate failed on a layout, or layout placeholder, not found.
+
+    The template changed while being copied, e.g. a layout was renamed or
+    removed. Slides applies no request of a failed batchUpdate.
+    """
+
+    cause = error if isinstance(error, HttpError) else error.__cause__
+    if not isinstance(cause, HttpError) or cause.resp.status != 400:
+        return False
+    reason = str(cause.reason)
+    return "createSlide" in reason and "could not be found" in reason
 
 
 def create_google_slides_presentation(  # noqa: C901
     slides_json_data: List[Slide],
     presentation_id: str,
-    available_layouts: list[dict[str, Any]],
+    template_index: TemplateIndex,
+    id_suffix: str = "",
 ) -> list[dict[str, Any]]:
-    """Create a Google Slides presentation from a list of slides."""
+    """
+    Create a Google Slides presentation from a list of slides.
+
+    The object ids of the new slides and elements end with `id_suffix`, a
+    new suffix gives new ids, e.g. to retry a batchUpdate.
+    """
 
     logger.info(f"Preparing requests for presentation ID: {presentation_id}")
     requests = []
 
     for i, slide_data_model in enumerate(slides_json_data):
         slide_data = slide_data_model.model_dump()
-        slide_object_id = f"slide_{i}"
+        slide_object_id = f"slide_{i}{id_suffix}"
         slide_type = slide_data.get("slide_type")
 
-        title_element_id = f"title_element_{i}"
-        bullets_element_id = f"bullets_element_{i}"
-        description_element_id = f"description_element_{i}"
-        image_element_id = f"image_element_{i}"
+        title_element_id = f"title_element_{i}{id_suffix}"
+        bullets_element_id = f"bullets_element_{i}{id_suffix}"
+        description_element_id = f"description_element_{i}{id_suffix}"
+        image_element_id = f"image_element_{i}{id_suffix}"
 
-        chosen_layout_id, master_placeholders = (
-            find_layout_and_placeholders_for_new_structure(
-                available_layouts,
-                slide_data,
-            )
-        )
+        chosen_layout_id, master_placeholders = template_index.find(slide_data)
 
         if not chosen_layout_id:
             logger.error(
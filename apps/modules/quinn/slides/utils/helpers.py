@@ -1,8 +1,8 @@
-from typing import Any
+from typing import Mapping, Sequence
 
 
 def get_hierarchical_question_structure(
-    structured_questions_file_content: list[dict[str, Any]],
+    structured_questions_file_content: Sequence[Mapping[str, str]],
 ) -> dict[str, dict[str, str]]:
     """Hierarchical question structure."""
 
@@ -0,0 +1,109 @@
+from typing import Literal, Optional
+
+import numpy as np
+
+Aggregation = Literal["mean", "sum", "median", "count", "percent"]
+
+# Aggregations that need numbers to work on
+NUMERIC_AGGREGATIONS = ("mean", "sum", "median")
+
+AGGREGATION_LABELS: dict[str, str] = {
+    "mean": "Average",
+    "sum": "Total",
+    "median": "Median",
+    "count": "Count of",
+    "percent": "% of",
+}
+
+
+def first_appearance_order(keys: np.ndarray) -> np.ndarray:
+    """Distinct keys in order of first appearance."""
+
+    unique_keys, first_indexes = np.unique(keys, return_index=True)
+    return unique_keys[np.argsort(first_indexes)]
+
+
+def group_aggregate(
+    keys: np.ndarray,
+    size: int,
+    aggregation: Aggregation,
+    values: Optional[np.ndarray] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Aggregate values by group.
+
+    `keys` are the group of each value, from 0 to `size` - 1, e.g. the codes
+    of a survey column. It returns the aggregate and the number of values of
+    each group. Empty groups get NaN for mean and median. `percent` is the
+    share of all values falling in each group.
+    """
+
+    counts = np.bincount(keys, minlength=size)
+    if aggregation == "count":
+        return counts.astype(np.float64), counts
+    if aggregation == "percent":
+        total = counts.sum()
+        return (counts * 100 / total if total else counts.astype(np.float64)), counts
+
+    if values is None:
+        raise ValueError(f"{aggregation} needs values")
+
+    if aggregation == "median":
+        return _group_median(keys, values, counts), counts
+
+    sums = np.bincount(keys, weights=values, minlength=size)
+    if aggregation == "sum":
+        return sums, counts
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan), counts
+
+
+def _group_median(
+    keys: np.ndarray,
+    values: np.ndarray,
+    counts: np.ndarray,
+) -> np.ndarray:
+    """Median by group, from a single sort by group then value."""
+
+    order = np.lexsort((values, keys))
+    ordered_values = values[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    medians = np.full(len(counts), np.nan)
+    present = counts > 0
+    lower = starts[present] + (counts[present] - 1) // 2
+    upper = starts[present] + counts[present] // 2
+    medians[present] = (ordered_values[lower] + ordered_values[upper]) / 2
+    return medians
+
+
+def histogram(
+    values: np.ndarray,
+    bins: Optional[int] = None,
+    max_bins: int = 20,
+) -> tuple[list[str], np.ndarray]:
+    """
+    Bin labels and counts of the numbers, ignoring NaN.
+
+    Integer answers spanning at most `max_bins` values, such as ratings,
+    get a bin per value. Otherwise `bins` bins, or as many as numpy's `auto`
+    rule suggests, up to `max_bins` either way.
+    """
+
+    numbers = values[~np.isnan(values)]
+    if not numbers.size:
+        return [], np.array([], dtype=np.int64)
+
+    low, high = numbers.min(), numbers.max()
+    if not bins and np.all(numbers == np.round(numbers)) and high - low < max_bins:
+        edges = np.arange(low, high + 2) - 0.5
+        counts, _ = np.histogram(numbers, edges)
+        return [f"{value:g}" for value in np.arange(low, high + 1)], counts
+
+    if not bins:
+        bins = len(np.histogram_bin_edges(numbers, "auto")) - 1
+    # `bins` comes from the LLM, keep it in range
+    counts, edges = np.histogram(numbers, min(max(bins, 1), max_bins))
+    labels = [f"{start:.3g} to {end:.3g}" for start, end in zip(edges[:-1], edges[1:])]
+    return labels, counts
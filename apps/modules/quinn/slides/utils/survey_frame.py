@@ -0,0 +1,367 @@
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Iterator, Literal, Optional, Sequence, overload
+
+import numpy as np
+from fastapi import logger as fastapi_logger
+
+from apps.core.utils.csv_stream import RowDictView
+
+logger = fastapi_logger.logger
+
+ColumnType = Literal["numeric", "categorical", "text", "empty"]
+
+# Code of a missing answer
+MISSING = -1
+
+# Numbers with thousands separators, e.g. "1,000" or "-12,345.5"
+THOUSANDS_NUMBER = re.compile(r"-?\d{1,3}(,\d{3})+(\.\d+)?")
+
+
+def to_float(value: str) -> Optional[float]:
+    """
+    Parse a numeric answer.
+
+    Commas are only read as thousands separators, so multi-select answers
+    like "1,3" and decimal commas like "1,5" aren't numbers. Neither are
+    infinities and NaN.
+    """
+
+    value = value.strip()
+    if THOUSANDS_NUMBER.fullmatch(value):
+        value = value.replace(",", "")
+    elif "," in value or "_" in value:
+        return None
+
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+@dataclass
+class SurveyColumn:
+    """
+    Answers of a survey column, dictionary encoded.
+
+    `codes` holds, per response, the index of its answer in `categories`
+    (distinct answers in order of first appearance), or `MISSING` when the
+    response is blank. Numeric columns also get the number of each category,
+    NaN when it doesn't parse. An optional boolean `mask` hides the answers
+    of some responses, e.g. of dependent questions, without copying `codes`.
+    """
+
+    header: str
+    type: ColumnType
+    codes: np.ndarray
+    categories: list[str]
+    numbers: Optional[np.ndarray] = None
+    mask: Optional[np.ndarray] = None
+    _counts: Optional[np.ndarray] = field(default=None, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def answered(self) -> np.ndarray:
+        """Mask of the responses with an answer."""
+
+        answered = self.codes != MISSING
+        return answered if self.mask is None else answered & self.mask
+
+    def counts(self) -> np.ndarray:
+        """Number of responses per category."""
+
+        if self._counts is None:
+            self._counts = np.bincount(
+                self.codes[self.answered],
+                minlength=len(self.categories),
+            )
+        return self._counts
+
+    def values(self) -> np.ndarray:
+        """Number of each response, NaN when missing or not numeric."""
+
+        if self.numbers is None:
+            return np.full(len(self.codes), np.nan)
+        # The trailing NaN is picked by the `MISSING` (-1) codes
+        values = np.append(self.numbers, np.nan)[self.codes]
+        if self.mask is not None:
+            values[~self.mask] = np.nan
+        return values
+
+    def cell(self, index: int) -> str:
+        """Answer of a response, blank when missing."""
+
+        code = self.codes[index]
+        if code == MISSING or (self.mask is not None and not self.mask[index]):
+            return ""
+        return self.categories[code]
+
+    def cells(self, indexes: Optional[Sequence[int]] = None) -> list[str]:
+        """Answers of the responses, or of the given responses."""
+
+        lookup = np.array([*self.categories, ""], dtype=object)
+        selected = (
+            slice(None) if indexes is None else np.asarray(indexes, dtype=np.intp)
+        )
+        codes = self.codes[selected]
+        if self.mask is not None:
+            codes = np.where(self.mask[selected], codes, MISSING)
+        return lookup[codes].tolist()
+
+    def with_mask(self, mask: np.ndarray) -> "SurveyColumn":
+        """Same column hiding the answers outside of `mask`, sharing the codes."""
+
+        if self.mask is not None:
+            mask = mask & self.mask
+        return SurveyColumn(
+            self.header,
+            self.type,
+            self.codes,
+            self.categories,
+            self.numbers,
+            mask,
+        )
+
+    def with_categories(self, categories: list[str]) -> "SurveyColumn":
+        """Same column with its answers rewritten, e.g. escaped."""
+
+        return SurveyColumn(
+            self.header,
+            self.type,
+            self.codes,
+            categories,
+            self.numbers,
+            self.mask,
+        )
+
+
+class SurveyFrameRows(Sequence[tuple[str, ...]]):
+    """Responses of a frame as tuples, built on access."""
+
+    def __init__(self, columns: Sequence[SurveyColumn], size: int) -> None:
+        self.columns = columns
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    @overload
+    def __getitem__(self, index: int) -> tuple[str, ...]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[tuple[str, ...]]: ...
+
+    def __getitem__(
+        self,
+        index: int | slice,
+    ) -> tuple[str, ...] | list[tuple[str, ...]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.size))]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        return tuple(column.cell(index) for column in self.columns)
+
+    def __iter__(self) -> Iterator[tuple[str, ...]]:
+        cells = [column.cells() for column in self.columns]
+        return iter(zip(*cells)) if cells else iter(() for _ in range(self.size))
+
+
+class SurveyFrame:
+    """
+    Columnar survey responses.
+
+    Built once per request from the parsed rows, every column is dictionary
+    encoded with its type inferred: numeric when almost every answer parses
+    as a number, categorical when it has few distinct answers, free text
+    otherwise. `data` is a lazy view of the responses as dicts, for code
+    still working on rows.
+    """
+
+    def __init__(self, columns: list[SurveyColumn], size: int) -> None:
+        self.columns = columns
+        self.size = size
+        self._by_header = {column.header: column for column in columns}
+
+    @classmethod
+    def from_rows(
+        cls,
+        headers: list[str],
+        rows: Sequence[Sequence[str]],
+        max_categories: int = 30,
+        numeric_ratio: float = 0.9,
+    ) -> "SurveyFrame":
+        """Build a frame from rows of answers in the order of `headers`."""
+
+        columns = [
+            cls._encode(header, column, max_categories, numeric_ratio)
+            for header, column in zip(
+                headers,
+                zip(*rows) if rows else [() for _ in headers],
+            )
+        ]
+        return cls(columns, len(rows))
+
+    @staticmethod
+    def _encode(
+        header: str,
+        values: Sequence[str],
+        max_categories: int,
+        numeric_ratio: float,
+    ) -> SurveyColumn:
+        """Dictionary encode a column and infer its type."""
+
+        index: dict[str, int] = {}
+        codes = np.fromiter(
+            (index.setdefault(value, len(index)) for value in values),
+            dtype=np.int32,
+            count=len(values),
+        )
+
+        # Blank answers are missing, renumber the others
+        categories = [value for value in index if value.strip()]
+        remap = np.full(len(index) + 1, MISSING, dtype=np.int32)
+        remap[[index[value] for value in categories]] = np.arange(len(categories))
+        codes = remap[codes]
+
+        column = SurveyColumn(header, "empty", codes, categories)
+        if not categories:
+            return column
+
+        numbers = np.array(
+            [
+                np.nan if (number := to_float(value)) is None else number
+                for value in categories
+            ],
+        )
+        counts = column.counts()
+        if counts[~np.isnan(numbers)].sum() >= counts.sum() * numeric_ratio:
+            column.type = "numeric"
+            column.numbers = numbers
+        elif len(categories) <= max_categories:
+            column.type = "categorical"
+        else:
+            column.type = "text"
+
+        return column
+
+    @property
+    def headers(self) -> list[str]:
+        """Headers of the columns."""
+
+        return [column.header for column in self.columns]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, header: object) -> bool:
+        return header in self._by_header
+
+    def __getitem__(self, header: str) -> SurveyColumn:
+        return self._by_header[header]
+
+    def get(self, header: Optional[str]) -> Optional[SurveyColumn]:
+        """Column of a header, if any."""
+
+        return self._by_header.get(header) if header else None
+
+    def replace(self, columns: dict[str, SurveyColumn]) -> "SurveyFrame":
+        """Frame with some columns replaced, sharing the others."""
+
+        return SurveyFrame(
+            [columns.get(column.header, column) for column in self.columns],
+            self.size,
+        )
+
+    def with_hierarchy(
+        self,
+        hierarchical_questions: Optional[dict[str, dict[str, str]]] = None,
+    ) -> "SurveyFrame":
+        """
+        Frame answering dependent questions only under their rule.
+
+        A dependent question keeps its answers where the question it depends
+        on has the required value. The answers are masked, not copied, see
+        `compile_hierarchy_masks`.
+        """
+
+        masks = compile_hierarchy_masks(self, hierarchical_questions or {})
+        return self.replace(
+            {header: self[header].with_mask(mask) for header, mask in masks.items()},
+        )
+
+    @property
+    def rows(self) -> SurveyFrameRows:
+        """Responses as tuples in the order of `headers`, built on access."""
+
+        return SurveyFrameRows(self.columns, self.size)
+
+    @property
+    def data(self) -> RowDictView:
+        """Responses as dicts keyed by header, built on access."""
+
+        return RowDictView(self.headers, self.rows)
+
+
+def compile_hierarchy_masks(
+    frame: SurveyFrame,
+    hierarchical_questions: dict[str, dict[str, str]],
+) -> dict[str, np.ndarray]:
+    """
+    Mask of the responses allowed to answer each dependent question.
+
+    A response may answer a dependent question when its answer to the
+    question it depends on equals the rule value (case insensitive), and when
+    that answer is itself allowed, so chains of dependencies resolve whatever
+    the order of the rules. Each mask is computed once, over the distinct
+    answers of the parent then indexed by its codes. Cycles are logged and
+    broken at the question seen twice.
+    """
+
+    rules = {
+        header: rule
+        for header, rule in hierarchical_questions.items()
+        if rule.get("dependsOn") and header in frame
+    }
+    masks: dict[str, np.ndarray] = {}
+    resolving: set[str] = set()
+
+    def resolve(header: str) -> Optional[np.ndarray]:
+        if header in masks or header not in rules:
+            return masks.get(header)
+        if header in resolving:
+            logger.warning(f"Hierarchical questions cycle at {header}")
+            return None
+
+        rule = rules[header]
+        resolving.add(header)
+        parent_mask = resolve(rule["dependsOn"])
+        resolving.discard(header)
+
+        # Missing answers compare as blank
+        required_value = str(rule.get("value", "")).lower()
+        parent = frame.get(rule["dependsOn"])
+        if parent is None:
+            mask = np.full(len(frame), required_value == "")
+        else:
+            matches = np.array(
+                [value.lower() == required_value for value in parent.categories]
+                + [required_value == ""],
+                dtype=bool,
+            )
+            mask = matches[parent.codes]
+            if parent_mask is not None:
+                mask = np.where(parent_mask, mask, required_value == "")
+
+        masks[header] = mask
+        return mask
+
+    for header in rules:
+        resolve(header)
+
+    return masks
@@ -0,0 +1,240 @@
+import random
+from typing import Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+from apps.modules.quinn.slides.utils.survey_frame import (
+    MISSING,
+    ColumnType,
+    SurveyColumn,
+    SurveyFrame,
+)
+
+
+class NumericSummary(BaseModel):
+    """Numeric summary of a column."""
+
+    min: float
+    max: float
+    mean: float
+    median: float
+    std: float
+
+
+class ColumnProfile(BaseModel):
+    """Profile of a survey column."""
+
+    header: str
+    type: ColumnType
+    answers: int
+    cardinality: int
+    value_counts: list[tuple[str, int]]
+    numeric: Optional[NumericSummary] = None
+
+
+class CrossTab(BaseModel):
+    """Answers of a dependent question by answer of the question it depends on."""
+
+    header: str
+    depends_on: str
+    counts: dict[str, list[tuple[str, int]]]
+
+
+def _most_common(
+    categories: list[str],
+    counts: np.ndarray,
+    top: int,
+) -> list[tuple[str, int]]:
+    """Most common answers, ties in order of first appearance."""
+
+    order = np.argsort(-counts, kind="stable")[:top]
+    return [(categories[i], int(counts[i])) for i in order if counts[i]]
+
+
+class SurveyProfiler:
+    """
+    Compute per-column statistics of a survey.
+
+    Column types are the ones inferred by the `SurveyFrame`.
+    """
+
+    def __init__(self, top_values: int = 10, max_categories: int = 30) -> None:
+        self.top_values = top_values
+        self.max_categories = max_categories
+
+    def profile_column(self, column: SurveyColumn) -> ColumnProfile:
+        """Profile the answers of a column."""
+
+        counts = column.counts()
+        profile = ColumnProfile(
+            header=column.header,
+            type=column.type,
+            answers=int(counts.sum()),
+            cardinality=len(column.categories),
+            value_counts=_most_common(column.categories, counts, self.top_values),
+        )
+
+        values = column.values()
+        numbers = values[~np.isnan(values)]
+        if column.type == "numeric" and numbers.size:
+            profile.numeric = NumericSummary(
+                min=float(numbers.min()),
+                max=float(numbers.max()),
+                mean=round(float(numbers.mean()), 3),
+                median=float(np.median(numbers)),
+                std=round(float(numbers.std()), 3),
+            )
+            # Value counts of a continuous column say nothing the summary does not
+            if len(column.categories) > self.max_categories:
+                profile.value_counts = []
+
+        return profile
+
+    def profile(self, frame: SurveyFrame) -> list[ColumnProfile]:
+        """Profile every column."""
+
+        return [self.profile_column(column) for column in frame.columns]
+
+    def cross_tabs(
+        self,
+        frame: SurveyFrame,
+        hierarchical_questions: dict[str, dict[str, str]],
+    ) -> list[CrossTab]:
+        """Cross-tab each dependent question by the question it depends on."""
+
+        cross_tabs = []
+        for header, rule in hierarchical_questions.items():
+            depends_on = rule.get("dependsOn")
+            if not depends_on:
+                continue
+
+            parent = frame.get(depends_on)
+            child = frame.get(header)
+            parent_codes = parent.codes if parent else np.full(len(frame), MISSING)
+            child_codes = child.codes if child else np.full(len(frame), MISSING)
+            parent_categories = [*(parent.categories if parent else []), "(empty)"]
+            child_categories = [*(child.categories if child else []), "(empty)"]
+
+            # Missing answers (-1) become the last `(empty)` category
+            width = len(child_categories)
+            table = np.bincount(
+                (parent_codes % len(parent_categories)) * width + child_codes % width,
+                minlength=len(parent_categories) * width,
+            ).reshape(len(parent_categories), width)
+
+            counts = {
+                parent_categories[i]: _most_common(
+                    child_categories,
+                    table[i],
+                    self.top_values,
+                )
+                for i in range(len(parent_categories))
+                if table[i].any()
+            }
+            cross_tabs.append(
+                CrossTab(
+                    header=header,
+                    depends_on=depends_on,
+                    counts=dict(sorted(counts.items())),
+                ),
+            )
+
+        return cross_tabs
+
+
+def get_strata_column(
+    profiles: list[ColumnProfile],
+    max_strata: int = 12,
+) -> Optional[str]:
+    """Categorical column with the most strata, up to `max_strata`, to sample by."""
+
+    candidates = [
+        profile
+        for profile in profiles
+        if profile.type == "categorical" and 1 < profile.cardinality <= max_strata
+    ]
+    if not candidates:
+        return None
+    return max(
+        candidates,
+        key=lambda profile: (profile.cardinality, profile.answers),
+    ).header
+
+
+def stratified_sample(
+    frame: SurveyFrame,
+    size: int,
+    strata_column: Optional[str] = None,
+    seed: int = 0,
+) -> list[int]:
+    """
+    Indexes of a deterministic, stratified sample of `size` responses.
+
+    Strata are sampled in proportion to their size, every stratum keeps at
+    least one response, indexes are sorted.
+    """
+
+    if size >= len(frame):
+        return list(range(len(frame)))
+
+    rng = random.Random(seed)  # noqa: S311
+    codes = (
+        frame[strata_column].codes
+        if strata_column
+        else np.zeros(len(frame), dtype=np.int32)
+    )
+    keys, first_indexes = np.unique(codes, return_index=True)
+
+    picked: list[int] = []
+    for key in keys[np.argsort(first_indexes)]:
+        indexes = np.flatnonzero(codes == key).tolist()
+        quota = max(round(size * len(indexes) / len(frame)), 1)
+        picked.extend(rng.sample(indexes, min(quota, len(indexes))))
+
+    # Rounding can overshoot, drop from the picked responses at random
+    if len(picked) > size:
+        picked = rng.sample(picked, size)
+
+    return sorted(picked)
+
+
+def format_profiles(
+    profiles: list[ColumnProfile],
+    cross_tabs: list[CrossTab],
+    header_to_alias: dict[str, str],
+) -> str:
+    """Compact text of the profiles, using the column aliases."""
+
+    def pairs(counts: list[tuple[str, int]]) -> str:
+        return "; ".join(f"{value}={count}" for value, count in counts)
+
+    lines = []
+    for profile in profiles:
+        name = header_to_alias.get(profile.header, profile.header)
+        line = (
+            f"{name} ({profile.type}, {profile.answers} answers, "
+            f"{profile.cardinality} distinct)"
+        )
+        if profile.numeric:
+            summary = profile.numeric
+            line += (
+                f" min={summary.min:g} max={summary.max:g} mean={summary.mean:g} "
+                f"median={summary.median:g} std={summary.std:g}"
+            )
+        if profile.value_counts:
+            label = (
+                "top" if profile.cardinality > len(profile.value_counts) else "counts"
+            )
+            line += f" {label}: {pairs(profile.value_counts)}"
+        lines.append(line)
+
+    for cross_tab in cross_tabs:
+        name = header_to_alias.get(cross_tab.header, cross_tab.header)
+        depends_on = header_to_alias.get(cross_tab.depends_on, cross_tab.depends_on)
+        lines.append(f"{name} by {depends_on}:")
+        lines.extend(
+            f"  {key}: {pairs(counts)}" for key, counts in cross_tab.counts.items()
+        )
+
+    return "\n".join(lines)
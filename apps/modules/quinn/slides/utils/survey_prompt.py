@@ -0,0 +1,379 @@
+import csv
+import io
+import re
+from typing import Literal, Mapping, Optional, Sequence
+
+from pydantic import BaseModel
+
+from apps.modules.quinn.slides.schemas.survey_data_analysis_schema import (
+    Slide,
+    Slideshow,
+)
+from apps.modules.quinn.slides.utils.survey_frame import SurveyColumn, SurveyFrame
+from apps.modules.quinn.slides.utils.survey_profile import (
+    SurveyProfiler,
+    format_profiles,
+    get_strata_column,
+    stratified_sample,
+)
+
+# Rough average for English text with OpenAI tokenizers, good enough to compare prompts
+CHARS_PER_TOKEN = 4
+
+# Header aliases (`Q1`) and answer codes (`A1`) left in the text of a slideshow
+ALIAS_OR_CODE = re.compile(r"\b[QA]\d+\b")
+
+# Text fields of a slideshow that end up in the deck
+TEXT_FIELDS_NOTE = (
+    "In every text field (slide `title`, `bullet_points`, `description`, chart "
+    "`title` and axis `label`), write the real question headers and answers, "
+    "never the column aliases or answer codes."
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text."""
+
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+class SurveyPrompt(BaseModel):
+    """Survey data serialized for the LLM prompt."""
+
+    content: str
+    aliases: dict[str, str]
+    codes: dict[str, dict[str, str]] = {}
+    estimated_tokens: int
+
+
+class SurveyPromptSerializer:
+    """
+    Serialize survey data as a compact table for the LLM prompt.
+
+    Headers are sent once, as short aliases (`Q1`, `Q2`...) with a legend,
+    followed by CSV or TSV rows. Columns whose answers repeat a lot can be
+    dictionary encoded, answers are then replaced by codes (`A1`, `A2`...)
+    listed once per column. Aliases and codes used in the `Slideshow` output
+    are mapped back to the real headers and answers with `restore_slideshow`.
+
+    Above `profile_row_threshold` rows, column profiles computed over every
+    row are sent with a stratified sample of `sample_size` rows instead of the
+    full data, so the prompt size stops growing with the number of responses.
+    """
+
+    def __init__(
+        self,
+        delimiter: Literal["csv", "tsv"] = "csv",
+        header_aliases: bool = True,
+        dictionary_encoding: bool = True,
+        profile_row_threshold: Optional[int] = None,
+        sample_size: int = 200,
+        seed: int = 0,
+    ) -> None:
+        self.delimiter = "\t" if delimiter == "tsv" else ","
+        self.format_name = delimiter.upper()
+        self.header_aliases = header_aliases
+        self.dictionary_encoding = dictionary_encoding
+        self.profile_row_threshold = profile_row_threshold
+        self.sample_size = sample_size
+        self.seed = seed
+
+    def serialize(
+        self,
+        frame: SurveyFrame,
+        hierarchical_questions: Optional[dict[str, dict[str, str]]] = None,
+    ) -> SurveyPrompt:
+        """Serialize the survey responses."""
+
+        headers = frame.headers
+        aliases = (
+            {f"Q{i + 1}": header for i, header in enumerate(headers)}
+            if self.header_aliases
+            else {header: header for header in headers}
+        )
+        header_to_alias = {header: alias for alias, header in aliases.items()}
+
+        indexes: Optional[list[int]] = None
+        profile_section = None
+        if (
+            self.profile_row_threshold is not None
+            and len(frame) > self.profile_row_threshold
+        ):
+            profiler = SurveyProfiler()
+            profiles = profiler.profile(frame)
+            cross_tabs = profiler.cross_tabs(frame, hierarchical_questions or {})
+            strata_column = get_strata_column(profiles)
+            indexes = stratified_sample(
+                frame,
+                self.sample_size,
+                strata_column,
+                self.seed,
+            )
+
+            sampled_by = (
+                f" stratified by {header_to_alias[strata_column]}"
+                if strata_column
+                else ""
+            )
+            profile_section = (
+                f"`survey_profile` (statistics over all {len(frame)} responses, "
+                f"`survey_response_data` is a sample of {len(indexes)} rows{sampled_by}; "
+                "base numbers and percentages on the profile):\n"
+                + format_profiles(profiles, cross_tabs, header_to_alias)
+            )
+
+        columns = [self._cells(column, indexes) for column in frame.columns]
+        row_count = len(frame) if indexes is None else len(indexes)
+        codes = (
+            {
+                header: code_map
+                for header, column in zip(headers, columns)
+                if (code_map := self._get_codes(column))
+            }
+            if self.dictionary_encoding
+            else {}
+        )
+
+        sections = []
+        if self.header_aliases:
+            legend = "\n".join(
+                f"{alias}: {header}" for alias, header in aliases.items()
+            )
+            sections.append(f"`survey_header_columns` (alias: header):\n{legend}")
+        else:
+            sections.append(f"`survey_header_columns`:\n{headers}")
+
+        if codes:
+            legend = "\n".join(
+                f"{header_to_alias[header]}: "
+                + "; ".join(f"{code}={value}" for value, code in code_map.items())
+                for header, code_map in codes.items()
+            )
+            sections.append(f"`answer_codes` (column: code=answer):\n{legend}")
+
+        if hierarchical_questions:
+            structure = {
+                header_to_alias.get(question, question): {
+                    **rule,
+                    "dependsOn": header_to_alias.get(
+                        rule.get("dependsOn", ""),
+                        rule.get("dependsOn", ""),
+                    ),
+                }
+                for question, rule in hierarchical_questions.items()
+            }
+            sections.append(f"`hierarchical_question_structure`:\n{structure}")
+
+        if profile_section:
+            sections.append(profile_section)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=self.delimiter, lineterminator="\n")
+        writer.writerow(header_to_alias[header] for header in headers)
+        for i in range(row_count):
+            writer.writerow(
+                (
+                    codes[header].get(column[i], column[i])
+                    if header in codes
+                    else column[i]
+                )
+                for header, column in zip(headers, columns)
+            )
+
+        notes = [self.format_name]
+        if self.header_aliases:
+            notes.append("the header row uses the aliases")
+        if codes:
+            notes.append("coded answers are listed in `answer_codes`")
+        sections.append(
+            f"`survey_response_data` ({'; '.join(notes)}):\n{buffer.getvalue()}",
+        )
+        instructions = self._get_instructions(bool(codes))
+        if instructions:
+            sections.append(instructions)
+
+        content = "\n\n".join(sections)
+
+        return SurveyPrompt(
+            content=content,
+            aliases=aliases,
+            codes={
+                header: {code: value for value, code in code_map.items()}
+                for header, code_map in codes.items()
+            },
+            estimated_tokens=estimate_tokens(content),
+        )
+
+    @staticmethod
+    def restore_slideshow(
+        slideshow: Slideshow,
+        aliases: dict[str, str],
+        codes: Optional[dict[str, dict[str, str]]] = None,
+    ) -> Slideshow:
+        """
+        Map the aliases and codes of a slideshow back to the headers and answers.
+
+        Chart `header_column`s are aliases. Aliases and codes left in the text
+        fields are replaced too, a code by the answer of the chart's columns
+        first, else only when it means the same answer in every column.
+        """
+
+        codes = codes or {}
+        for slide in slideshow.slides:
+            columns = []
+            if slide.chart:
+                data = slide.chart.data
+                for axis in (data.x, data.y, data.values, data.series):
+                    if axis and axis.header_column in aliases:
+                        axis.header_column = aliases[axis.header_column]
+                    if axis:
+                        columns.append(axis.header_column)
+
+            _restore_slide_text(slide, {**_get_code_answers(codes, columns), **aliases})
+
+        return slideshow
+
+    def _get_instructions(self, has_codes: bool) -> str:
+        """How the LLM should refer to the aliased columns and coded answers."""
+
+        instructions = []
+        if self.header_aliases:
+            instructions.append(
+                "Use the column aliases (e.g. `Q1`) for every `header_column`.",
+            )
+        if self.header_aliases or has_codes:
+            instructions.append(TEXT_FIELDS_NOTE)
+        return " ".join(instructions)
+
+    def _cells(self, column: SurveyColumn, indexes: Optional[list[int]]) -> list[str]:
+        """Single line text of the answers of a column, or of the given responses."""
+
+        answers = [self._cell(category) for category in column.categories]
+        return column.with_categories(answers).cells(indexes)
+
+    def _cell(self, value: str) -> str:
+        """Single line text of an answer."""
+
+        if self.delimiter == "\t":
+            value = value.replace("\t", " ")
+        return " ".join(value.splitlines())
+
+    @staticmethod
+    def _get_codes(column: list[str]) -> dict[str, str]:
+        """
+        Codes of a column's answers, if encoding makes the table smaller.
+
+        The saving on the rows has to pay for the legend. Codes are prefixed
+        so they can't be read as answers, e.g. an NPS score of 1.
+        """
+
+        counts: dict[str, int] = {}
+        for value in column:
+            if value:
+                counts[value] = counts.get(value, 0) + 1
+
+        if not counts or len(counts) * 2 > len(column):
+            return {}
+
+        code_map = {
+            value: f"A{i + 1}"
+            for i, (value, _) in enumerate(
+                sorted(counts.items(), key=lambda item: item[1], reverse=True),
+            )
+        }
+        saved = sum(
+            (len(value) - len(code_map[value])) * count
+            for value, count in counts.items()
+        )
+        legend = sum(len(value) + len(code) + 2 for value, code in code_map.items())
+
+        return code_map if saved > legend else {}
+
+
+def _get_code_answers(
+    codes: dict[str, dict[str, str]],
+    columns: list[str],
+) -> dict[str, str]:
+    """Answer of each code, from the first of `columns` using it, else if unambiguous."""
+
+    answers: dict[str, set[str]] = {}
+    for code_map in codes.values():
+        for code, answer in code_map.items():
+            answers.setdefault(code, set()).add(answer)
+
+    code_answers = {
+        code: next(iter(code_answers))
+        for code, code_answers in answers.items()
+        if len(code_answers) == 1
+    }
+    for column in reversed(columns):
+        code_answers.update(codes.get(column, {}))
+    return code_answers
+
+
+def _restore_text(text: str, tokens: dict[str, str]) -> str:
+    """Replace the aliases and codes of a text by their header or answer."""
+
+    return ALIAS_OR_CODE.sub(lambda match: tokens.get(match[0], match[0]), text)
+
+
+def _restore_slide_text(slide: Slide, tokens: dict[str, str]) -> None:
+    """Replace the aliases and codes of the text fields of a slide."""
+
+    slide.title = _restore_text(slide.title, tokens)
+    if slide.bullet_points:
+        slide.bullet_points = [
+            _restore_text(bullet_point, tokens) for bullet_point in slide.bullet_points
+        ]
+    if slide.description:
+        slide.description = _restore_text(slide.description, tokens)
+    if slide.chart:
+        slide.chart.title = _restore_text(slide.chart.title, tokens)
+        data = slide.chart.data
+        for axis in (data.x, data.y, data.series):
+            if axis:
+                axis.label = _restore_text(axis.label, tokens)
+
+
+def get_repr_prompt(
+    headers: list[str],
+    rows: Sequence[Mapping[str, str]],
+    hierarchical_questions: Optional[dict[str, dict[str, str]]] = None,
+) -> str:
+    """Survey data as the `repr` of the rows, as sent before the compact table."""
+
+    return f"""
+        `survey_response_data`:
+        {rows}
+
+        `hierarchical_question_structure`:
+        {hierarchical_questions or ''}
+
+        `survey_header_columns`:
+        {headers}
+    """
+
+
+def estimate_repr_tokens(
+    frame: SurveyFrame,
+    hierarchical_questions: Optional[dict[str, dict[str, str]]] = None,
+) -> int:
+    """
+    Estimate the tokens of `get_repr_prompt` without building it.
+
+    The length of the rows `repr` is computed from the answer counts.
+    """
+
+    template = get_repr_prompt(frame.headers, [], hierarchical_questions)
+    # `{'header': 'answer', ...}` with `, ` between rows
+    row_length = 2 + sum(len(repr(header)) + 4 for header in frame.headers) - 2
+    rows_length = len(frame) * (row_length + 2) - 2 if len(frame) else 0
+    for column in frame.columns:
+        counts = column.counts()
+        rows_length += sum(
+            len(repr(answer)) * int(count)
+            for answer, count in zip(column.categories, counts)
+        )
+        rows_length += (len(frame) - int(counts.sum())) * len(repr(""))
+
+    return -(-(len(template) + rows_length) // CHARS_PER_TOKEN)
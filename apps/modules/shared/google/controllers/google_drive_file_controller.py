@@ -1,9 +1,20 @@
-from typing import Any
+import asyncio
+import queue
+from typing import Any, Optional
 
+from fastapi import logger as fastapi_logger
+
+from apps.core.config import settings
+from apps.core.infra.google_api.api_executor import google_api
+from apps.core.infra.google_api.client_manager import google_clients
+from apps.core.infra.google_api.drive_file_cache import drive_file_cache
 from apps.core.utils.google import (
+    DriveChunkDownloader,
     GoogleDriveFileContentDict,
-    get_google_drive_file_content_dict,
+    get_google_drive_media_request,
+    parse_csv_content,
 )
+from apps.core.utils.metrics import transfers
 from apps.modules.shared.google.services.copy_google_drive_file_service import (
     CopyGoogleDriveFileService,
 )
@@ -14,6 +25,8 @@ from apps.modules.shared.google.services.update_google_drive_file_service import
     UpdateGoogleDriveFileService,
 )
 
+logger = fastapi_logger.logger
+
 
 class GoogleDriveFileController:
     """Google Drive File Controller."""
@@ -23,11 +36,78 @@ class GoogleDriveFileController:
         file_id: str,
         show_google_drive_file_service: ShowGoogleDriveFileService,
     ) -> GoogleDriveFileContentDict:
-        """Show Google Drive file."""
+        """
+        Show Google Drive file.
+
+        Unchanged files are served from the on-disk cache without downloading
+        them again.
+        """
 
         file = await show_google_drive_file_service.execute(file_id)
 
-        return get_google_drive_file_content_dict(file)
+        if settings.google_drive_cache_enabled:
+            try:
+                cached = await asyncio.to_thread(drive_file_cache.get, file)
+            except OSError as err:
+                logger.warning(f"Error reading Drive cache: {err}")
+                cached = None
+            if cached is not None:
+                logger.debug(f"Drive file {file_id} served from cache")
+                return cached
+
+        content = await self._download(file)
+
+        if settings.google_drive_cache_enabled:
+            try:
+                await asyncio.to_thread(drive_file_cache.set, file, content)
+            except OSError as err:
+                logger.warning(f"Error writing Drive cache: {err}")
+
+        return content
+
+    async def _download(self, file: dict[str, str]) -> GoogleDriveFileContentDict:
+        """
+        Download and parse a Google Drive file.
+
+        Only the chunk requests run on the Google executor, each one bounded
+        by its timeout and retried. The chunks are decoded and parsed by a
+        worker thread as they arrive.
+        """
+
+        file_id = file.get("id", "")
+        downloader = DriveChunkDownloader(
+            get_google_drive_media_request(
+                file,
+                google_clients.drive,
+                google_clients.http("drive"),
+            ),
+            f"drive:{file_id}",
+        )
+        chunks: queue.SimpleQueue[Optional[bytes]] = queue.SimpleQueue()
+        parsing = asyncio.ensure_future(
+            asyncio.to_thread(parse_csv_content, iter(chunks.get, None)),
+        )
+
+        try:
+            with transfers.track("drive") as progress:
+                while not downloader.done:
+                    for chunk in await google_api.run(
+                        "drive",
+                        downloader.next_chunk,
+                        f"Download of {file_id}",
+                    ):
+                        progress.add(len(chunk))
+                        chunks.put(chunk)
+                    progress.total_bytes = downloader.total_size
+                downloader.log_done(progress)
+        except BaseException:
+            # Let the parser stop on what it got, its result is discarded
+            chunks.put(None)
+            await asyncio.gather(parsing, return_exceptions=True)
+            raise
+
+        chunks.put(None)
+        return await parsing
 
     async def copy(
         self,
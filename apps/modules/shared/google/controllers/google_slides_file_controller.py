@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 
 from apps.modules.shared.google.services.show_google_slides_file_service import (
     ShowGoogleSlidesFileService,
@@ -15,10 +15,11 @@ class GoogleSlidesFileController:
         self,
         presentation_id: str,
         show_google_slides_file_service: ShowGoogleSlidesFileService,
+        fields: Optional[str] = None,
     ) -> dict[str, Any]:
         """Show Google Slides file."""
 
-        return await show_google_slides_file_service.execute(presentation_id)
+        return await show_google_slides_file_service.execute(presentation_id, fields)
 
     async def update(
         self,
@@ -3,7 +3,8 @@ from typing import Any
 from fastapi import HTTPException
 from fastapi import logger as fastapi_logger
 
-from apps.core.config import settings
+from apps.core.infra.google_api.api_executor import google_api
+from apps.core.infra.google_api.client_manager import google_clients
 
 logger = fastapi_logger.logger
 
@@ -20,16 +21,16 @@ class CopyGoogleDriveFileService:
     ) -> dict[str, Any]:
         """Copy Google Drive file."""
 
-        google_drive_service = settings.google_drive_service
+        google_drive_service = google_clients.drive
 
         try:
-            return (
-                google_drive_service.files()
-                .copy(
+            return await google_api.execute(
+                "drive",
+                google_drive_service.files().copy(
                     fileId=file_id,
                     supportsAllDrives=True,
-                )
-                .execute()
+                ),
+                retry=False,
             )
         except Exception as err:
             logger.error(err)
@@ -1,7 +1,9 @@
 from fastapi import HTTPException
 from fastapi import logger as fastapi_logger
 
-from apps.core.config import settings
+from apps.core.infra.google_api.api_executor import google_api
+from apps.core.infra.google_api.client_manager import google_clients
+from apps.core.infra.google_api.drive_file_cache import DRIVE_FILE_FIELDS
 
 logger = fastapi_logger.logger
 
@@ -16,18 +18,23 @@ class ShowGoogleDriveFileService:
         self,
         file_id: str,
     ) -> dict[str, str]:
-        """Execute the Show Google Drive File Service."""
+        """
+        Execute the Show Google Drive File Service.
 
-        google_drive_service = settings.google_drive_service
+        Only the metadata needed to download the file and to validate the
+        cache is requested.
+        """
+
+        google_drive_service = google_clients.drive
 
         try:
-            return (
-                google_drive_service.files()
-                .get(
+            return await google_api.execute(
+                "drive",
+                google_drive_service.files().get(
                     fileId=file_id,
+                    fields=DRIVE_FILE_FIELDS,
                     supportsAllDrives=True,
-                )
-                .execute()
+                ),
             )
         except Exception as err:
             logger.error(err)
@@ -1,9 +1,10 @@
-from typing import Any
+from typing import Any, Optional
 
 from fastapi import HTTPException
 from fastapi import logger as fastapi_logger
 
-from apps.core.config import settings
+from apps.core.infra.google_api.api_executor import google_api
+from apps.core.infra.google_api.client_manager import google_clients
 
 logger = fastapi_logger.logger
 
@@ -17,18 +18,23 @@ class ShowGoogleSlidesFileService:
     async def execute(
         self,
         presentation_id: str,
+        fields: Optional[str] = None,
     ) -> dict[str, Any]:
-        """Execute the Show Google Slides File Service."""
+        """
+        Execute the Show Google Slides File Service.
 
-        google_slides_service = settings.google_slides_service
+        `fields` limits the response to some fields, e.g. the layouts.
+        """
+
+        google_slides_service = google_clients.slides
 
         try:
-            return (
-                google_slides_service.presentations()
-                .get(
+            return await google_api.execute(
+                "slides",
+                google_slides_service.presentations().get(
                     presentationId=presentation_id,
-                )
-                .execute()
+                    **({"fields": fields} if fields else {}),
+                ),
             )
         except Exception as err:
             logger.error(err)
@@ -3,7 +3,8 @@ from typing import Any
 from fastapi import HTTPException
 from fastapi import logger as fastapi_logger
 
-from apps.core.config import settings
+from apps.core.infra.google_api.api_executor import google_api
+from apps.core.infra.google_api.client_manager import google_clients
 
 logger = fastapi_logger.logger
 
@@ -21,16 +22,15 @@ class UpdateGoogleDriveFileService:
     ) -> dict[str, Any]:
         """Update Google Drive file."""
 
-        google_drive_service = settings.google_drive_service
+        google_drive_service = google_clients.drive
 
         try:
-            return (
-                google_drive_service.files()
-                .update(
+            return await google_api.execute(
+                "drive",
+                google_drive_service.files().update(
                     fileId=file_id,
                     body=body,
-                )
-                .execute()
+                ),
             )
         except Exception as err:
             logger.error(err)
@@ -3,7 +3,8 @@ from typing import Any
 from fastapi import HTTPException
 from fastapi import logger as fastapi_logger
 
-from apps.core.config import settings
+from apps.core.infra.google_api.api_executor import google_api
+from apps.core.infra.google_api.client_manager import google_clients
 
 logger = fastapi_logger.logger
 
@@ -21,16 +22,16 @@ class UpdateGoogleSlidesFileService:
     ) -> dict[str, Any]:
         """Execute the Update Google Slides File Service."""
 
-        google_slides_service = settings.google_slides_service
+        google_slides_service = google_clients.slides
 
         try:
-            return (
-                google_slides_service.presentations()
-                .batchUpdate(
+            return await google_api.execute(
+                "slides",
+                google_slides_service.presentations().batchUpdate(
                     presentationId=presentation_id,
                     body=body,
-                )
-                .execute()
+                ),
+                retry=False,
             )
         except Exception as err:
             logger.error(err)
@@ -0,0 +1,20 @@
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import Index, Integer, String
+from sqlalchemy.orm import mapped_column
+
+from apps.core.infra.sql_alchemy.base import BaseModel
+
+
+class EmbeddingCacheModel(BaseModel):
+    """Embedding cache model."""
+
+    __tablename__ = "embedding_cache"
+
+    model = mapped_column(String, primary_key=True)
+    # 0 means the model's default dimensions
+    dimensions = mapped_column(Integer, primary_key=True)
+    # SHA-256 of the embedded text
+    text_hash = mapped_column(String(64), primary_key=True)
+    embedding = mapped_column(Vector(), nullable=False)
+
+    __table_args__ = (Index("ix_embedding_cache_created_at", "created_at"),)
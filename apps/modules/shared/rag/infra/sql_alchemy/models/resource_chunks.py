@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING
 
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import UUID, ForeignKey, Identity, Integer, String
+from sqlalchemy import UUID, ForeignKey, Identity, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -31,9 +31,20 @@ class ResourceChunkModel(BaseModel):
         nullable=False,
     )
     text = mapped_column(String, nullable=False)
+    # SHA-256 of the normalized text, used to reuse embeddings on re-ingest
+    content_hash = mapped_column(String(64), nullable=True)
     chunk_index = mapped_column(Integer, Identity(start=0), nullable=False)
     embedding = mapped_column(Vector(N_DIM), nullable=False)
     resource: Mapped["ResourceModel"] = relationship(
         "ResourceModel",
         back_populates="chunks",
     )
+
+    # The HNSW index on `embedding` is built by migration 128375abdb14
+    __table_args__ = (
+        Index(
+            "ix_resource_chunks_resource_id_content_hash",
+            "resource_id",
+            "content_hash",
+        ),
+    )
@@ -24,6 +24,8 @@ class ResourceModel(BaseModel):
     )
     name = mapped_column(String, nullable=False)
     content = mapped_column(String, nullable=False)
+    # SHA-256 of the normalized content, used to skip unchanged resources
+    content_hash = mapped_column(String(64), nullable=True)
     chunks: Mapped[List["ResourceChunkModel"]] = relationship(
         "ResourceChunkModel",
         back_populates="resource",
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, cast
+
+from sqlalchemy import CursorResult, delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.core.providers.embedding_provider.repository_interfaces.embedding_cache_repository_interface import (
+    IEmbeddingCacheRepository,
+)
+from apps.modules.shared.rag.infra.sql_alchemy.models.embedding_cache import (
+    EmbeddingCacheModel,
+)
+
+
+class EmbeddingCacheRepository(IEmbeddingCacheRepository):
+    """Embedding cache repository."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get_many(
+        self,
+        model: str,
+        dimensions: int,
+        text_hashes: List[str],
+    ) -> dict[str, list[float]]:
+        """Get cached embeddings by text hash."""
+
+        if not text_hashes:
+            return {}
+
+        result = await self.db.execute(
+            select(EmbeddingCacheModel.text_hash, EmbeddingCacheModel.embedding).where(
+                EmbeddingCacheModel.model == model,
+                EmbeddingCacheModel.dimensions == dimensions,
+                EmbeddingCacheModel.text_hash.in_(text_hashes),
+            ),
+        )
+        return {row.text_hash: row.embedding.tolist() for row in result}
+
+    async def set_many(
+        self,
+        model: str,
+        dimensions: int,
+        embeddings: dict[str, list[float]],
+    ) -> None:
+        """
+        Store embeddings by text hash, keeping existing entries.
+
+        The insert runs in a savepoint of the caller's transaction, which is
+        left to the caller to commit.
+        """
+
+        if not embeddings:
+            return
+
+        async with self.db.begin_nested():
+            await self.db.execute(
+                insert(EmbeddingCacheModel).on_conflict_do_nothing(),
+                [
+                    {
+                        "model": model,
+                        "dimensions": dimensions,
+                        "text_hash": text_hash,
+                        "embedding": embedding,
+                    }
+                    for text_hash, embedding in embeddings.items()
+                ],
+            )
+
+    async def evict(self, max_age: timedelta, max_rows: int) -> int:
+        """Evict entries older than `max_age` or beyond the newest `max_rows`."""
+
+        cutoff = datetime.now(timezone.utc) - max_age
+
+        size_cutoff = await self.db.scalar(
+            select(EmbeddingCacheModel.created_at)
+            .order_by(EmbeddingCacheModel.created_at.desc())
+            .offset(max_rows)
+            .limit(1),
+        )
+        if size_cutoff and size_cutoff > cutoff:
+            cutoff = size_cutoff
+
+        result = await self.db.execute(
+            delete(EmbeddingCacheModel).where(EmbeddingCacheModel.created_at <= cutoff),
+        )
+        await self.db.commit()
+
+        return cast(CursorResult[Any], result).rowcount
@@ -1,8 +1,12 @@
-from typing import List, Optional
+from typing import Any, List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from apps.core.config import settings
+from apps.core.providers.embedding_provider.repository_interfaces.embedding_cache_repository_interface import (
+    IEmbeddingCacheRepository,
+)
 from apps.core.utils.files import text_to_vector
 from apps.modules.shared.rag.infra.sql_alchemy.models.resource_chunks import (
     ResourceChunkModel,
@@ -21,8 +25,13 @@ class ResourceChunksRepository(
 ):
     """Resource chunks repository."""
 
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(
+        self,
+        db: AsyncSession,
+        embedding_cache_repository: Optional[IEmbeddingCacheRepository] = None,
+    ) -> None:
         self.db = db
+        self.embedding_cache_repository = embedding_cache_repository
 
     async def batch_create(
         self,
@@ -32,27 +41,47 @@ class ResourceChunksRepository(
 
         self.db.add_all(resource_chunks)
 
+    async def batch_delete(
+        self,
+        resource_chunks: List[ResourceChunkModel],
+    ) -> None:
+        """Batch delete resource chunks."""
+
+        for resource_chunk in resource_chunks:
+            await self.db.delete(resource_chunk)
+
     async def search_by_embedding(
         self,
         query: str,
         top_k: int = 5,
         resource_names: Optional[List[str]] = None,
+        ef_search: Optional[int] = None,
     ) -> List[ResourceChunkSearchResponse]:
-        """Search resource chunks by embedding similarity."""
+        """
+        Search resource chunks by embedding similarity.
 
-        vector = text_to_vector(query)
-        distance_expression = ResourceChunkModel.embedding.l2_distance(vector).label(
-            "distance",
-        )
+        `ef_search` trades recall for speed for this query only, it defaults
+        to the value in settings. The index returns at most `ef_search`
+        candidates before `resource_names` filters them, so filtered searches
+        default to a larger candidate list.
+        """
+
+        vector = await text_to_vector(query, self.embedding_cache_repository)
+        if self.embedding_cache_repository:
+            # Keep the query embedding cached, searches have nothing else to commit
+            await self.db.commit()
+        await self._set_index_search_options(top_k, ef_search, bool(resource_names))
+
+        distance_expression = self._distance_expression(vector)
         stmt = (
             select(
                 ResourceChunkModel.text,
                 ResourceChunkModel.chunk_index,
                 ResourceModel.name,
-                distance_expression,
+                distance_expression.label("distance"),
             )
             .join(ResourceModel, ResourceChunkModel.resource_id == ResourceModel.id)
-            .order_by("distance")
+            .order_by(distance_expression)
             .limit(top_k)
         )
 
@@ -70,3 +99,32 @@ class ResourceChunksRepository(
             )
             for row in results
         ]
+
+    def _distance_expression(self, vector: List[float]) -> ColumnElement[Any]:
+        """L2 distance, matching the operator class of the embedding index."""
+
+        return ResourceChunkModel.embedding.l2_distance(vector)
+
+    async def _set_index_search_options(
+        self,
+        top_k: int,
+        ef_search: Optional[int],
+        filtered: bool,
+    ) -> None:
+        """Set the HNSW search options for the current transaction."""
+
+        default_ef_search = (
+            settings.rag_hnsw_filtered_ef_search
+            if filtered
+            else settings.rag_hnsw_ef_search
+        )
+        # HNSW can't return more rows than its candidate list
+        options = {"hnsw.ef_search": str(max(ef_search or default_ef_search, top_k))}
+        if filtered and settings.rag_hnsw_iterative_scan:
+            # Keep scanning the index until enough rows pass the filter
+            options["hnsw.iterative_scan"] = settings.rag_hnsw_iterative_scan
+
+        for name, value in options.items():
+            await self.db.execute(
+                select(func.set_config(name, value, True)),
+            )
@@ -22,6 +22,14 @@ class ResourcesRepository(IResourcesRepository[ResourceModel]):
 
         return resource
 
+    async def update(self, resource: ResourceModel) -> ResourceModel:
+        """Update resource."""
+
+        await self.db.commit()
+        await self.db.refresh(resource)
+
+        return resource
+
     async def get_by_name(self, name: str) -> ResourceModel | None:
         """Get resource by name."""
 
@@ -15,11 +15,19 @@ class IResourceChunksRepository(Generic[T, Y]):
     ) -> None:
         """Batch create resource chunks."""
 
+    @abstractmethod
+    async def batch_delete(
+        self,
+        resource_chunks: List[T],
+    ) -> None:
+        """Batch delete resource chunks."""
+
     @abstractmethod
     async def search_by_embedding(
         self,
         query: str,
         top_k: int = 5,
         resource_names: Optional[List[str]] = None,
+        ef_search: Optional[int] = None,
     ) -> List[Y]:
         """Search resource chunks by embedding similarity."""
@@ -11,6 +11,10 @@ class IResourcesRepository(Generic[T]):
     async def create(self, resource: T) -> T:
         """Create resource."""
 
+    @abstractmethod
+    async def update(self, resource: T) -> T:
+        """Update resource."""
+
     @abstractmethod
     async def get_by_name(self, name: str) -> T | None:
         """Get resource by name."""
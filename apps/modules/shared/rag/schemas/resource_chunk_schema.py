@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from pydantic import UUID4, BaseModel
 
@@ -11,6 +11,7 @@ class ResourceChunkBase(BaseModel):
     text: str
     chunk_index: int
     embedding: List[float]
+    content_hash: Optional[str] = None
 
 
 class ResourceChunkSearchResponse(BaseModel):
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from pydantic import UUID4, BaseModel
 
@@ -11,6 +11,7 @@ class ResourceBase(BaseModel):
 
     name: str
     content: str
+    content_hash: Optional[str] = None
 
 
 class ResourceResponse(ResourceBase):
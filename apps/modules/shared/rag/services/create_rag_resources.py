@@ -1,11 +1,21 @@
+import asyncio
 import os
+from collections import defaultdict
+from datetime import timedelta
 from pathlib import Path
+from typing import Optional
 
 from fastapi import logger as fastapi_logger
 
+from apps.core.config import settings
+from apps.core.providers.embedding_provider import embedding_lru_cache
+from apps.core.providers.embedding_provider.repository_interfaces.embedding_cache_repository_interface import (
+    IEmbeddingCacheRepository,
+)
 from apps.core.utils.files import (
     extract_text_from_csv,
     extract_text_from_pdf,
+    get_content_hash,
     get_embeddings_rag_batch,
     split_text,
 )
@@ -37,10 +47,12 @@ class CreateRAGResourcesService:
             ResourceChunkModel,
             ResourceChunkSearchResponse,
         ],
+        embedding_cache_repository: Optional[IEmbeddingCacheRepository] = None,
     ) -> None:
         self.folder_path = folder_path
         self.resources_repository = resources_repository
         self.resource_chunks_repository = resource_chunks_repository
+        self.embedding_cache_repository = embedding_cache_repository
 
     async def execute(self) -> None:
         """Execute the RAG resources service."""
@@ -53,16 +65,11 @@ class CreateRAGResourcesService:
             file_path = Path(self.folder_path) / filename
             resource_name = file_path.name
 
-            resource_exists = await self.resources_repository.get_by_name(resource_name)
-            if resource_exists:
-                logger.info(f"Resource '{resource_name}' already exists. Skipping...")
-                continue
-
             # Extract text based on file type
             if filename.endswith(".pdf"):
-                content = extract_text_from_pdf(file_path)
+                content = await asyncio.to_thread(extract_text_from_pdf, file_path)
             elif filename.endswith(".csv"):
-                content = extract_text_from_csv(file_path)
+                content = await asyncio.to_thread(extract_text_from_csv, file_path)
             else:
                 logger.warning(
                     f"Unsupported file type for '{resource_name}'. Skipping...",
@@ -76,29 +83,102 @@ class CreateRAGResourcesService:
                 )
                 content = content.replace("\x00", "")
 
-            # Create resource
+            content_hash = get_content_hash(content)
+            resource = await self.resources_repository.get_by_name(resource_name)
+            if resource and resource.content_hash == content_hash:
+                logger.info(f"Resource '{resource_name}' is unchanged. Skipping...")
+                continue
+
             logger.info(f"Processing resource: {resource_name}...")
-            resource_created = await self.resources_repository.create(
-                ResourceModel(name=resource_name, content=content),
+            await self._sync_resource(resource_name, content, content_hash, resource)
+            logger.info(f"Finished processing resource: {resource_name}.\n")
+
+        if self.embedding_cache_repository:
+            evicted = await self.embedding_cache_repository.evict(
+                max_age=timedelta(days=settings.embedding_cache_max_age_days),
+                max_rows=settings.embedding_cache_max_rows,
+            )
+            logger.info(f"Evicted {evicted} embedding cache entries")
+
+        logger.info(f"Embedding cache stats: {embedding_lru_cache.stats()}")
+
+    async def _sync_resource(
+        self,
+        resource_name: str,
+        content: str,
+        content_hash: str,
+        resource: ResourceModel | None,
+    ) -> None:
+        """
+        Create or refresh a resource and its chunks.
+
+        Chunks whose hash is already stored keep their embedding and are only
+        re-indexed; new or changed chunks are embedded, stale ones deleted.
+        """
+
+        # Split content into larger chunks with less overlap
+        chunks = split_text(content, chunk_size=2000, overlap=100)
+        chunk_hashes = [get_content_hash(chunk) for chunk in chunks]
+        logger.info(f"Split into {len(chunks)} chunks")
+
+        stored_chunks: dict[str, list[ResourceChunkModel]] = defaultdict(list)
+        for stored_chunk in resource.chunks if resource else []:
+            stored_hash = stored_chunk.content_hash or get_content_hash(
+                stored_chunk.text,
             )
+            stored_chunks[stored_hash].append(stored_chunk)
 
-            # Split content into larger chunks with less overlap
-            chunks = split_text(content, chunk_size=2000, overlap=100)
-            logger.info(f"Split into {len(chunks)} chunks")
-
-            # Process chunks in batches
-            batch_size = 100  # Adjust based on your OpenAI rate limits
-            embeddings = get_embeddings_rag_batch(chunks, batch_size=batch_size)
-
-            await self.resource_chunks_repository.batch_create(
-                [
-                    ResourceChunkModel(
-                        resource_id=resource_created.id,
-                        text=chunk,
-                        chunk_index=i,
-                        embedding=embedding,
-                    )
-                    for i, (chunk, embedding) in enumerate(zip(chunks, embeddings))
-                ],
+        missing_indexes = []
+        reused_chunks = []
+        for i, chunk_hash in enumerate(chunk_hashes):
+            if stored_chunks.get(chunk_hash):
+                reused_chunks.append((i, stored_chunks[chunk_hash].pop()))
+            else:
+                missing_indexes.append(i)
+
+        stale_chunks = [
+            chunk for same_hash in stored_chunks.values() for chunk in same_hash
+        ]
+        logger.info(
+            f"Embedding {len(missing_indexes)} new or changed chunks, "
+            f"reusing {len(chunks) - len(missing_indexes)}, "
+            f"removing {len(stale_chunks)}",
+        )
+
+        # Embed chunks, batches run concurrently without blocking the loop
+        embeddings = await get_embeddings_rag_batch(
+            [chunks[i] for i in missing_indexes],
+            self.embedding_cache_repository,
+        )
+
+        # Only touch stored rows once embedding succeeded
+        for i, reused_chunk in reused_chunks:
+            reused_chunk.chunk_index = i
+            reused_chunk.content_hash = chunk_hashes[i]
+
+        if resource:
+            resource.content = content
+            resource.content_hash = content_hash
+            await self.resource_chunks_repository.batch_delete(stale_chunks)
+        else:
+            resource = await self.resources_repository.create(
+                ResourceModel(
+                    name=resource_name,
+                    content=content,
+                    content_hash=content_hash,
+                ),
             )
-            logger.info(f"Finished processing resource: {resource_name}.\n")
+
+        await self.resource_chunks_repository.batch_create(
+            [
+                ResourceChunkModel(
+                    resource_id=resource.id,
+                    text=chunks[i],
+                    content_hash=chunk_hashes[i],
+                    chunk_index=i,
+                    embedding=embedding,
+                )
+                for i, embedding in zip(missing_indexes, embeddings)
+            ],
+        )
+        await self.resources_repository.update(resource)
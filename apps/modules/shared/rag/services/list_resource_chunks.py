@@ -28,6 +28,7 @@ class ListResourceChunksService:
         query: str,
         chunk_top_k: int = 5,
         resource_names: Optional[List[str]] = None,
+        ef_search: Optional[int] = None,
     ) -> List[ResourceChunkSearchResponse]:
         """Execute the list resources service."""
 
@@ -35,6 +36,7 @@ class ListResourceChunksService:
             query=query,
             top_k=chunk_top_k,
             resource_names=resource_names,
+            ef_search=ef_search,
         )
         return [
             ResourceChunkSearchResponse.model_validate(resource_chunk)
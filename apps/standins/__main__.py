@@ -0,0 +1,19 @@
+import uvicorn
+
+from apps.core.config import settings
+
+
+def main() -> None:
+    """Entrypoint of the stand-in servers."""
+    uvicorn.run(
+        "apps.standins.main:get_app",
+        host=settings.standins_host,
+        port=settings.standins_port,
+        log_level=settings.log_level.value.lower(),
+        factory=True,
+        loop="asyncio",
+    )
+
+
+if __name__ == "__main__":
+    main()
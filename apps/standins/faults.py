@@ -0,0 +1,80 @@
+import asyncio
+import random
+from typing import Awaitable, Callable
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from apps.core.config import settings
+
+
+def parse_service_values(value: str) -> dict[str, float]:
+    """
+    Parse a `service=value` list, e.g. `openai=1500,drive=150`.
+
+    A bare number applies to every service and is stored under `*`.
+    """
+
+    values: dict[str, float] = {}
+    for raw_item in value.split(","):
+        item = raw_item.strip()
+        if not item:
+            continue
+        service, _, number = item.rpartition("=")
+        values[service.strip() or "*"] = float(number)
+    return values
+
+
+class FaultsConfig(BaseModel):
+    """Latency and error injection for the stand-ins."""
+
+    latency_ms: dict[str, float]
+    jitter_ratio: float
+    error_rate: dict[str, float]
+    error_status: int
+
+    def latency_for(self, service: str) -> float:
+        """Latency in milliseconds for a service."""
+
+        return self.latency_ms.get(service, self.latency_ms.get("*", 0.0))
+
+    def error_rate_for(self, service: str) -> float:
+        """Error rate between 0 and 1 for a service."""
+
+        return self.error_rate.get(service, self.error_rate.get("*", 0.0))
+
+
+faults_config = FaultsConfig(
+    latency_ms=parse_service_values(settings.standins_latency_ms),
+    jitter_ratio=settings.standins_jitter_ratio,
+    error_rate=parse_service_values(settings.standins_error_rate),
+    error_status=settings.standins_error_status,
+)
+
+# Seeded so a run with the same request order injects the same faults
+_random = random.Random(settings.standins_seed)  # noqa: S311
+
+
+def inject_faults(service: str) -> Callable[[], Awaitable[None]]:
+    """Dependency that delays and fails requests to a stand-in service."""
+
+    async def dependency() -> None:
+        latency = faults_config.latency_for(service)
+        if latency > 0:
+            jitter = latency * faults_config.jitter_ratio
+            await asyncio.sleep(
+                max(latency + _random.uniform(-jitter, jitter), 0) / 1000,
+            )
+
+        if _random.random() < faults_config.error_rate_for(service):
+            # The request body may be left unread, the connection can't be reused
+            headers = {"Connection": "close"}
+            if faults_config.error_status == 429:
+                headers["Retry-After"] = "1"
+            raise HTTPException(
+                status_code=faults_config.error_status,
+                detail=f"Injected {service} stand-in error",
+                headers=headers,
+            )
+
+    return dependency
@@ -0,0 +1,292 @@
+import csv
+import hashlib
+import io
+import json
+import random
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from apps.core.config import settings
+
+DEPARTMENTS = ["Engineering", "Design", "Sales", "Marketing", "Support", "Finance"]
+SATISFACTION = ["1", "2", "3", "4", "5"]
+YES_NO = ["Yes", "No"]
+COMMENTS = [
+    "Great team and flexible hours.",
+    "More feedback from leads would help.",
+    "Tooling could be faster.",
+    "Happy with the onboarding.",
+    "",
+]
+
+RECOMMEND_QUESTION = "Would you recommend working here to a friend?"
+RECOMMEND_REASON_QUESTION = "What is the main reason you would recommend us?"
+
+
+def _seed(value: str) -> int:
+    """Stable integer seed for a string."""
+
+    return int.from_bytes(hashlib.sha256(value.encode("utf-8")).digest()[:8], "big")
+
+
+def survey_headers(columns: int) -> list[str]:
+    """Headers of the synthetic survey, cycling through column kinds."""
+
+    headers = [
+        "Respondent ID",
+        "Department",
+        "Years at the company",
+        RECOMMEND_QUESTION,
+        RECOMMEND_REASON_QUESTION,
+        "Comments",
+    ]
+    for i in range(max(columns - len(headers), 0)):
+        headers.append(f"How satisfied are you with area {i + 1}?")
+    return headers
+
+
+@lru_cache(maxsize=64)
+def survey_csv(file_id: str, rows: int, columns: int) -> bytes:
+    """Deterministic survey export for a Drive file id."""
+
+    fixture_path = Path(settings.standins_fixtures_path or "") / f"{file_id}.csv"
+    if settings.standins_fixtures_path and fixture_path.exists():
+        return fixture_path.read_bytes()
+
+    if file_id.startswith("questions"):
+        return structured_questions_csv()
+
+    rng = random.Random(_seed(file_id))  # noqa: S311
+    headers = survey_headers(columns)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+
+    for row_number in range(rows):
+        recommends = rng.choice(YES_NO)
+        row = [
+            str(row_number + 1),
+            rng.choice(DEPARTMENTS),
+            f"{rng.uniform(0, 12):.1f}",
+            recommends,
+            (
+                rng.choice(["Culture", "Growth", "Pay", "Remote work"])
+                if recommends == "Yes"
+                else ""
+            ),
+            rng.choice(COMMENTS),
+        ]
+        row.extend(rng.choice(SATISFACTION) for _ in range(len(headers) - len(row)))
+        writer.writerow(row)
+
+    return buffer.getvalue().encode("utf-8")
+
+
+def structured_questions_csv() -> bytes:
+    """Structured questions file matching the synthetic survey."""
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["ID", "Question", "If Question ID", "Equal To"])
+    writer.writerow(["Q1", RECOMMEND_QUESTION, "", ""])
+    writer.writerow(["Q2", RECOMMEND_REASON_QUESTION, "Q1", "Yes"])
+    return buffer.getvalue().encode("utf-8")
+
+
+def drive_file_metadata(file_id: str, **overrides: Any) -> dict[str, Any]:
+    """Drive `files` resource for a stand-in file."""
+
+    is_csv = file_id.startswith(("csv", "questions"))
+    metadata = {
+        "kind": "drive#file",
+        "id": file_id,
+        "name": f"{file_id}.csv" if is_csv else file_id,
+        "mimeType": "text/csv" if is_csv else "application/vnd.google-apps.spreadsheet",
+        "modifiedTime": "2026-01-01T00:00:00.000Z",
+        "version": "1",
+    }
+    if is_csv:
+        content = survey_csv(
+            file_id,
+            settings.standins_survey_rows,
+            settings.standins_survey_columns,
+        )
+        metadata["md5Checksum"] = hashlib.md5(content).hexdigest()  # noqa: S324
+    metadata.update(overrides)
+    return metadata
+
+
+def _placeholder(
+    object_id: str,
+    placeholder_type: str,
+    index: int = 0,
+) -> dict[str, Any]:
+    """Layout page element holding a shape placeholder."""
+
+    return {
+        "objectId": object_id,
+        "shape": {
+            "shapeType": "TEXT_BOX",
+            "placeholder": {"type": placeholder_type, "index": index},
+        },
+    }
+
+
+def presentation(presentation_id: str) -> dict[str, Any]:
+    """Presentation with the layouts used by the Quinn template."""
+
+    def image_layout(object_id: str, display_name: str) -> dict[str, Any]:
+        return {
+            "objectId": object_id,
+            "layoutProperties": {
+                "name": object_id.upper(),
+                "displayName": display_name,
+            },
+            "pageElements": [
+                _placeholder(f"{object_id}_title", "TITLE"),
+                _placeholder(f"{object_id}_body_0", "BODY", 0),
+                _placeholder(f"{object_id}_body_1", "BODY", 1),
+                {
+                    "objectId": f"{object_id}_picture",
+                    "image": {"placeholder": {"type": "PICTURE", "index": 0}},
+                },
+            ],
+        }
+
+    return {
+        "presentationId": presentation_id,
+        "title": presentation_id,
+        "revisionId": "standin-revision-1",
+        "slides": [],
+        "layouts": [
+            {
+                "objectId": "layout_intro",
+                "layoutProperties": {"name": "INTRO", "displayName": "Intro"},
+                "pageElements": [
+                    _placeholder("layout_intro_title", "CENTERED_TITLE"),
+                    _placeholder("layout_intro_subtitle", "SUBTITLE"),
+                ],
+            },
+            {
+                "objectId": "layout_background",
+                "layoutProperties": {"name": "BACKGROUND", "displayName": "Background"},
+                "pageElements": [
+                    _placeholder("layout_background_title", "TITLE"),
+                    _placeholder("layout_background_body_0", "BODY", 0),
+                    _placeholder("layout_background_body_1", "BODY", 1),
+                ],
+            },
+            image_layout("layout_image_left", "Image Left"),
+            image_layout("layout_image_right", "Image Right"),
+        ],
+    }
+
+
+def embedding(text: str, dimensions: int) -> np.ndarray:
+    """Deterministic unit-length embedding for a text."""
+
+    rng = np.random.default_rng(_seed(text))
+    vector = rng.standard_normal(dimensions).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def slideshow(prompt: str) -> str:
+    """
+    Deterministic `Slideshow` JSON for a survey analysis prompt.
+
+    Charts reference the synthetic survey headers found in the prompt, so the
+    chart stage has real columns to work on.
+    """
+
+    headers = [
+        header
+        for header in survey_headers(settings.standins_survey_columns)
+        if header in prompt
+    ]
+    slides: list[dict[str, Any]] = [
+        {"title": "Team Survey Results", "slide_type": "Intro"},
+        {
+            "title": "About the Survey",
+            "slide_type": "Background",
+            "bullet_points": ["Anonymous responses", "All departments took part"],
+            "description": "An overview of who answered and how the survey ran.",
+        },
+    ]
+
+    if RECOMMEND_QUESTION in headers:
+        slides.append(
+            {
+                "title": "Would People Recommend Us?",
+                "slide_type": "Image Left",
+                "description": "Share of respondents who would recommend working here.",
+                "chart": {
+                    "type": "pie",
+                    "title": "Recommendation",
+                    "data": {"values": {"header_column": RECOMMEND_QUESTION}},
+                },
+            },
+        )
+    if "Department" in headers and "Years at the company" in headers:
+        slides.append(
+            {
+                "title": "Tenure by Department",
+                "slide_type": "Image Right",
+                "bullet_points": ["Tenure varies across departments"],
+                "description": "Average years at the company for each department.",
+                "chart": {
+                    "type": "bar",
+                    "title": "Tenure by Department",
+                    "data": {
+                        "x": {"label": "Department", "header_column": "Department"},
+                        "y": {
+                            "label": "Years",
+                            "header_column": "Years at the company",
+                        },
+                    },
+                },
+            },
+        )
+
+    if RECOMMEND_QUESTION in headers and "Department" in headers:
+        slides.append(
+            {
+                "title": "Recommendation by Department",
+                "slide_type": "Image Left",
+                "description": "Share of each answer within every department.",
+                "chart": {
+                    "type": "bar",
+                    "title": "Recommendation by Department",
+                    "data": {
+                        "x": {"label": "Department", "header_column": "Department"},
+                        "series": {
+                            "label": "Recommend",
+                            "header_column": RECOMMEND_QUESTION,
+                        },
+                        "aggregation": "percent",
+                    },
+                },
+            },
+        )
+    satisfaction = next(
+        (header for header in headers if header.startswith("How satisfied")),
+        None,
+    )
+    if satisfaction:
+        slides.append(
+            {
+                "title": "Satisfaction",
+                "slide_type": "Image Right",
+                "bullet_points": ["Most answers are in the middle of the scale"],
+                "description": "Distribution of the satisfaction ratings.",
+                "chart": {
+                    "type": "histogram",
+                    "title": "Satisfaction",
+                    "data": {"values": {"header_column": satisfaction}},
+                },
+            },
+        )
+
+    return json.dumps({"slides": slides})
@@ -0,0 +1,33 @@
+from fastapi import FastAPI
+from fastapi.responses import UJSONResponse
+
+from apps.core.utils.logger import configure_logging
+from apps.standins.routers import faults_api, google_api, make_api, openai_api, s3_api
+
+
+def get_app() -> FastAPI:
+    """
+    Get the stand-in servers application.
+
+    It serves deterministic OpenAI, Google Drive/Slides, S3 and Make payloads
+    so the API can be load tested without touching the real services. Point
+    the API at it with the `STANDINS_URL` setting.
+
+    :return: application.
+    """
+    configure_logging()
+    app = FastAPI(
+        title="apps stand-ins",
+        docs_url="/docs",
+        redoc_url=None,
+        default_response_class=UJSONResponse,
+    )
+
+    app.include_router(faults_api.router, prefix="/_standins", tags=["Faults"])
+    app.include_router(openai_api.router, prefix="/v1", tags=["OpenAI"])
+    app.include_router(google_api.drive_router, prefix="/drive/v3", tags=["Drive"])
+    app.include_router(google_api.slides_router, prefix="/v1", tags=["Slides"])
+    app.include_router(make_api.router, prefix="/make", tags=["Make"])
+    app.include_router(s3_api.router, prefix="/s3", tags=["S3"])
+
+    return app
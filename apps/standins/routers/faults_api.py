@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+
+from apps.standins.faults import FaultsConfig, faults_config
+
+router = APIRouter()
+
+
+@router.get("/faults")
+async def show_faults() -> FaultsConfig:
+    """Current latency and error injection."""
+
+    return faults_config
+
+
+@router.put("/faults")
+async def update_faults(body: FaultsConfig) -> FaultsConfig:
+    """Change latency and error injection without restarting."""
+
+    for field in FaultsConfig.model_fields:
+        setattr(faults_config, field, getattr(body, field))
+    return faults_config
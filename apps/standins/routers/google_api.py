@@ -0,0 +1,88 @@
+import itertools
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, Response
+
+from apps.core.config import settings
+from apps.standins import fixtures
+from apps.standins.faults import inject_faults
+
+drive_router = APIRouter(dependencies=[Depends(inject_faults("drive"))])
+slides_router = APIRouter(dependencies=[Depends(inject_faults("slides"))])
+
+_copy_counter = itertools.count(1)
+
+
+def _csv_response(file_id: str) -> Response:
+    """Survey export for a file id."""
+
+    return Response(
+        content=fixtures.survey_csv(
+            file_id,
+            settings.standins_survey_rows,
+            settings.standins_survey_columns,
+        ),
+        media_type="text/csv",
+    )
+
+
+@drive_router.get("/files/{file_id}", response_model=None)
+async def show_drive_file(
+    file_id: str,
+    alt: Optional[str] = None,
+) -> Response | dict[str, Any]:
+    """Drive `files.get` stand-in, including `alt=media` downloads."""
+
+    if alt == "media":
+        return _csv_response(file_id)
+    return fixtures.drive_file_metadata(file_id)
+
+
+@drive_router.get("/files/{file_id}/export")
+async def export_drive_file(file_id: str) -> Response:
+    """Drive `files.export` stand-in, always exporting CSV."""
+
+    return _csv_response(file_id)
+
+
+@drive_router.post("/files/{file_id}/copy")
+async def copy_drive_file(
+    file_id: str,
+    body: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Drive `files.copy` stand-in."""
+
+    copy_id = f"{file_id}-copy-{next(_copy_counter)}"
+    return fixtures.drive_file_metadata(
+        copy_id,
+        name=(body or {}).get("name") or f"Copy of {file_id}",
+        mimeType="application/vnd.google-apps.presentation",
+    )
+
+
+@drive_router.patch("/files/{file_id}")
+async def update_drive_file(file_id: str, body: dict[str, Any]) -> dict[str, Any]:
+    """Drive `files.update` stand-in."""
+
+    return fixtures.drive_file_metadata(file_id, **body)
+
+
+@slides_router.get("/presentations/{presentation_id}")
+async def show_presentation(presentation_id: str) -> dict[str, Any]:
+    """Slides `presentations.get` stand-in."""
+
+    return fixtures.presentation(presentation_id)
+
+
+@slides_router.post("/presentations/{presentation_id}:batchUpdate")
+async def batch_update_presentation(
+    presentation_id: str,
+    body: dict[str, Any],
+) -> dict[str, Any]:
+    """Slides `presentations.batchUpdate` stand-in."""
+
+    return {
+        "presentationId": presentation_id,
+        "replies": [{} for _ in body.get("requests", [])],
+        "writeControl": {"requiredRevisionId": "standin-revision-2"},
+    }
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from apps.standins.faults import inject_faults
+
+router = APIRouter(dependencies=[Depends(inject_faults("make"))])
+
+
+@router.post("/{scenario:path}", response_class=PlainTextResponse)
+async def trigger_scenario(scenario: str) -> str:
+    """Make webhook stand-in."""
+
+    return "Accepted"
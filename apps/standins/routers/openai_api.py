@@ -0,0 +1,149 @@
+import base64
+import time
+import uuid
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from apps.standins import fixtures
+from apps.standins.faults import inject_faults
+
+router = APIRouter(dependencies=[Depends(inject_faults("openai"))])
+
+DEFAULT_DIMENSIONS = 1536
+
+
+def _count_tokens(text: str) -> int:
+    """Rough token count, about four characters per token."""
+
+    return max(len(text) // 4, 1)
+
+
+def _input_text(value: Any) -> str:
+    """Flatten a Responses/Chat input into plain text."""
+
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return "\n".join(_input_text(item) for item in value)
+    if isinstance(value, dict):
+        return _input_text(value.get("content") or value.get("text") or "")
+    return ""
+
+
+@router.post("/embeddings")
+async def create_embeddings(body: dict[str, Any]) -> dict[str, Any]:
+    """Embeddings API stand-in."""
+
+    texts = body.get("input", [])
+    if isinstance(texts, str):
+        texts = [texts]
+    dimensions = body.get("dimensions") or DEFAULT_DIMENSIONS
+    as_base64 = body.get("encoding_format") == "base64"
+
+    data = []
+    for index, text in enumerate(texts):
+        vector = fixtures.embedding(str(text), dimensions)
+        data.append(
+            {
+                "object": "embedding",
+                "index": index,
+                "embedding": (
+                    base64.b64encode(vector.tobytes()).decode("ascii")
+                    if as_base64
+                    else vector.tolist()
+                ),
+            },
+        )
+
+    tokens = sum(_count_tokens(str(text)) for text in texts)
+    return {
+        "object": "list",
+        "data": data,
+        "model": body.get("model", ""),
+        "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+    }
+
+
+@router.post("/responses")
+async def create_response(body: dict[str, Any]) -> dict[str, Any]:
+    """Responses API stand-in, covering `responses.create` and `responses.parse`."""
+
+    prompt = _input_text(body.get("input"))
+    text_format = (body.get("text") or {}).get("format") or {}
+
+    if text_format.get("type") == "json_schema":
+        output_text = fixtures.slideshow(prompt)
+    else:
+        output_text = f"Stand-in answer based on {len(prompt)} characters of context."
+
+    input_tokens = _count_tokens(prompt)
+    output_tokens = _count_tokens(output_text)
+    return {
+        "id": f"resp_{uuid.uuid4().hex}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": body.get("model", ""),
+        "status": "completed",
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+        "text": body.get("text") or {"format": {"type": "text"}},
+        "output": [
+            {
+                "type": "message",
+                "id": f"msg_{uuid.uuid4().hex}",
+                "status": "completed",
+                "role": "assistant",
+                "content": [
+                    {"type": "output_text", "text": output_text, "annotations": []},
+                ],
+            },
+        ],
+        "usage": {
+            "input_tokens": input_tokens,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": output_tokens,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": input_tokens + output_tokens,
+        },
+    }
+
+
+@router.post("/chat/completions")
+async def create_chat_completion(body: dict[str, Any]) -> dict[str, Any]:
+    """Chat Completions API stand-in, used by the Ava crew agents."""
+
+    prompt = _input_text(body.get("messages"))
+    content = (
+        "Thought: I now know the final answer\n"
+        f"Final Answer: Stand-in answer based on {len(prompt)} characters of context."
+    )
+
+    prompt_tokens = _count_tokens(prompt)
+    completion_tokens = _count_tokens(content)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", ""),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            },
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+@router.get("/models/{model}")
+async def show_model(model: str) -> dict[str, Any]:
+    """Models API stand-in."""
+
+    return {"id": model, "object": "model", "created": 0, "owned_by": "standins"}
@@ -0,0 +1,112 @@
+import hashlib
+import uuid
+
+from fastapi import APIRouter, Depends, Request, Response
+
+from apps.standins.faults import inject_faults
+
+router = APIRouter(dependencies=[Depends(inject_faults("s3"))])
+
+# Only metadata is kept, bodies are discarded to keep memory flat under load
+_objects: dict[tuple[str, str], dict[str, str]] = {}
+_multipart_uploads: dict[str, dict[int, str]] = {}
+
+
+def _xml(body: str) -> Response:
+    """S3 XML response."""
+
+    return Response(
+        content=f'<?xml version="1.0" encoding="UTF-8"?>\n{body}',
+        media_type="application/xml",
+    )
+
+
+async def _read_body(request: Request) -> tuple[int, str]:
+    """Read a request body, returning its size and ETag."""
+
+    digest = hashlib.md5()  # noqa: S324
+    size = 0
+    async for chunk in request.stream():
+        digest.update(chunk)
+        size += len(chunk)
+    return size, f'"{digest.hexdigest()}"'
+
+
+@router.put("/{bucket}/{key:path}")
+async def put_object(bucket: str, key: str, request: Request) -> Response:
+    """S3 `PutObject` and `UploadPart` stand-in."""
+
+    size, etag = await _read_body(request)
+    size = int(request.headers.get("x-amz-decoded-content-length", size))
+
+    upload_id = request.query_params.get("uploadId")
+    part_number = request.query_params.get("partNumber")
+    if upload_id and part_number:
+        if upload_id not in _multipart_uploads:
+            return Response(status_code=404)
+        _multipart_uploads[upload_id][int(part_number)] = etag
+        return Response(headers={"ETag": etag})
+
+    _objects[(bucket, key)] = {
+        "ETag": etag,
+        "Content-Length": str(size),
+        "Content-Type": request.headers.get("content-type", "binary/octet-stream"),
+    }
+    return Response(headers={"ETag": etag})
+
+
+@router.head("/{bucket}")
+async def head_bucket(bucket: str) -> Response:
+    """S3 `HeadBucket` stand-in, every bucket exists."""
+
+    return Response()
+
+
+@router.head("/{bucket}/{key:path}")
+async def head_object(bucket: str, key: str) -> Response:
+    """S3 `HeadObject` stand-in."""
+
+    metadata = _objects.get((bucket, key))
+    if not metadata:
+        return Response(status_code=404)
+    return Response(headers=metadata)
+
+
+@router.post("/{bucket}/{key:path}")
+async def multipart_upload(bucket: str, key: str, request: Request) -> Response:
+    """S3 `CreateMultipartUpload` and `CompleteMultipartUpload` stand-in."""
+
+    if "uploads" in request.query_params:
+        upload_id = uuid.uuid4().hex
+        _multipart_uploads[upload_id] = {}
+        return _xml(
+            "<InitiateMultipartUploadResult>"
+            f"<Bucket>{bucket}</Bucket><Key>{key}</Key><UploadId>{upload_id}</UploadId>"
+            "</InitiateMultipartUploadResult>",
+        )
+
+    upload_id = request.query_params.get("uploadId", "")
+    parts = _multipart_uploads.pop(upload_id, None)
+    if parts is None:
+        return Response(status_code=404)
+
+    etag = f'"{hashlib.md5("".join(parts.values()).encode()).hexdigest()}-{len(parts)}"'  # noqa: S324
+    _objects[(bucket, key)] = {"ETag": etag, "Content-Length": "0"}
+    return _xml(
+        "<CompleteMultipartUploadResult>"
+        f"<Location>{request.url.path}</Location><Bucket>{bucket}</Bucket>"
+        f"<Key>{key}</Key><ETag>{etag}</ETag>"
+        "</CompleteMultipartUploadResult>",
+    )
+
+
+@router.delete("/{bucket}/{key:path}")
+async def delete_object(bucket: str, key: str, request: Request) -> Response:
+    """S3 `DeleteObject` and `AbortMultipartUpload` stand-in."""
+
+    upload_id = request.query_params.get("uploadId")
+    if upload_id:
+        _multipart_uploads.pop(upload_id, None)
+    else:
+        _objects.pop((bucket, key), None)
+    return Response(status_code=204)